@@ -48,29 +48,24 @@ maint_asset_weights = [0.75, 0.9]
 maint_liab_weight = 1
 deposit_limits_and_slippages = [{750_000: 0.88}, {1_000_000: 1.16}, {2_000_000: 2.33}, {5_000_000: 5.83}]
 
-# Loop to calculate and print the summary for each setting
-master_df = pd.DataFrame()
-for init_weight in init_asset_weights:
-    for maint_weight in maint_asset_weights:
-        if maint_weight > init_weight: # If maint = init then loan is initialised on liqudation price (unfortunate...)
-            for deposit_slippage in deposit_limits_and_slippages:
-                for deposit_limit, slippage in deposit_slippage.items():
-                    current_risks_df = vsta.risk.calculate_current_values(vsta, price, T, t, risk_free_rate, sigma, init_weight, maint_weight, 1, 1, deposit_limit, slippage, supply)
-                    print('--------------')
-                    print(f"Summary of Current Exposure and Risks for Setting - Init: {init_weight}, Maint: {maint_weight}, Limit: {deposit_limit}, Slippage: {slippage}:")
-                    print(current_risks_df)
-                    master_df = pd.concat([master_df, current_risks_df], ignore_index=True)
+# Evaluate every setting in one vectorised pass
+settings = vsta.risk.build_settings_grid(init_asset_weights, maint_asset_weights, deposit_limits_and_slippages) # maint > init only, otherwise the loan is initialised on the liquidation price (unfortunate...)
+master_df = vsta.risk.calculate_grid_values_binary(vsta, price, T, t, risk_free_rate, sigma, settings['init_asset_weight'].values, settings['maint_asset_weight'].values, init_liab_weight, maint_liab_weight, settings['deposit_limit'].values, settings['slippage'].values, supply)
+print(master_df)
 master_df.to_csv('new.csv')
 
 # Observing nature of the put option.
 price_range = np.linspace(0.1, price * 2, 500)  
 time_periods_for_plot = np.linspace(0, 1, 10)
+liq_price = (price * init_asset_weights[0]) / maint_asset_weights[0]
+
+# One batched evaluation over (time period x price) instead of a scalar call per point and greek.
+greeks = vsta.analytical.binary_put_greeks(price_range[np.newaxis, :], liq_price, T, time_periods_for_plot[:, np.newaxis], risk_free_rate, sigma, 1)
 fig, ax = plt.subplots(figsize=(10, 6))
 
 # Plots
-for t in time_periods_for_plot:
-    liq_price = liq_price = (price * init_asset_weights[0]) / maint_asset_weights[0]
-    values = [vsta.analytical.binary_put_price(p, liq_price, T, t, risk_free_rate, sigma, 1) for p in price_range]
+for i, t in enumerate(time_periods_for_plot):
+    values = greeks['price'][i]
     ax.plot(price_range, values, label=f'Time to Expiry: {round(100 * (T-t)) / 100}')
 ax.set_title('Value for Different Time Periods against Price')
 ax.set_xlabel('Price')
@@ -79,9 +74,8 @@ ax.legend(title='Time Periods', bbox_to_anchor=(1.05, 1), loc='upper left')
 plt.show()
 
 fig, ax = plt.subplots(figsize=(10, 6))
-for t in time_periods_for_plot:
-    liq_price = liq_price = (price * init_asset_weights[0]) / maint_asset_weights[0]
-    deltas_for_prices = [vsta.analytical.binary_put_delta(p, liq_price, T, t, risk_free_rate, sigma) for p in price_range]
+for i, t in enumerate(time_periods_for_plot):
+    deltas_for_prices = greeks['delta'][i]
     ax.plot(price_range, deltas_for_prices, label=f'Time to Expiry: {round(100 * (T-t)) / 100}')
 ax.set_title('Delta vs. Price for Different Time Periods to Expiry')
 ax.set_xlabel('Price')
@@ -90,9 +84,8 @@ ax.legend(title='Time Periods', bbox_to_anchor=(1.05, 1), loc='upper left')
 plt.show()
 
 fig, ax = plt.subplots(figsize=(10, 6))
-for t in time_periods_for_plot:
-    liq_price = liq_price = (price * init_asset_weights[0]) / maint_asset_weights[0]
-    gammas_for_prices = [vsta.analytical.binary_put_gamma(p, liq_price, T, t, risk_free_rate, sigma) for p in price_range]
+for i, t in enumerate(time_periods_for_plot):
+    gammas_for_prices = greeks['gamma'][i]
     ax.plot(price_range, gammas_for_prices, label=f'Time to Expiry: {round(100 * (T-t)) / 100}')
 ax.set_title('Gamma vs. Price for Different Time Periods to Expiry')
 ax.set_xlabel('Price')
@@ -101,9 +94,8 @@ ax.legend(title='Time Periods', bbox_to_anchor=(1.05, 1), loc='upper left')
 plt.show()
 
 fig, ax = plt.subplots(figsize=(10, 6))
-for t in time_periods_for_plot:
-    liq_price = liq_price = (price * init_asset_weights[0]) / maint_asset_weights[0]
-    thetas_for_prices = [vsta.analytical.binary_put_theta(p, liq_price, T, t, risk_free_rate, sigma) for p in price_range]
+for i, t in enumerate(time_periods_for_plot):
+    thetas_for_prices = greeks['theta'][i]
     ax.plot(price_range, thetas_for_prices, label=f'Time to Expiry: {round(100 * (T-t)) / 100}')
 ax.set_title('Theta vs. Price for Different Time Periods to Expiry')
 ax.set_xlabel('Price')
@@ -112,9 +104,8 @@ ax.legend(title='Time Periods', bbox_to_anchor=(1.05, 1), loc='upper left')
 plt.show()
 
 fig, ax = plt.subplots(figsize=(10, 6))
-for t in time_periods_for_plot:
-    liq_price = liq_price = (price * init_asset_weights[0]) / maint_asset_weights[0]
-    speed_for_prices = [vsta.analytical.binary_put_speed(p, liq_price, T, t, risk_free_rate, sigma) for p in price_range]
+for i, t in enumerate(time_periods_for_plot):
+    speed_for_prices = greeks['speed'][i]
     ax.plot(price_range, speed_for_prices, label=f'Time to Expiry: {round(100 * (T-t)) / 100}')
 ax.set_title('Speed vs. Price for Different Time Periods to Expiry')
 ax.set_xlabel('Price')
@@ -123,9 +114,8 @@ ax.legend(title='Time Periods', bbox_to_anchor=(1.05, 1), loc='upper left')
 plt.show()
 
 fig, ax = plt.subplots(figsize=(10, 6))
-for t in time_periods_for_plot:
-    liq_price = liq_price = (price * init_asset_weights[0]) / maint_asset_weights[0]
-    vega_for_prices = [vsta.analytical.binary_put_vega(p, liq_price, T, t, risk_free_rate, sigma) for p in price_range]
+for i, t in enumerate(time_periods_for_plot):
+    vega_for_prices = greeks['vega'][i]
     ax.plot(price_range, vega_for_prices, label=f'Time to Expiry: {round(100 * (T-t)) / 100}')
 ax.set_title('Vega vs. Price for Different Time Periods to Expiry')
 ax.set_xlabel('Price')
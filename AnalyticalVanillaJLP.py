@@ -31,18 +31,10 @@ maint_liab_weight = 1
 deposit_limits_and_slippages = [{750_000: 0.88}, {1_000_000: 1.16}, {2_000_000: 1.53}, {5_000_000: 1.67}, {5_000_000: 1.67}, {5_000_000: 1.673}, {10_000_000: 1.67}, {20_000_000: 1.67}, {30_000_000: 1.673}, {30_000_000: 1.673}, {30_000_000: 1.673}, {50_000_000: 1.673} ]
 remaining_time_values = np.linspace(T - t, 0, 718)  # From T-t to 0
 
-# Loop to calculate and print the summary for each setting
-master_df = pd.DataFrame()
-for init_weight in init_asset_weights:
-    for maint_weight in maint_asset_weights:
-        if maint_weight > init_weight: # If maint = init then loan is initialised on liqudation price (unfortunate...)
-            for deposit_slippage in deposit_limits_and_slippages:
-                for deposit_limit, slippage in deposit_slippage.items():
-                    current_risks_df = vsta.risk.calculate_current_values_vanilla(vsta, price, T, t, risk_free_rate, sigma, init_weight, maint_weight, 1, 1, deposit_limit, slippage, supply)
-                    print('--------------')
-                    print(f"Summary of Current Exposure and Risks for Setting - Init: {init_weight}, Maint: {maint_weight}, Limit: {deposit_limit}, Slippage: {slippage}:")
-                    print(current_risks_df)
-                    master_df = pd.concat([master_df, current_risks_df], ignore_index=True)
+# Evaluate every setting in one vectorised pass
+settings = vsta.risk.build_settings_grid(init_asset_weights, maint_asset_weights, deposit_limits_and_slippages) # maint > init only, otherwise the loan is initialised on the liquidation price (unfortunate...)
+master_df = vsta.risk.calculate_grid_values_vanilla(vsta, price, T, t, risk_free_rate, sigma, settings['init_asset_weight'].values, settings['maint_asset_weight'].values, init_liab_weight, maint_liab_weight, settings['deposit_limit'].values, settings['slippage'].values, supply)
+print(master_df)
 master_df.to_csv('new.csv')
 
 # Observing nature of the put option.
@@ -56,15 +48,15 @@ fig, axs = plt.subplots(3, 1, figsize=(12, 30))
 titles = ['Value vs. Price', 'Delta vs. Price', 'Gamma vs. Price']
 y_labels = ['Value', 'Delta', 'Gamma']
 
-for i, (ax, title, y_label) in enumerate(zip(axs, titles, y_labels)):
-    for t in time_periods_for_plot:
-        liq_price = (price * init_asset_weights[0]) / maint_asset_weights[0]
-        if i == 0:
-            values = [vsta.analytical.vanilla_put_price(p, liq_price, T, t, risk_free_rate, sigma) for p in price_range]
-        elif i == 1:
-            values = [vsta.analytical.vanilla_put_delta(p, liq_price, T, t, risk_free_rate, sigma) for p in price_range]
-        elif i == 2:
-            values = [vsta.analytical.vanilla_put_gamma(p, liq_price, T, t, risk_free_rate, sigma) for p in price_range]
+keys = ['price', 'delta', 'gamma']
+
+# One batched evaluation over (time period x price) instead of a scalar call per point and greek.
+liq_price = (price * init_asset_weights[0]) / maint_asset_weights[0]
+greeks = vsta.analytical.vanilla_put_greeks(price_range[np.newaxis, :], liq_price, T, time_periods_for_plot[:, np.newaxis], risk_free_rate, sigma)
+
+for ax, title, y_label, key in zip(axs, titles, y_labels, keys):
+    for j, t in enumerate(time_periods_for_plot):
+        values = greeks[key][j]
         ax.plot(price_range, values, label=f'Time to Expiry: {round(100 * (T-t)) / 100}')
 
     # Set common properties for all plots
@@ -4,17 +4,20 @@ from vesta.constants import tokens
 from web3 import Web3
 from vesta.token import Token
 import pandas as pd
+from vesta.pricing import EWMAVolatility
+from vesta.data.scheduler import Scheduler
 
 # Instantiate Vesta and Token
 vsta = Vesta(web3_provider=Web3.HTTPProvider(''), etherscan_api_key_token='', moralis_api_key='')
 JLP = Token(**tokens.get("JLP"))
+vsta.data.coingecko.priority = Scheduler.HIGH  # The live loop jumps the queue of any bulk requests
 
 # Parameters
 supply = 46_026_812.892
 risk_free_rate = 0.05
 T = 1  # Denoting a month (Average DeFi loan length)
 t = 0
-sigma = 5 * (31/365)
+sigma = 5 * (31/365)  # Fallback until the estimator has seen a return
 init_asset_weight = 0.66
 init_liab_weight = 1
 maint_asset_weight = 0.75
@@ -22,16 +25,36 @@ maint_liab_weight = 1
 deposit_limit = 1_000_000
 slippage = 1.16
 
+# Monthly volatility, seeded from the last month of (hourly) history and updated every tick
+volatility = EWMAVolatility(decay=0.94)
+history = vsta.data.history.get(JLP, days=31, interval='1h')
+if history is not None:
+    volatility.update_many(history)
+last_timestamp = None if history is None else history.index[-1]
+
 # DataFrame to store the results
 results_df = pd.DataFrame()
 
 try:
     while True:
 
-        obs = vsta.data.coingecko.get_historical_market_data(JLP, 1)
-        price = obs['price'].values[-1]
+        # Fetches only the ticks since the last stored one
+        obs = vsta.data.history.latest(JLP)
+        if obs is None:
+            print("No price history yet, skipping this tick")
+            time.sleep(40)
+            continue
+        price = obs['price']
+
+        # Only feed ticks newer than the last one seen
+        if last_timestamp is None or obs.name > last_timestamp:
+            volatility.update(price, obs.name)
+            last_timestamp = obs.name
+        if volatility.sigma is not None:
+            sigma = float(volatility.sigma)
 
-        current_risks_df = vsta.risk.calculate_current_values(vsta, price, T, t, risk_free_rate, sigma, init_asset_weight, maint_asset_weight, 1, 1, deposit_limit, slippage, supply)
+        current_risks_df = vsta.risk.calculate_current_values_binary(vsta, price, T, t, risk_free_rate, sigma, init_asset_weight, maint_asset_weight, init_liab_weight, maint_liab_weight, deposit_limit, slippage, supply)
+        current_risks_df['sigma'] = sigma
         results_df = pd.concat([results_df, current_risks_df], ignore_index=True)
         
         print(results_df)
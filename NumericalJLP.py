@@ -15,7 +15,7 @@ vsta = Vesta(web3_provider=Web3.HTTPProvider(''), etherscan_api_key_token='', mo
 JLP = Token(**tokens.get("JLP"))
 
 # Hourly data of 31 previous days (1 month)
-data = vsta.data.coingecko.get_historical_market_data(JLP, 31)
+data = vsta.data.history.get(JLP, days=31, interval='1h')
 obs = data['price'].values
 price = obs[-1]
 supply = 46_026_812.892
@@ -35,8 +35,12 @@ monte_carlo_params = {
     "nsteps": 718        # Hours division, total timesteps
 }
 
-# Monte Carlo Price
-total_paths = 10000
+# Maximum-likelihood process parameters from the same hourly history (falls back to the values above on failure)
+calibrated_params = vsta.optimisers.calibrate_merton(data)
+if calibrated_params is not None:
+    print(f"Calibrated Merton parameters: {calibrated_params}")
+    monte_carlo_params.update(calibrated_params)
+
 # Monte Carlo Price Calculation using parameter unpacking
 perturbation = 0.01
 paths_asset = vsta.processes.merton_jump_diffusion_paths(
@@ -44,7 +48,8 @@ paths_asset = vsta.processes.merton_jump_diffusion_paths(
     S0=price           # 'price' is still passed separately
 )
 
-final_values_asset = paths_asset.iloc[-1].values
+# Terminal values for the KDE / histogram drawn straight from the exact Merton terminal law (no intermediate steps)
+final_values_asset = vsta.processes.merton_jump_diffusion_terminal(**monte_carlo_params, S0=price)
 
 # Liabiiliy simulation for USDC (contstant but used later)
 paths_liab = vsta.processes.merton_jump_diffusion_paths(
@@ -58,7 +63,7 @@ paths_liab = vsta.processes.merton_jump_diffusion_paths(
     718, 
     1 
     )
-final_values_liab = paths_asset.iloc[-1].values
+final_values_liab = paths_asset.terminal
 
 # Parameter settings estimation
 settings = []
@@ -68,85 +73,39 @@ maint_asset_weights = [0.75]
 maint_liab_weight = 1
 deposit_limits_and_slippages = [{250_000: 0.11}, {500_000: 0.29}, {750_000: 0.88}, {1_000_000: 1.16}, {2_000_000: 2.33}, {5_000_000: 5.83}]
 
-for init_weight in init_asset_weights:
-    for maint_weight in maint_asset_weights:
-        if(maint_weight > init_weight):   
-
-            # Leverage, Liquidation price, Price drop required to achieve it, Probability of liquidation at current number of paths,
-            leverage = 1 / (1 - init_weight)
-            liq_price = (price * init_weight) / maint_weight
-            price_drop = 100 * ((liq_price - price) / price)
-            num_paths_below_liquidation = np.sum(paths_asset.iloc[-1, :] < liq_price)
-            prob_liq = 100 * num_paths_below_liquidation / total_paths
-
-            for deposit_slippage in deposit_limits_and_slippages:
-                for deposit_limit, slippage in deposit_slippage.items():
-                    
-                    # Calculating percentage of market cap.
-                    perc_of_mktcp = 100 * (deposit_limit / (supply * price))
-                    quantity = deposit_limit / price
-
-                    # Borrows calculation.
-                    free_collateral_value = deposit_limit * init_weight
-                    borrowed_value = (free_collateral_value / (1 - init_weight)) / init_liab_weight 
-                    borrowed_value_weighted = borrowed_value * maint_liab_weight
-
-                    # Collaterals Calculation
-                    collateral_value =  ((quantity * paths_asset) / (1 - init_weight))
-                    collateral_value_weighted = maint_weight * collateral_value
-                    collateral_value_weighted_up = collateral_value_weighted * (1 + perturbation)
-                    collateral_value_weighted_down = collateral_value_weighted * (1 - perturbation)
-                    starting_collateral_value = collateral_value.iloc[0].values[0]
-                    starting_collateral_value_weighted = maint_weight * starting_collateral_value 
-
-                    # Insurance fund exposure
-                    shortfall_value = borrowed_value_weighted * (slippage / 100) 
-
-                    # Payoff, Delta hedge calculation. 
-                    calculated_values = []
-                    deltas = []
-                    for time_step in range(len(paths_asset)):
-
-                        time_to_expiry = (time_steps - time_step)
-                        current_collateral_value_weighted = collateral_value_weighted.iloc[time_step]
-                        current_collateral_value_weighted_up = collateral_value_weighted_up.iloc[time_step]
-                        current_collateral_value_weighted_down = collateral_value_weighted_down.iloc[time_step]
-                        
-                        # Calculations of payoffs     
-                        payoffs = np.where(current_collateral_value_weighted < borrowed_value_weighted, shortfall_value, 0)
-                        average_payoff = np.mean(payoffs)
-                        value = np.exp(-0.05*(31/365)*time_to_expiry) * average_payoff
-                        calculated_values.append(value)
-
-                        # Delta calculation using central estimation
-                        # Perturb the underlying asset price up and down
-                        current_collateral_value_weighted_up = current_collateral_value_weighted * (1 + perturbation)
-                        current_collateral_value_weighted_down = current_collateral_value_weighted * (1 - perturbation)
-                        payoffs_up = np.where(current_collateral_value_weighted_up < borrowed_value_weighted, shortfall_value, 0)
-                        payoffs_down = np.where(current_collateral_value_weighted_down < borrowed_value_weighted, shortfall_value, 0)
-                        average_payoff_up = np.mean(payoffs_up)
-                        average_payoff_down = np.mean(payoffs_down)
-                        value_up = np.exp(-0.05 * (31 / 365) * time_to_expiry) * average_payoff_up
-                        value_down = np.exp(-0.05 * (31 / 365) * time_to_expiry) * average_payoff_down
-
-                        # Calculate delta for this time step
-                        delta = (value_up - value_down) / (price * 2 * perturbation)
-                        deltas.append(delta)
-
-                    paths_asset[f'Delta{deposit_limit}_{init_weight}_{maint_weight}'] = deltas
-
-paths_asset['calculated_values'] = calculated_values
-print(paths_asset)
+# Payoff and delta hedge time series for every setting in one vectorised pass over the paths.
+settings_grid = vsta.risk.build_settings_grid(init_asset_weights, maint_asset_weights, deposit_limits_and_slippages)
+results = vsta.numerical.liquidation_put_values(paths_asset, price, settings_grid, T=monte_carlo_params['T'], risk_free_rate=risk_free_rate, perturbation=perturbation, init_liab_weight=init_liab_weight, maint_liab_weight=maint_liab_weight)
+labels = [f'{row.deposit_limit}_{row.init_asset_weight}_{row.maint_asset_weight}' for row in settings_grid.itertuples()]
+calculated_values = pd.DataFrame(results['value'], columns=labels)
+# Likelihood-ratio greeks from the same paths instead of bump-and-revalue
+mjd = {name: monte_carlo_params[name] for name in ['muS', 'sigmaS', 'muJ', 'sigmaJ', 'lambdaJ']}
+greeks = vsta.numerical.liquidation_put_greeks(paths_asset, price, settings_grid, **mjd, T=monte_carlo_params['T'], risk_free_rate=risk_free_rate, init_liab_weight=init_liab_weight, maint_liab_weight=maint_liab_weight)
+deltas = pd.DataFrame(greeks['delta'], columns=labels)
+print(calculated_values)
+print(deltas)
+
+# Leverage, Liquidation price, Price drop required to achieve it, Probability of liquidation at expiry,
+for i, row in settings_grid.drop_duplicates(['init_asset_weight', 'maint_asset_weight']).iterrows():
+    liq_price = (price * row.init_asset_weight) / row.maint_asset_weight
+    settings.append({
+        'init': row.init_asset_weight,
+        'maint': row.maint_asset_weight,
+        'Lev': 1 / (1 - row.init_asset_weight),
+        'LiqPrice': liq_price,
+        'PercDrop': 100 * ((liq_price - price) / price),
+        'ProbLiq': 100 * results['prob_liq'][-1, i],
+    })
 
 plt.figure(1)
-plt.plot(paths_asset['calculated_values'])
+plt.plot(calculated_values)
 plt.xlabel('Hours in the future)', fontsize=18)
 plt.ylabel('Value of JLP', fontsize = 18)
 plt.title('Simulated Paths', fontsize = 18)
 plt.show()
 
 plt.figure(1)
-plt.plot(paths_asset['Delta'])
+plt.plot(deltas)
 plt.xlabel('Hours in the future)', fontsize=18)
 plt.ylabel('Value of JLP', fontsize = 18)
 plt.title('Simulated Paths', fontsize = 18)
@@ -161,7 +120,7 @@ for maint_asset_weight in maint_asset_weights:
         if(maint_asset_weight > init_asset_weight):
             filtered_df = df[(df['maint'] == maint_asset_weight) & (df['init'] == init_asset_weight)]
             if not filtered_df.empty:
-                key = f"Maint_{maint_weight}_Init_{init_weight}"
+                key = f"Maint_{maint_asset_weight}_Init_{init_asset_weight}"
                 leverage = filtered_df['Lev'].values[0]
                 liq_price = filtered_df['LiqPrice'].values[0]
                 perc_drop = filtered_df['PercDrop'].values[0]
@@ -170,7 +129,7 @@ for maint_asset_weight in maint_asset_weights:
 
 # Expected, mean and sample path
 plt.figure(1)
-plt.plot(paths_asset.sample(n=250, axis=1))
+plt.plot(paths_asset.paths(slice(0, 250)).values)
 plt.xlabel('Hours in the future)', fontsize=18)
 plt.ylabel('Value of JLP', fontsize = 18)
 plt.title('Simulated Paths', fontsize = 18)
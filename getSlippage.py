@@ -6,9 +6,8 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
-import time
-from tqdm import tqdm
 import logging
+import sys
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -17,43 +16,27 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 vsta = Vesta(web3_provider=Web3.HTTPProvider(''), etherscan_api_key_token='', moralis_api_key='')
 JLP = Token(**tokens.get("JLP"))
 
-# Initialize the dictionary to store slippage data
-slippage = {}
-
-# Progress bar setup
-total_values = np.linspace(0, 50_000_000, 51)
-pbar = tqdm(total=len(total_values), desc="Calculating Slippage")
-
-print(total_values)
-for value in total_values:
-    if value == 0:
-        continue
-    total = []
-    iterations = 6
-    for i in range(iterations):
-        # Simulate slippage data retrieval (replace with actual data retrieval)
-        slippage_at_liquidation = vsta.data.jupiter.get_usdc_swap_price_slippage(JLP, value)
-        logging.info(f'Slippage at {value}: {slippage_at_liquidation}')
-        total.append(slippage_at_liquidation)
-        time.sleep(20)  # Simulate delay
-
-    slippage[value] = np.median(total)
-    logging.info(f'Max slippage for value {value}: {np.median(total)}')
-    pbar.update(1)
-
-# Close the progress bar
-pbar.close()
+# Sample the slippage curve adaptively: a coarse log grid refined where it bends, with the largest executable
+# size found by binary search. The reference price is fetched once and quotes run concurrently within the rate limit.
+curve = vsta.data.jupiter.sample_slippage_curve(JLP, min_size=1e5, max_size=5e7, repeats=3)
+if curve is None:
+    logging.error(f'Could not sample the slippage curve of {JLP.symbol}')
+    sys.exit(1)
+logging.info(f'Sampled {len(curve.sizes)} sizes at {curve.timestamp}, max executable size: {curve.max_size}')
 
 # Convert the data to a DataFrame
-df_slippage = pd.DataFrame(list(slippage.items()), columns=['Value', 'Max Slippage'])
+total_values = np.linspace(0, 50_000_000, 51)[1:]
+df_slippage = pd.DataFrame({'Value': total_values, 'Max Slippage': curve(total_values)})
 
 # Save to CSV
 df_slippage.to_csv('Slippage.csv', index=False)
+curve.to_frame().to_csv('Slippage_Samples.csv', index=False)
 logging.info("Slippage data saved to Slippage.csv")
 
 sns.set_theme(style="whitegrid")
 plt.figure(figsize=(10, 6))
 sns.lineplot(data=df_slippage, x="Value", y="Max Slippage")
+sns.scatterplot(data=curve.to_frame(), x="size", y="slippage")
 plt.title('Slippage Analysis')
 plt.xlabel('Value')
 plt.ylabel('Max Slippage')
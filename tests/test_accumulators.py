@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+from vesta.pricing.accumulators import Accumulator, CrossingCounts, StepPayoffMeans, TerminalValues
+
+
+def test_incomplete_accumulator_cannot_be_created():
+    class OnlyUpdate(Accumulator):
+        def update(self, block, step_start):
+            pass
+
+    with pytest.raises(TypeError):
+        OnlyUpdate()
+
+
+@pytest.mark.parametrize('accumulator', [TerminalValues(2), CrossingCounts([0.5, 1.0]), StepPayoffMeans(2, np.negative)])
+def test_fresh_copies_are_empty(accumulator):
+    accumulator.begin_chunk(3)
+    accumulator.update(np.ones((3, 3)), 0)
+    accumulator.end_chunk()
+    fresh = accumulator.fresh()
+    fresh.merge(accumulator)
+    np.testing.assert_array_equal(fresh.result(), accumulator.result())
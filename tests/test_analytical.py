@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+from vesta.pricing.analytical import Analytical
+
+
+@pytest.mark.parametrize('S', [0.5, 1.0, 2.0, 40.0])
+def test_vanilla_put_speed_is_the_derivative_of_gamma(S):
+    K, T, t, r, sigma = 0.9 * S, 1.0, 0.0, 0.05, 0.6
+    h = 1e-4 * S
+    numerical = (Analytical.vanilla_put_gamma(S + h, K, T, t, r, sigma) - Analytical.vanilla_put_gamma(S - h, K, T, t, r, sigma)) / (2 * h)
+    assert Analytical.vanilla_put_speed(S, K, T, t, r, sigma) == pytest.approx(numerical, rel=1e-6)
+    assert Analytical.vanilla_put_greeks(S, K, T, t, r, sigma)['speed'] == pytest.approx(numerical, rel=1e-6)
+
+
+def test_batched_vanilla_greeks_match_scalar():
+    S = np.array([0.5, 1.0, 2.0])
+    greeks = Analytical.vanilla_put_greeks(S, 1.0, 1.0, 0.0, 0.05, 0.6)
+    scalar = [Analytical.vanilla_put_speed(s, 1.0, 1.0, 0.0, 0.05, 0.6) for s in S]
+    np.testing.assert_allclose(greeks['speed'], scalar, rtol=1e-12)
+
+
+@pytest.mark.parametrize('S, t', [(0.5, 0.0), (1.0, 0.4), (2.0, 0.75)])
+def test_binary_put_speed_is_the_second_derivative_of_delta(S, t):
+    K, T, r, sigma = 0.9 * S, 1.0, 0.05, 0.6
+    h = 1e-3 * S
+    delta = [Analytical.binary_put_delta(S + k * h, K, T, t, r, sigma) for k in (-1, 0, 1)]
+    numerical = (delta[0] - 2 * delta[1] + delta[2]) / h**2
+    assert Analytical.binary_put_speed(S, K, T, t, r, sigma) == pytest.approx(numerical, rel=1e-5)
+    assert Analytical.binary_put_greeks(S, K, T, t, r, sigma)['speed'] == pytest.approx(numerical, rel=1e-5)
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+jupiter = pytest.importorskip('vesta.data.jupiter')
+from vesta.data.cache import ResponseCache
+
+
+def stub_jupiter(quotes):
+    client = jupiter.Jupiter(coingecko=None, cache=ResponseCache(path=None))
+    client.get_usdc_swap_price_slippage = lambda token, size, price=None: quotes(size)
+    return client
+
+
+class StubToken:
+    symbol = 'STUB'
+
+
+def test_curve_never_extends_past_the_first_unroutable_size():
+    # Small sizes fail to quote, mid sizes cannot be routed and one large size routes again (a noisy route)
+    def quotes(size):
+        if size < 1e5:
+            return None
+        return 5.0 if size > 1e7 else 100
+
+    client = stub_jupiter(quotes)
+    assert client.sample_slippage_curve(StubToken(), min_size=1e3, max_size=5e7, price=1.0) is None
+
+
+def test_curve_is_capped_at_the_largest_executable_size():
+    client = stub_jupiter(lambda size: 100 if size > 2e6 else 0.1 * np.log10(size))
+    curve = client.sample_slippage_curve(StubToken(), min_size=1e3, max_size=5e7, price=1.0)
+    assert curve is not None and curve.max_size <= 2e6
+    assert curve(3e6) == 100
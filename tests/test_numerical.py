@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+from vesta.pricing.numerical import Numerical
+from vesta.pricing.pathset import PathSet
+from vesta.pricing.processes import Processes
+from vesta.pricing.risk import Risk
+
+MERTON = {'muS': 0.11, 'sigmaS': 0.4, 'muJ': 0.0, 'sigmaJ': 0.05, 'lambdaJ': 0.5}
+
+
+@pytest.fixture(scope='module')
+def settings():
+    return Risk.build_settings_grid([0.5, 0.66], [0.75], [{250_000: 0.11}, {1_000_000: 1.16}])
+
+
+@pytest.fixture(scope='module')
+def unit_paths():
+    return Processes.merton_jump_diffusion_paths(**MERTON, npaths=4000, T=1, nsteps=24, S0=1.0, rng=7)
+
+
+def test_liquidation_put_values_do_not_depend_on_the_lazy_scale(unit_paths, settings):
+    scaled = unit_paths.scaled(2.0)
+    materialised = PathSet(np.asarray(scaled))
+    lazy = Numerical.liquidation_put_values(scaled, 2.0, settings)
+    eager = Numerical.liquidation_put_values(materialised, 2.0, settings)
+    for name in eager:
+        np.testing.assert_allclose(lazy[name], eager[name], err_msg=name)
+    assert lazy['prob_liq'][-1].max() > 0
+
+
+def test_liquidation_put_greeks_do_not_depend_on_the_lazy_scale(unit_paths, settings):
+    scaled = unit_paths.scaled(2.0)
+    materialised = PathSet(np.asarray(scaled))
+    lazy = Numerical.liquidation_put_greeks(scaled, 2.0, settings, **MERTON)
+    eager = Numerical.liquidation_put_greeks(materialised, 2.0, settings, **MERTON)
+    for name in eager:
+        np.testing.assert_allclose(lazy[name], eager[name], rtol=1e-10, err_msg=name)
+
+
+def test_adaptive_sobol_rejects_batches_that_cut_through_streams(settings):
+    with pytest.raises(ValueError, match='equal streams'):
+        Numerical.adaptive_liquidation_put_values(**MERTON, T=1, nsteps=8, price=1.0, settings=settings, batch_paths=10_000, max_paths=20_000, sobol=True, rng=1)
+
+
+@pytest.mark.parametrize('batch_paths, sobol', [(12_288, True), (12_000, False)])
+def test_adaptive_batch_means_follow_the_simulated_streams(settings, batch_paths, sobol):
+    out = Numerical.adaptive_liquidation_put_values(**MERTON, T=1, nsteps=8, price=1.0, settings=settings, batch_paths=batch_paths, max_paths=batch_paths, sobol=sobol, antithetic=not sobol, rng=1)
+    assert out['npaths'] == batch_paths
+    assert np.all(np.isfinite(out['prob_liq_se'])) and np.all(out['prob_liq_se'][-1] > 0)
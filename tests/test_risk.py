@@ -0,0 +1,23 @@
+import numpy as np
+import pandas as pd
+import pytest
+from vesta.pricing.risk import Risk
+
+NO_JUMPS = {'muJ': -0.05, 'sigmaJ': 0.1, 'lambdaJ': 0.0}
+
+
+@pytest.fixture(scope='module')
+def settings():
+    return Risk.build_settings_grid([0.3, 0.5, 0.66], [0.7, 0.75, 0.9], [{250_000: 0.11}, {1_000_000: 1.16}, {5_000_000: 5.83}])
+
+
+@pytest.mark.parametrize('kind', ['binary', 'vanilla'])
+@pytest.mark.parametrize('price, t', [(1.0, 0.0), (2.5, 0.4)])
+def test_grid_without_jumps_matches_the_jump_grid_at_zero_intensity(settings, kind, price, t):
+    calculate = getattr(Risk, f'calculate_grid_values_{kind}')
+    args = (None, price, 1.0, t, 0.05, 0.45, settings['init_asset_weight'], settings['maint_asset_weight'], 1, 1, settings['deposit_limit'], settings['slippage'], 46_026_812)
+    analytical = calculate(*args)
+    fourier = calculate(*args, jumps=NO_JUMPS)
+    assert list(fourier.columns) == list(analytical.columns)
+    for column in analytical.columns:
+        np.testing.assert_allclose(fourier[column], analytical[column], rtol=1e-7, atol=1e-9, err_msg=column)
@@ -0,0 +1,18 @@
+import numpy as np
+import pytest
+from vesta.pricing.volatility import EWMAVolatility, GARCHVolatility, OnlineVolatility, RealizedVolatility
+
+
+def test_incomplete_estimator_cannot_be_created():
+    class NoSigma(OnlineVolatility):
+        def _observe(self, r2, dt):
+            pass
+
+    with pytest.raises(TypeError):
+        NoSigma()
+
+
+@pytest.mark.parametrize('estimator', [EWMAVolatility(decay=0.94), RealizedVolatility(window=24), GARCHVolatility(1e-6, 0.05, 0.9)])
+def test_estimators_report_sigma_after_a_return(estimator):
+    assert estimator.update(1.0) is None
+    assert np.isfinite(estimator.update(1.01))
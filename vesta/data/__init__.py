@@ -1,2 +1,6 @@
 from .data import *
 from .jupiter import *
+from .scheduler import *
+from .sessions import *
+from .cache import *
+from .history import *
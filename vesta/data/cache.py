@@ -0,0 +1,193 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Callable, Any, Tuple
+
+class ResponseCache:
+    """
+    TTL cache of provider responses for the vesta.data clients: an in-memory LRU in front of a SQLite file, so repeated
+    ratings and research runs (also across processes) are served without new requests.
+
+    Entries are fresh for their endpoint's TTL. For max_stale seconds after that they are still returned at once while a
+    background refresh fetches a new value (stale-while-revalidate); older entries are fetched again before returning.
+    Failed fetches (None) are never cached. Values must be JSON serialisable, so clients cache raw payloads.
+    """
+
+    # Seconds an entry is fresh, per endpoint
+    DEFAULT_TTLS: Dict[str, float] = {
+        'coingecko/coins': 3600,
+        'coingecko/market_chart': 3600,
+        'moralis/wallet_stats': 3600,
+        'ethplorer/top_holders': 3600,
+        'jupiter/slippage_curve': 6 * 3600,
+        # Immutable facts, never refetched
+        'eth/contract_creation': float('inf'),
+    }
+
+    DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.cache', 'vesta', 'responses.sqlite')
+
+    _shared: Optional['ResponseCache'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path: Optional[str] = DEFAULT_PATH, capacity: int = 256, ttls: Optional[Dict[str, float]] = None, default_ttl: float = 300, max_stale: float = 86400) -> None:
+        """
+        Parameters:
+        path (str, optional): SQLite file backing the cache, None for an in-memory cache only.
+        capacity (int): Number of entries kept in memory.
+        ttls (Dict[str, float], optional): Overrides of DEFAULT_TTLS, endpoint -> seconds.
+        default_ttl (float): TTL of endpoints missing from ttls.
+        max_stale (float): Seconds past the TTL during which a stale entry is served while it is refreshed.
+        """
+        self.path = path
+        self.capacity = capacity
+        self.ttls = {**ResponseCache.DEFAULT_TTLS, **(ttls or {})}
+        self.default_ttl = default_ttl
+        self.max_stale = max_stale
+        self.memory: OrderedDict = OrderedDict()
+        self.counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._connection: Optional[sqlite3.Connection] = None
+        if path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._connection = sqlite3.connect(path, check_same_thread=False)
+            self._connection.execute('CREATE TABLE IF NOT EXISTS responses (endpoint TEXT, key TEXT, value TEXT, stored_at REAL, PRIMARY KEY (endpoint, key))')
+            self._connection.commit()
+
+    @staticmethod
+    def shared() -> 'ResponseCache':
+        """
+        Process-wide cache, used by clients that are not given one explicitly.
+        """
+        with ResponseCache._shared_lock:
+            if ResponseCache._shared is None:
+                ResponseCache._shared = ResponseCache()
+            return ResponseCache._shared
+
+    def _count(self, endpoint: str, outcome: str) -> None:
+        counters = self.counters.setdefault(endpoint, {'hits': 0, 'stale_hits': 0, 'misses': 0})
+        counters[outcome] += 1
+
+    def _load(self, endpoint: str, key: str) -> Optional[Tuple[Any, float]]:
+        """
+        Entry from memory, else from disk (promoting it to memory). Called with the lock held.
+        """
+        entry = self.memory.get((endpoint, key))
+        if entry is not None:
+            self.memory.move_to_end((endpoint, key))
+            return entry
+        if self._connection is None:
+            return None
+        row = self._connection.execute('SELECT value, stored_at FROM responses WHERE endpoint = ? AND key = ?', (endpoint, key)).fetchone()
+        if row is None:
+            return None
+        entry = (json.loads(row[0]), row[1])
+        self._remember(endpoint, key, entry)
+        return entry
+
+    def _remember(self, endpoint: str, key: str, entry: Tuple[Any, float]) -> None:
+        self.memory[(endpoint, key)] = entry
+        self.memory.move_to_end((endpoint, key))
+        while len(self.memory) > self.capacity:
+            self.memory.popitem(last=False)
+
+    def get(self, endpoint: str, key: str) -> Any:
+        """
+        Fresh cached value of endpoint for key, or None, without fetching (e.g. to collect the misses of a batch request).
+        """
+        ttl = self.ttls.get(endpoint, self.default_ttl)
+        with self._lock:
+            entry = self._load(endpoint, key)
+            if entry is not None and time.time() - entry[1] < ttl:
+                self._count(endpoint, 'hits')
+                return entry[0]
+            self._count(endpoint, 'misses')
+            return None
+
+    def put(self, endpoint: str, key: str, value: Any) -> None:
+        """
+        Stores value, in memory and on disk.
+        """
+        entry = (value, time.time())
+        with self._lock:
+            self._remember(endpoint, key, entry)
+            if self._connection is not None:
+                try:
+                    self._connection.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)', (endpoint, key, json.dumps(value), entry[1]))
+                    self._connection.commit()
+                except (TypeError, ValueError, sqlite3.Error) as e:
+                    logging.error(f'Error storing {endpoint} {key} in the response cache: {e}')
+
+    def _refresh(self, endpoint: str, key: str, fetch: Callable[[], Any]) -> None:
+        try:
+            value = fetch()
+            if value is not None:
+                self.put(endpoint, key, value)
+        except Exception as e:
+            logging.error(f'Error refreshing {endpoint} {key}: {e}')
+        finally:
+            with self._lock:
+                self._refreshing.discard((endpoint, key))
+
+    def get_or_fetch(self, endpoint: str, key: str, fetch: Callable[[], Any]) -> Any:
+        """
+        Cached value of endpoint for key, calling fetch() when there is no usable entry.
+
+        Parameters:
+        endpoint (str): Name of the endpoint, which selects the TTL (e.g. 'coingecko/coins').
+        key (str): The request's identity within the endpoint (e.g. the coingecko_id and query parameters).
+        fetch (Callable[[], Any]): Performs the request, returning the JSON payload or None on failure.
+
+        Returns:
+        Any: The cached or fetched payload (None if the fetch failed).
+        """
+        ttl = self.ttls.get(endpoint, self.default_ttl)
+        with self._lock:
+            entry = self._load(endpoint, key)
+            if entry is not None:
+                value, stored_at = entry
+                age = time.time() - stored_at
+                if age < ttl:
+                    self._count(endpoint, 'hits')
+                    return value
+                if age < ttl + self.max_stale:
+                    self._count(endpoint, 'stale_hits')
+                    if (endpoint, key) not in self._refreshing:
+                        self._refreshing.add((endpoint, key))
+                        if self._executor is None:
+                            self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='cache-refresh')
+                        self._executor.submit(self._refresh, endpoint, key, fetch)
+                    return value
+            self._count(endpoint, 'misses')
+
+        value = fetch()
+        if value is not None:
+            self.put(endpoint, key, value)
+        return value
+
+    def invalidate(self, endpoint: Optional[str] = None) -> None:
+        """
+        Drops every entry of endpoint, or the whole cache when endpoint is None.
+        """
+        with self._lock:
+            for cached in [cached for cached in self.memory if endpoint is None or cached[0] == endpoint]:
+                del self.memory[cached]
+            if self._connection is not None:
+                if endpoint is None:
+                    self._connection.execute('DELETE FROM responses')
+                else:
+                    self._connection.execute('DELETE FROM responses WHERE endpoint = ?', (endpoint,))
+                self._connection.commit()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Fresh hits, stale hits and misses per endpoint.
+        """
+        with self._lock:
+            return {endpoint: dict(counters) for endpoint, counters in self.counters.items()}
@@ -1,14 +1,45 @@
 import requests
 import logging
 import pandas as pd
-from typing import Optional
+from typing import Optional, List, Dict
 from vesta.token import Token
+from .scheduler import Scheduler
+from .sessions import Sessions
+from .cache import ResponseCache
 
 class CoinGecko:
     """
     A class to interact with the CoinGecko API to fetch cryptocurrency data.
     """
 
+    def __init__(self, scheduler: Optional[Scheduler] = None, priority: int = Scheduler.NORMAL, session: Optional[requests.Session] = None, cache: Optional[ResponseCache] = None) -> None:
+        """
+        Parameters:
+        scheduler (Scheduler, optional): Rate limiter shared with the other clients, defaults to Scheduler.shared().
+        priority (int): Queue priority of this client's requests (lower first).
+        session (requests.Session, optional): Pooled HTTP session, defaults to Sessions.shared().session('coingecko').
+        cache (ResponseCache, optional): Cache of the coins and market_chart payloads, defaults to ResponseCache.shared().
+        """
+        self.scheduler = scheduler if scheduler is not None else Scheduler.shared()
+        self.priority = priority
+        self.session = session if session is not None else Sessions.shared().session('coingecko')
+        self.cache = cache if cache is not None else ResponseCache.shared()
+
+    def _get_json(self, url: str, description: str) -> Optional[dict]:
+        """
+        JSON payload of a GET request, or None (logged) if it fails.
+        """
+        try:
+            response_API = self.scheduler.get('coingecko', url, self.priority, session=self.session)
+            if response_API.status_code == 200:
+                return response_API.json()
+            else:
+                logging.warning(f'Failed to fetch {description}. HTTP Status Code: {response_API.status_code}')
+                return None
+        except Exception as e:
+            logging.error(f'Error fetching {description}: {e}')
+            return None
+
     def get_price(self, token: Token) -> Optional[float]:
         """
         Fetches the current price of a specified token in USD.
@@ -20,7 +51,7 @@ class CoinGecko:
         float | None: The current price in USD or None if an error occurs.
         """
         try:
-            response_API = requests.get(f'https://api.coingecko.com/api/v3/simple/price?ids={token.coingecko_id.lower()}&vs_currencies=usd')
+            response_API = self.scheduler.get('coingecko', f'https://api.coingecko.com/api/v3/simple/price?ids={token.coingecko_id.lower()}&vs_currencies=usd', self.priority, session=self.session)
             if response_API.status_code == 200:
                 response_json = response_API.json()
                 return response_json.get(token.coingecko_id, {}).get('usd', 0.0)
@@ -31,6 +62,32 @@ class CoinGecko:
             logging.error(f'Error fetching price: {e}')
             return None
 
+    def get_prices(self, tokens: List[Token], chunk_size: int = 100) -> Dict[str, float]:
+        """
+        Fetches the current USD price of many tokens with one simple/price request per chunk_size ids.
+
+        Parameters:
+        tokens (List[Token]): The tokens for which to fetch prices.
+        chunk_size (int, optional): Number of ids per request. Defaults to 100.
+
+        Returns:
+        Dict[str, float]: Prices keyed by coingecko_id (tokens whose chunk failed are missing).
+        """
+        ids = list(dict.fromkeys(token.coingecko_id.lower() for token in tokens))
+        prices = {}
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            try:
+                response_API = self.scheduler.get('coingecko', f'https://api.coingecko.com/api/v3/simple/price?ids={",".join(chunk)}&vs_currencies=usd', self.priority, session=self.session)
+                if response_API.status_code == 200:
+                    response_json = response_API.json()
+                    prices.update({coingecko_id: values['usd'] for coingecko_id, values in response_json.items() if 'usd' in values})
+                else:
+                    logging.warning(f'Failed to fetch prices. HTTP Status Code: {response_API.status_code}')
+            except Exception as e:
+                logging.error(f'Error fetching prices: {e}')
+        return {token.coingecko_id: prices[token.coingecko_id.lower()] for token in tokens if token.coingecko_id.lower() in prices}
+
     def get_token_data(self, token: Token) -> Optional[dict]:
         """
         Fetches data for a specified token.
@@ -41,17 +98,8 @@ class CoinGecko:
         Returns:
         dict | None: A dictionary containing token data or None if an error occurs.
         """
-        try:
-            response_API = requests.get(f'https://api.coingecko.com/api/v3/coins/{token.coingecko_id.lower()}')
-            if response_API.status_code == 200:
-                response_json = response_API.json()
-                return response_json
-            else:
-                logging.warning(f'Failed to fetch token data. HTTP Status Code: {response_API.status_code}')
-                return None
-        except Exception as e:
-            logging.error(f'Error fetching token data: {e}')
-            return None
+        coingecko_id = token.coingecko_id.lower()
+        return self.cache.get_or_fetch('coingecko/coins', coingecko_id, lambda: self._get_json(f'https://api.coingecko.com/api/v3/coins/{coingecko_id}', 'token data'))
 
     def get_historical_market_data(self, token: Token, days: int = 30, base_currency: str = 'usd') -> pd.DataFrame:
         """
@@ -65,19 +113,38 @@ class CoinGecko:
         Returns:
         pd.DataFrame | None: A DataFrame containing historical market data or None if an error occurs.
         """
+        url = f'https://api.coingecko.com/api/v3/coins/{token.coingecko_id}/market_chart?vs_currency={base_currency}&days={days}'
+        response_json = self.cache.get_or_fetch('coingecko/market_chart', f'{token.coingecko_id}/{base_currency}/{days}', lambda: self._get_json(url, 'historical market data'))
+        return self._market_chart_frame(response_json)
+
+    def get_market_chart_range(self, token: Token, start: pd.Timestamp, end: pd.Timestamp, base_currency: str = 'usd') -> Optional[pd.DataFrame]:
+        """
+        Fetches market data between two times, uncached. Ranges under a day come back roughly every 5 minutes,
+        up to 90 days hourly, and daily beyond that.
+
+        Parameters:
+        token (Token): The token for which to fetch historical data.
+        start (pd.Timestamp): Start of the range (UTC).
+        end (pd.Timestamp): End of the range (UTC).
+        base_currency (str, optional): The base currency against which to fetch historical data. Defaults to 'usd'.
+
+        Returns:
+        pd.DataFrame | None: A DataFrame of 'price' and 'volume' indexed by timestamp, or None if an error occurs.
+        """
+        url = f'https://api.coingecko.com/api/v3/coins/{token.coingecko_id}/market_chart/range?vs_currency={base_currency}&from={int(pd.Timestamp(start).timestamp())}&to={int(pd.Timestamp(end).timestamp())}'
+        return self._market_chart_frame(self._get_json(url, 'market chart range'))
+
+    @staticmethod
+    def _market_chart_frame(response_json: Optional[dict]) -> Optional[pd.DataFrame]:
+        if response_json is None:
+            return None
         try:
-            response_API = requests.get(f'https://api.coingecko.com/api/v3/coins/{token.coingecko_id}/market_chart?vs_currency={base_currency}&days={days}')
-            if response_API.status_code == 200:
-                response_json = response_API.json()
-                df_prices = pd.DataFrame(response_json['prices'], columns=['timestamp', 'price'])
-                df_volume = pd.DataFrame(response_json['total_volumes'], columns=['timestamp', 'volume'])
-                df = pd.merge(df_prices, df_volume, on='timestamp')
-                df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-                df.set_index('timestamp', inplace=True)
-                return df
-            else:
-                logging.warning(f'Failed to fetch historical market data. HTTP Status Code: {response_API.status_code}')
-                return None
+            df_prices = pd.DataFrame(response_json['prices'], columns=['timestamp', 'price'])
+            df_volume = pd.DataFrame(response_json['total_volumes'], columns=['timestamp', 'volume'])
+            df = pd.merge(df_prices, df_volume, on='timestamp')
+            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+            df.set_index('timestamp', inplace=True)
+            return df
         except Exception as e:
             logging.error(f'Error fetching historical market data: {e}')
             return None
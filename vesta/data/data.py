@@ -1,7 +1,8 @@
 from solana.rpc.api import Client as SolClient
 from etherscan import Etherscan
 from web3 import Web3, HTTPProvider, IPCProvider, WebsocketProvider
-from typing import Union, Type, List, Dict
+from typing import Union, Type, List, Dict, Optional, Tuple
+import logging
 from .jupiter import Jupiter
 import requests
 from .coingecko import CoinGecko
@@ -9,6 +10,10 @@ from ..token.token import Token
 from .moralis import MoralisClient
 from .ethplorer import Ethplorer
 from .pythpy import PythPyClient
+from .scheduler import Scheduler
+from .sessions import Sessions
+from .cache import ResponseCache
+from .history import PriceHistoryStore
 
 class Data:
     """
@@ -26,33 +31,48 @@ class Data:
         web3_client: Web3,
         sol_client: SolClient,
         moralis_client: MoralisClient,
+        scheduler: Optional[Scheduler] = None,
+        sessions: Optional[Sessions] = None,
+        cache: Optional[ResponseCache] = None,
     ) -> None:
+        """
+        Parameters:
+        scheduler (Scheduler, optional): Rate limiter shared by the clients, defaults to Scheduler.shared().
+        sessions (Sessions, optional): Pooled HTTP sessions shared by the clients (pool size, timeouts and retries are
+        configured on it), defaults to Sessions.shared().
+        cache (ResponseCache, optional): Response cache shared by the clients, defaults to ResponseCache.shared().
+        """
         self.etherscan_client = etherscan_client
         self.web3_client = web3_client
         self.sol_client = sol_client
         self.moralis_client = moralis_client 
-
-        """ New instances of the 'Jupiter' class used in Vesta's Data module. """
-        self.coingecko = CoinGecko()
-        self.ethplorer = Ethplorer()
-        self.pythpy = PythPyClient(self.sol_client)
-        self.jupiter = Jupiter(self.coingecko)
-
-    def get_eth_earliest_transaction_hash(self, token: Token) -> str:
+        self.scheduler = scheduler if scheduler is not None else Scheduler.shared()
+        self.sessions = sessions if sessions is not None else Sessions.shared()
+        self.cache = cache if cache is not None else ResponseCache.shared()
+
+        """ New instances of the 'Jupiter' class used in Vesta's Data module, sharing one rate limiter and connection pools. """
+        self.coingecko = CoinGecko(self.scheduler, session=self.sessions.session('coingecko'), cache=self.cache)
+        self.ethplorer = Ethplorer(self.scheduler, session=self.sessions.session('ethplorer'), cache=self.cache)
+        self.pythpy = PythPyClient(self.sol_client, self.scheduler, pool_size=self.sessions.pool_size, timeout=self.sessions.timeout)
+        self.jupiter = Jupiter(self.coingecko, self.scheduler, session=self.sessions.session('jupiter'), cache=self.cache)
+        self.history = PriceHistoryStore(self.coingecko)
+
+    def get_eth_earliest_transaction(self, token: Token) -> Optional[dict]:
         """
-        Retrieves the transaction hash of a contract creation, if available.
-        If a contract creation transaction cannot be found, returns the earliest transaction involving the contract.
-        After this is used, you can use Infura to get the block data (number etc).
+        Retrieves the earliest Etherscan transaction involving the contract (its creation, if available),
+        including its 'hash', 'blockNumber' and 'timeStamp'.
 
         Args:
-            contract_address (str): The address of the contract.
+            token (Token): The token whose contract to look up.
 
         Returns:
-            The transaction hash as a string.
+            The transaction as a dictionary, or None if the address has no transactions.
         """
         try:
             # Retrieve the first transaction by address in ascending order
-            tx_list = self.etherscan_client.get_normal_txs_by_address_paginated(
+            tx_list = self.scheduler.call(
+                'etherscan',
+                self.etherscan_client.get_normal_txs_by_address_paginated,
                 address=token.eth_address,
                 page=1,
                 offset=1,
@@ -67,18 +87,103 @@ class Data:
                 return None
 
             # Retrieve the first transaction
-            tx = tx_list[0]
-
-            # Check if this is a contract creation transaction
-            if tx["to"] == "":
-                return tx["hash"]
-            else:
-                return tx["hash"]
+            return tx_list[0]
 
         except Exception as e:
             print(f"Failed to get earliest transaction hash: {e}")
             raise e
 
+    def get_eth_earliest_transaction_hash(self, token: Token) -> str:
+        """
+        Retrieves the transaction hash of a contract creation, if available.
+        If a contract creation transaction cannot be found, returns the earliest transaction involving the contract.
+        After this is used, you can use Infura to get the block data (number etc).
+
+        Args:
+            contract_address (str): The address of the contract.
+
+        Returns:
+            The transaction hash as a string.
+        """
+        tx = self.get_eth_earliest_transaction(token)
+        return None if tx is None else tx["hash"]
+
+    def _eth_batch(self, calls: List[Tuple[str, list]]) -> List[Optional[dict]]:
+        """
+        Results of many JSON-RPC calls, sent as one batch request over an HTTP provider's pooled session
+        (web3 6 has no batching of its own), or one by one over other providers.
+        """
+        if not calls:
+            return []
+        provider = self.web3_client.provider
+        if not isinstance(provider, HTTPProvider):
+            return [provider.make_request(method, params).get("result") for method, params in calls]
+
+        payload = [{"jsonrpc": "2.0", "id": id, "method": method, "params": params} for id, (method, params) in enumerate(calls)]
+        response = self.sessions.session('web3').post(provider.endpoint_uri, json=payload, headers={"Content-Type": "application/json"})
+        response.raise_for_status()
+        results = {item["id"]: item.get("result") for item in response.json()}
+        return [results.get(id) for id in range(len(calls))]
+
+    def get_eth_contract_creations(self, tokens: List[Token]) -> Dict[str, Optional[Tuple[int, int, str]]]:
+        """
+        Contract creation timestamp, block number and transaction hash of many tokens.
+
+        These never change, so they are kept in the response cache with no expiry, keyed by chain and address. On a miss
+        the earliest transaction comes from Etherscan, whose transaction list already carries its block number and
+        timestamp; only when those are missing are the receipts and then the blocks fetched, each as one batched
+        JSON-RPC request for all tokens.
+
+        Args:
+            tokens (List[Token]): The tokens to look up (tokens without an eth_address are skipped).
+
+        Returns:
+            A dictionary of (timestamp, block number, hash) tuples, or None where the lookup failed, keyed by lowercase eth_address.
+        """
+        creations = {}
+        missing = {}
+        for token in tokens:
+            if not token.eth_address:
+                continue
+            address = token.eth_address.lower()
+            cached = self.cache.get('eth/contract_creation', f'eth/{address}')
+            if cached is not None:
+                creations[address] = tuple(cached)
+            elif address not in missing:
+                missing[address] = token
+
+        unresolved = {}
+        for address, token in missing.items():
+            try:
+                tx = self.get_eth_earliest_transaction(token)
+            except Exception as e:
+                logging.error(f"Error while getting contract creation transaction of {token.symbol}: {e}")
+                tx = None
+            if tx is None:
+                creations[address] = None
+            elif tx.get("blockNumber") and tx.get("timeStamp"):
+                creations[address] = (int(tx["timeStamp"]), int(tx["blockNumber"]), tx["hash"])
+            else:
+                unresolved[address] = tx["hash"]
+
+        if unresolved:
+            try:
+                receipts = self._eth_batch([("eth_getTransactionReceipt", [creation_hash]) for creation_hash in unresolved.values()])
+                block_numbers = [None if receipt is None else receipt["blockNumber"] for receipt in receipts]
+                blocks = self._eth_batch([("eth_getBlockByNumber", [block_number, False]) for block_number in block_numbers if block_number is not None])
+                blocks = iter(blocks)
+                for (address, creation_hash), block_number in zip(unresolved.items(), block_numbers):
+                    block = None if block_number is None else next(blocks)
+                    creations[address] = None if block is None else (int(block["timestamp"], 16), int(block_number, 16), creation_hash)
+            except Exception as e:
+                logging.error(f"Error while getting contract creation blocks: {e}")
+                creations.update({address: None for address in unresolved if address not in creations})
+
+        for address in missing:
+            if creations.get(address) is not None:
+                self.cache.put('eth/contract_creation', f'eth/{address}', list(creations[address]))
+        return creations
+
     def get_eth_contract_creation_timestamp_block_hash(self, token: Token):
         """
         Retrieves the contract creation timestamp, block number, and transaction hash.
@@ -90,31 +195,8 @@ class Data:
             A tuple containing the contract creation timestamp (int),
             block number (int), and transaction hash (str).
         """
-        creation_hash = None
-        try:
-            # Get the earliest transaction hash for contract creation
-            creation_hash = self.get_eth_earliest_transaction_hash(token=token)
-        except Exception as e:
-            print(f"Error while getting contract creation transaction hash: {e}")
-            raise ValueError
-
-        creation_block_number = None
-        tx_receipt = None
-        try:
-            # Get the transaction receipt to retrieve the block number
-            tx_receipt = self.web3_client.eth.get_transaction_receipt(creation_hash)
-            creation_block_number = tx_receipt["blockNumber"]
-        except Exception as e:
-            print(f"Error while getting block number: {e}")
+        creation = self.get_eth_contract_creations([token]).get(token.eth_address.lower())
+        if creation is None:
+            print(f"Error while getting contract creation of {token.symbol}")
             raise ValueError
-
-        creation_timestamp = None
-        try:
-            # Get the block timestamp using the block number
-            creation_timestamp = self.web3_client.eth.get_block(creation_block_number)["timestamp"]
-        except Exception as e:
-            print(f"Error while getting timestamp: {e}")
-            raise ValueError
-
-        return creation_timestamp, creation_block_number, creation_hash
-
+        return creation
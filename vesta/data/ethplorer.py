@@ -4,15 +4,22 @@ import pandas as pd
 from typing import Optional
 from vesta.token import Token
 from moralis import evm_api
-import pandas as pd
+from .scheduler import Scheduler
+from .sessions import Sessions
+from .cache import ResponseCache
 
 class Ethplorer:
     """
-    A class to interact with the Moralis API to fetch cryptocurrency data.
+    A class to interact with the Ethplorer API to fetch token holder data.
     """
 
-    @staticmethod
-    def get_eth_top_holders(token: Token) -> pd.DataFrame:
+    def __init__(self, scheduler: Optional[Scheduler] = None, priority: int = Scheduler.NORMAL, session: Optional[requests.Session] = None, cache: Optional[ResponseCache] = None) -> None:
+        self.scheduler = scheduler if scheduler is not None else Scheduler.shared()
+        self.priority = priority
+        self.session = session if session is not None else Sessions.shared().session('ethplorer')
+        self.cache = cache if cache is not None else ResponseCache.shared()
+
+    def get_eth_top_holders(self, token: Token) -> pd.DataFrame:
         """
         Fetches the current price of a specified token in USD.
 
@@ -22,11 +29,15 @@ class Ethplorer:
         Returns:
         float | None: The current price in USD or None if an error occurs.
         """
+        holders = self.cache.get_or_fetch('ethplorer/top_holders', token.eth_address.lower(), lambda: self._get_top_holders(token))
+        return pd.DataFrame(holders) if holders is not None else None
+
+    def _get_top_holders(self, token: Token) -> Optional[list]:
         try:
-            response_API = requests.get(f'https://api.ethplorer.io/getTopTokenHolders/{token.eth_address}?apiKey=freekey&limit=1000')
+            response_API = self.scheduler.get('ethplorer', f'https://api.ethplorer.io/getTopTokenHolders/{token.eth_address}?apiKey=freekey&limit=1000', self.priority, session=self.session)
             if response_API.status_code == 200:
                 response_json = response_API.json()
-                return pd.DataFrame(response_json['holders'])
+                return response_json['holders']
             else:
                 logging.warning(f'Failed to fetch price. HTTP Status Code: {response_API.status_code}')
                 return None
@@ -0,0 +1,199 @@
+import logging
+import os
+import threading
+import time
+from typing import Optional, Dict
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from vesta.token import Token
+from .coingecko import CoinGecko
+
+class PriceHistoryStore:
+    """
+    Local Parquet store of CoinGecko price and volume history, partitioned by token (one token=<coingecko_id> directory each).
+
+    A token's first update downloads initial_days of hourly history; later updates only download the tail since the last
+    stored timestamp and append it as a new part file, so the network only sees small deltas. Rows are deduplicated on
+    timestamp and parts are compacted into one file once there are more than max_parts. Reads are memory-mapped Arrow
+    reads with the time range pushed down as a filter.
+
+    CoinGecko returns tails under a day at roughly 5 minute granularity, so recent history is denser than older history;
+    pass interval (e.g. '1h') to get a regular grid.
+    """
+
+    DEFAULT_ROOT = os.path.join(os.path.expanduser('~'), '.cache', 'vesta', 'history')
+
+    SCHEMA = pa.schema([('timestamp', pa.timestamp('ms')), ('price', pa.float64()), ('volume', pa.float64())])
+
+    def __init__(self, coingecko: CoinGecko, root: str = DEFAULT_ROOT, base_currency: str = 'usd', initial_days: int = 90, min_refresh: float = 30.0, max_parts: int = 64) -> None:
+        """
+        Parameters:
+        coingecko (CoinGecko): Client used to download history.
+        root (str): Directory of the store.
+        base_currency (str): Currency prices are quoted in.
+        initial_days (int): Days of history downloaded for a token not yet in the store (hourly up to 90).
+        min_refresh (float): Seconds within which a token is not refreshed again (CoinGecko updates about every 30 seconds).
+        max_parts (int): Number of part files per token above which they are compacted into one.
+        """
+        self.coingecko = coingecko
+        self.root = root
+        self.base_currency = base_currency
+        self.initial_days = initial_days
+        self.min_refresh = min_refresh
+        self.max_parts = max_parts
+        self._last_timestamp: Dict[str, pd.Timestamp] = {}
+        self._refreshed: Dict[str, float] = {}
+        self._locks: Dict[str, threading.RLock] = {}
+        self._locks_lock = threading.Lock()
+
+    def _lock(self, token: Token) -> threading.RLock:
+        with self._locks_lock:
+            return self._locks.setdefault(token.coingecko_id, threading.RLock())
+
+    def path(self, token: Token) -> str:
+        return os.path.join(self.root, f'token={token.coingecko_id}', f'currency={self.base_currency}')
+
+    def _parts(self, token: Token) -> list:
+        directory = self.path(token)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith('.parquet'))
+
+    def _read_table(self, token: Token, columns: Optional[list] = None, filters: Optional[list] = None) -> Optional[pa.Table]:
+        # Under the token's lock, so that a compaction cannot remove parts mid-read
+        with self._lock(token):
+            parts = self._parts(token)
+            if not parts:
+                return None
+            return pq.read_table(parts, columns=columns, filters=filters, memory_map=True, schema=PriceHistoryStore.SCHEMA)
+
+    def last_timestamp(self, token: Token) -> Optional[pd.Timestamp]:
+        """
+        Latest stored timestamp of the token, or None if it is not in the store.
+        """
+        if token.coingecko_id not in self._last_timestamp:
+            table = self._read_table(token, columns=['timestamp'])
+            if table is None or table.num_rows == 0:
+                return None
+            self._last_timestamp[token.coingecko_id] = pd.Timestamp(pc.max(table['timestamp']).as_py())
+        return self._last_timestamp[token.coingecko_id]
+
+    def _write(self, token: Token, df: pd.DataFrame, name: str) -> None:
+        """
+        Writes a part file atomically, so readers never see a partial file.
+        """
+        directory = self.path(token)
+        os.makedirs(directory, exist_ok=True)
+        table = pa.Table.from_pandas(df.reset_index()[['timestamp', 'price', 'volume']], schema=PriceHistoryStore.SCHEMA, preserve_index=False, safe=False)
+        temporary = os.path.join(directory, f'.{name}.tmp')
+        pq.write_table(table, temporary)
+        os.replace(temporary, os.path.join(directory, name))
+
+    def compact(self, token: Token) -> None:
+        """
+        Merges the token's part files into one, dropping duplicate timestamps.
+        """
+        with self._lock(token):
+            parts = self._parts(token)
+            if len(parts) <= 1:
+                return
+            df = self._deduplicate(self._read_table(token).to_pandas().set_index('timestamp'))
+            name = f'part-{time.time_ns()}.parquet'
+            self._write(token, df, name)
+            for part in parts:
+                os.remove(part)
+
+    @staticmethod
+    def _deduplicate(df: pd.DataFrame) -> pd.DataFrame:
+        df = df[~df.index.duplicated(keep='last')]
+        return df.sort_index()
+
+    def update(self, token: Token, force: bool = False) -> int:
+        """
+        Downloads the history missing since the last stored timestamp (or initial_days of it) and appends it.
+
+        Parameters:
+        token (Token): The token to update.
+        force (bool): Update even if the token was refreshed less than min_refresh seconds ago.
+
+        Returns:
+        int: Number of new rows stored.
+        """
+        with self._lock(token):
+            now = time.monotonic()
+            if not force and now - self._refreshed.get(token.coingecko_id, -float('inf')) < self.min_refresh:
+                return 0
+
+            last = self.last_timestamp(token)
+            if last is None:
+                df = self.coingecko.get_historical_market_data(token, self.initial_days, self.base_currency)
+            else:
+                df = self.coingecko.get_market_chart_range(token, last, pd.Timestamp.now('UTC').tz_localize(None), self.base_currency)
+            if df is None:
+                return 0
+            self._refreshed[token.coingecko_id] = now
+
+            df = self._deduplicate(df)
+            if last is not None:
+                df = df[df.index > last]
+            if df.empty:
+                return 0
+            self._write(token, df, f'part-{time.time_ns()}.parquet')
+            self._last_timestamp[token.coingecko_id] = df.index[-1]
+            rows = len(df)
+
+        if len(self._parts(token)) > self.max_parts:
+            self.compact(token)
+        return rows
+
+    def get(self, token: Token, start: Optional[pd.Timestamp] = None, end: Optional[pd.Timestamp] = None, days: Optional[float] = None, interval: Optional[str] = None, refresh: bool = True) -> Optional[pd.DataFrame]:
+        """
+        Stored history of the token, in the format of CoinGecko.get_historical_market_data.
+
+        Parameters:
+        token (Token): The token to read.
+        start, end (pd.Timestamp, optional): Time range (UTC), open-ended when None.
+        days (float, optional): Shorthand for start = now - days.
+        interval (str, optional): Pandas frequency (e.g. '1h') to resample to, keeping the last tick of each interval.
+        refresh (bool): Fetch the missing tail first.
+
+        Returns:
+        pd.DataFrame | None: 'price' and 'volume' indexed by timestamp, or None if the token has no stored history.
+        """
+        if refresh:
+            try:
+                self.update(token)
+            except Exception as e:
+                logging.error(f'Error updating price history of {token.symbol}: {e}')
+        if days is not None:
+            start = pd.Timestamp.now('UTC').tz_localize(None) - pd.Timedelta(days=days)
+        filters = []
+        if start is not None:
+            filters.append(('timestamp', '>=', pd.Timestamp(start).to_pydatetime()))
+        if end is not None:
+            filters.append(('timestamp', '<=', pd.Timestamp(end).to_pydatetime()))
+
+        table = self._read_table(token, filters=filters or None)
+        if table is None:
+            return None
+        df = self._deduplicate(table.to_pandas().set_index('timestamp'))
+        if interval is not None:
+            df = df.resample(interval).last().dropna()
+        return df
+
+    def latest(self, token: Token, refresh: bool = True) -> Optional[pd.Series]:
+        """
+        Most recent stored tick ('price', 'volume', with its timestamp as name), or None.
+        """
+        if refresh:
+            try:
+                self.update(token)
+            except Exception as e:
+                logging.error(f'Error updating price history of {token.symbol}: {e}')
+        last = self.last_timestamp(token)
+        if last is None:
+            return None
+        df = self.get(token, start=last, refresh=False)
+        return df.iloc[-1] if df is not None and not df.empty else None
@@ -1,36 +1,114 @@
 from solana.rpc.api import Client as SolClient
 from aioetherscan import Client as EtherscanClient
 from web3 import Web3, HTTPProvider, IPCProvider, WebsocketProvider
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+import json
+import logging
+import numpy as np
+import pandas as pd
 import requests
 from vesta.token import Token
 from .coingecko import CoinGecko
-import time
+from .scheduler import Scheduler
+from .sessions import Sessions
+from .cache import ResponseCache
+
+class SlippageCurve:
+    """
+    Monotone fit of a token's Jupiter slippage (price impact in %) against the USDC size sold, as measured by
+    Jupiter.sample_slippage_curve at 'timestamp' with the reference 'price'.
+
+    The fit is an isotonic (non-decreasing) regression of the sampled slippages, interpolated linearly in log size.
+    Sizes above max_size could not be routed and return 100, the value get_usdc_swap_price_slippage reports for them.
+    """
+
+    def __init__(self, symbol: str, sizes: np.ndarray, slippages: np.ndarray, max_size: Optional[float], price: float, timestamp: pd.Timestamp) -> None:
+        order = np.argsort(sizes)
+        self.symbol = symbol
+        self.sizes = np.asarray(sizes, dtype=float)[order]
+        self.slippages = np.asarray(slippages, dtype=float)[order]
+        self.fitted = SlippageCurve.isotonic(self.slippages)
+        self.max_size = max_size
+        self.price = price
+        self.timestamp = pd.Timestamp(timestamp)
+
+    @staticmethod
+    def isotonic(values: np.ndarray) -> np.ndarray:
+        """
+        Least squares non-decreasing fit of values (pool adjacent violators).
+        """
+        blocks = []
+        for value in values:
+            blocks.append([value, 1])
+            while len(blocks) > 1 and blocks[-2][0] > blocks[-1][0]:
+                value, count = blocks.pop()
+                blocks[-1] = [(blocks[-1][0] * blocks[-1][1] + value * count) / (blocks[-1][1] + count), blocks[-1][1] + count]
+        return np.concatenate([np.full(count, value) for value, count in blocks]) if blocks else np.array([])
+
+    def __call__(self, size):
+        """
+        Fitted slippage in % at USDC size(s). Below the smallest sample it falls linearly to 0 at size 0.
+        """
+        size = np.asarray(size, dtype=float)
+        with np.errstate(divide='ignore'):
+            slippage = np.interp(np.log(np.maximum(size, self.sizes[0])), np.log(self.sizes), self.fitted)
+        slippage = np.where(size < self.sizes[0], self.fitted[0] * size / self.sizes[0], slippage)
+        if self.max_size is not None:
+            slippage = np.where(size > self.max_size, 100.0, slippage)
+        return slippage
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame({'size': self.sizes, 'slippage': self.slippages, 'fitted': self.fitted})
+
+    def to_dict(self) -> dict:
+        return {
+            'symbol': self.symbol,
+            'sizes': self.sizes.tolist(),
+            'slippages': self.slippages.tolist(),
+            'max_size': self.max_size,
+            'price': self.price,
+            'timestamp': self.timestamp.isoformat(),
+        }
+
+    @staticmethod
+    def from_dict(values: dict) -> 'SlippageCurve':
+        return SlippageCurve(values['symbol'], np.array(values['sizes']), np.array(values['slippages']), values['max_size'], values['price'], pd.Timestamp(values['timestamp']))
+
 
 class Jupiter:
-    def __init__(self, coingecko: CoinGecko) -> None:
+    def __init__(self, coingecko: CoinGecko, scheduler: Optional[Scheduler] = None, priority: int = Scheduler.NORMAL, session: Optional[requests.Session] = None, cache: Optional[ResponseCache] = None) -> None:
         """
         Initializes a new instance of the Jupiter class.
 
         Parameters:
         coingecko (CoinGecko): An instance of the CoinGecko class used to retrieve token prices.
-
+        scheduler (Scheduler, optional): Rate limiter shared with the other clients, defaults to Scheduler.shared().
+        priority (int): Queue priority of this client's requests (lower first).
+        session (requests.Session, optional): Pooled HTTP session, defaults to Sessions.shared().session('jupiter').
+        cache (ResponseCache, optional): Store of sampled slippage curves, defaults to ResponseCache.shared().
         """
         self.coingecko = coingecko
+        self.scheduler = scheduler if scheduler is not None else Scheduler.shared()
+        self.priority = priority
+        self.session = session if session is not None else Sessions.shared().session('jupiter')
+        self.cache = cache if cache is not None else ResponseCache.shared()
         
-    def get_usdc_swap_price_slippage(self, token: Token, usdc_quantity: int) -> Optional[Dict[str, Any]]:
+    def get_usdc_swap_price_slippage(self, token: Token, usdc_quantity: int, price: Optional[float] = None) -> Optional[float]:
         """
         Calculates the price impact of selling usdc_quantity worth of the token for USDC.
 
         Parameters:
         token (Token): The token to be traded.
         usdc_quantity (int): The amount of USDC that will be traded into.
+        price (float, optional): The token price in USDC, if already known (e.g. from CoinGecko.get_prices). Fetched otherwise.
 
         Returns:
-        Optional[Dict[str, Any]]: The response from the quote API - the price impact in %, or None if an error occurs.
+        Optional[float]: The price impact in % from the quote API (100 if the size cannot be routed), or None if an error occurs.
         """
         # Retrieve the current price of the token in terms of USDC.
-        price = self.coingecko.get_price(token)
+        if price is None:
+            price = self.coingecko.get_price(token)
         if not price:
             raise ValueError(f'Could not retrieve price for {token.symbol} in liquidity swapping calculations.')
         
@@ -52,28 +130,130 @@ class Jupiter:
             f'experimentalDexes=Jupiter%20LO'
         )
         
-        max_retries = 5
-        retry_delay = 2 
+        # Rate limiting and 429 retries are handled by the scheduler
+        try:
+            response_API = self.scheduler.get('jupiter', url, self.priority, session=self.session)
+            if response_API.status_code == 429:
+                logging.error(f'Jupiter quote for {token.symbol} still rate limited after retries')
+                return None
+
+            response_json = response_API.json()
+            if 'error' in response_json and response_json['error'] == 'The route plan does not consume all the input amount, please lower your input amount':
+                return 100
+
+            response_API.raise_for_status()
+            return float(response_json['priceImpactPct']) * 100
+        except (requests.RequestException, KeyError, TypeError, ValueError) as e:
+            logging.error(f'Error getting the Jupiter quote for {usdc_quantity} USDC of {token.symbol}: {e}')
+            return None
+
+    def sample_slippage_curve(self, token: Token, min_size: float = 1e3, max_size: float = 5e7, points: int = 12, max_points: int = 40, tolerance: float = 0.25, search_steps: int = 6, repeats: int = 1, max_workers: int = 5, price: Optional[float] = None) -> Optional[SlippageCurve]:
+        """
+        Measures the slippage curve of selling the token for USDC with few quotes, chosen adaptively:
+        1. a coarse log grid of 'points' sizes from min_size to max_size;
+        2. if the route breaks within the grid, a binary search in log size (search_steps halvings) for the largest executable size;
+        3. refinement rounds adding the log midpoints of intervals next to a sample where the curve bends by more than
+           tolerance percentage points (second difference in log size), until none does or max_points quotes are used.
+        The reference price is fetched once, and each batch of quotes is sent concurrently on max_workers threads, within
+        the Jupiter rate limit of the scheduler.
 
-        for attempt in range(max_retries):
+        Parameters:
+        token (Token): The token to be traded.
+        min_size, max_size (float): Range of USDC sizes to sample.
+        points (int): Number of sizes in the coarse grid.
+        max_points (int): Maximum number of sizes quoted.
+        tolerance (float): Bend of the curve, in percentage points of slippage, above which it is refined.
+        search_steps (int): Halvings of the log interval bracketing the largest executable size.
+        repeats (int): Quotes per size, of which the median is kept (quotes are noisy as routes change).
+        max_workers (int): Concurrent quotes.
+        price (float, optional): The reference token price in USDC. Fetched once otherwise.
+
+        Returns:
+        SlippageCurve | None: The fitted curve, or None if no size could be quoted below the smallest unroutable one.
+        """
+        if price is None:
+            price = self.coingecko.get_price(token)
+        if not price:
+            logging.error(f'Could not retrieve price for {token.symbol} in slippage curve sampling.')
+            return None
+
+        samples: Dict[float, Optional[float]] = {}
+
+        def quote_once(size: float) -> Optional[float]:
+            # A failed quote is a missing sample, it must not abort the whole batch
             try:
-                response_API = requests.get(url)
-                
-                if response_API.status_code == 429:
-                    print(f"Rate limited, retrying in {retry_delay} seconds... (Attempt {attempt + 1}/{max_retries})")
-                    time.sleep(retry_delay)
-                    retry_delay *= 2  # double the delay for the next attempt
-                    continue  # skip the rest of the loop and try again
-                
-                response_json = response_API.json()
-                if 'error' in response_json and response_json['error'] == 'The route plan does not consume all the input amount, please lower your input amount':
-                    return 100
-                
-                response_API.raise_for_status()
-                return float(response_API.json()['priceImpactPct']) * 100
-            except requests.RequestException as e:
-                print(f'An error occurred: {e}')
+                return self.get_usdc_swap_price_slippage(token, size, price)
+            except Exception as e:
+                logging.error(f'Error quoting {size} USDC of {token.symbol} on Jupiter: {e}')
                 return None
 
-        print(f"Failed to get a successful response after {max_retries} attempts")
-        return None
\ No newline at end of file
+        def quote(size: float) -> Optional[float]:
+            values = [quote_once(size) for _ in range(repeats)]
+            values = [value for value in values if value is not None]
+            return float(np.median(values)) if values else None
+
+        def measure(sizes: List[float]) -> None:
+            sizes = [size for size in sizes if size not in samples]
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                samples.update(zip(sizes, executor.map(quote, sizes)))
+
+        def executable() -> List[float]:
+            return sorted(size for size, value in samples.items() if value is not None and value < 100)
+
+        measure(list(np.geomspace(min_size, max_size, points)))
+
+        # Largest executable size, between the last size that routed and the first that did not
+        broken = sorted(size for size, value in samples.items() if value is not None and value >= 100)
+        max_executable = None
+        if broken:
+            high = broken[0]
+            below = [size for size in executable() if size < high]
+            low = below[-1] if below else None
+            for _ in range(search_steps if low is not None else 0):
+                middle = float(np.sqrt(low * high))
+                measure([middle])
+                if samples[middle] is not None and samples[middle] < 100:
+                    low = middle
+                else:
+                    high = middle
+            # Nothing routed below the first unroutable size: cap there, so no curve extends past a size known to fail
+            max_executable = low if low is not None else high
+
+        while len(samples) < max_points:
+            sizes = [size for size in executable() if max_executable is None or size <= max_executable]
+            if len(sizes) < 3:
+                break
+            logs = np.log(sizes)
+            values = np.array([samples[size] for size in sizes])
+            slopes = np.diff(values) / np.diff(logs)
+            # Bend at each interior sample, in percentage points over its neighbouring intervals
+            bends = np.abs(np.diff(slopes)) * np.minimum(np.diff(logs)[:-1], np.diff(logs)[1:])
+            refine = set()
+            for i in np.argsort(-bends):
+                if bends[i] <= tolerance:
+                    break
+                refine.update({float(np.sqrt(sizes[i] * sizes[i + 1])), float(np.sqrt(sizes[i + 1] * sizes[i + 2]))})
+            refine = [size for size in sorted(refine) if size not in samples][:max_points - len(samples)]
+            if not refine:
+                break
+            measure(refine)
+
+        sizes = [size for size in executable() if max_executable is None or size <= max_executable]
+        if not sizes:
+            logging.warning(f'No executable Jupiter quote for {token.symbol} between {min_size} and {max_size} USDC.')
+            return None
+        return SlippageCurve(token.symbol, np.array(sizes), np.array([samples[size] for size in sizes]), max_executable, price, pd.Timestamp.now('UTC'))
+
+    def get_slippage_curve(self, token: Token, **kwargs) -> Optional[SlippageCurve]:
+        """
+        The token's slippage curve from the cache ('jupiter/slippage_curve' endpoint, refreshed in the background once
+        stale), sampled with sample_slippage_curve(token, **kwargs) when there is none. Curves sampled with different
+        kwargs are cached separately.
+        """
+        def sample() -> Optional[dict]:
+            curve = self.sample_slippage_curve(token, **kwargs)
+            return None if curve is None else curve.to_dict()
+
+        key = f'{token.symbol}:{json.dumps(kwargs, sort_keys=True, default=str)}'
+        values = self.cache.get_or_fetch('jupiter/slippage_curve', key, sample)
+        return None if values is None else SlippageCurve.from_dict(values)
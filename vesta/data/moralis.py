@@ -4,6 +4,8 @@ import pandas as pd
 from typing import Optional
 from vesta.token import Token
 from moralis import evm_api
+from .scheduler import Scheduler
+from .cache import ResponseCache
 
 
 class MoralisClient:
@@ -11,8 +13,11 @@ class MoralisClient:
     A class to interact with the Moralis API to fetch cryptocurrency data.
     """
 
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, scheduler: Optional[Scheduler] = None, priority: int = Scheduler.NORMAL, cache: Optional[ResponseCache] = None):
         self.api_key = api_key
+        self.scheduler = scheduler if scheduler is not None else Scheduler.shared()
+        self.priority = priority
+        self.cache = cache if cache is not None else ResponseCache.shared()
 
     def get_eth_wallet_stats(self, token: Token) -> Optional[float]:
         """
@@ -26,12 +31,19 @@ class MoralisClient:
         """
         try:
             if token.type == "eth":
-                result = evm_api.wallets.get_wallet_stats(
-                    api_key=self.api_key,
-                    params={
-                        "address": f"{token.eth_address}",
-                        "chain": "eth",
-                    },
+                result = self.cache.get_or_fetch(
+                    'moralis/wallet_stats',
+                    f"eth/{token.eth_address.lower()}",
+                    lambda: self.scheduler.call(
+                        'moralis',
+                        evm_api.wallets.get_wallet_stats,
+                        priority=self.priority,
+                        api_key=self.api_key,
+                        params={
+                            "address": f"{token.eth_address}",
+                            "chain": "eth",
+                        },
+                    ),
                 )
                 return result
             elif token.type == "sol":
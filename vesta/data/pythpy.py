@@ -1,11 +1,15 @@
 import requests
 import logging
 import pandas as pd
-from typing import Optional
+from typing import Optional, List, Dict, Tuple, Union
 from vesta.token import Token
 from moralis import evm_api
 from solana.rpc.api import Client as SolClient
 import asyncio
+import threading
+import time
+import aiohttp
+from .scheduler import Scheduler
 from pythclient.pythaccounts import PythPriceAccount, PythPriceStatus
 from pythclient.solana import SolanaClient, SolanaPublicKey, PYTHNET_HTTP_ENDPOINT, PYTHNET_WS_ENDPOINT
 
@@ -14,24 +18,231 @@ class PythPyClient:
     A class to interact with the Pyth Contracts to fetch cryptocurrency data.
     """
 
-    def __init__(self, sol_client: SolClient):
+    def __init__(self, sol_client: SolClient, scheduler: Optional[Scheduler] = None, priority: int = Scheduler.NORMAL, pool_size: int = 16, timeout: Union[float, Tuple[float, float]] = (3.05, 30), max_age: float = 60.0):
+        """
+        One SolanaClient, with a pooled keep-alive aiohttp session, is kept open for the life of this client on a
+        background event loop, instead of a new client and connection per price read.
+
+        Parameters:
+        sol_client (SolClient): Solana RPC client.
+        scheduler (Scheduler, optional): Rate limiter shared with the other clients, defaults to Scheduler.shared().
+        priority (int): Queue priority of this client's requests (lower first).
+        pool_size (int): Maximum open connections to the Pyth RPC endpoint.
+        timeout (float | Tuple[float, float]): Read timeout, or (connect, read) timeouts, in seconds.
+        max_age (float): Seconds after which a streamed price is considered stale and fetched again on read.
+        """
         self.sol_client = sol_client
+        self.scheduler = scheduler if scheduler is not None else Scheduler.shared()
+        self.priority = priority
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.max_age = max_age
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+        self._solana_client: Optional[SolanaClient] = None
+        self._http_session: Optional[aiohttp.ClientSession] = None
+        # Streaming state: subscribed accounts by symbol, and the latest price table they keep up to date
+        self.latest: Dict[str, Optional[dict]] = {}
+        self.updated: Dict[str, float] = {}
+        self._accounts: Dict[str, PythPriceAccount] = {}
+        self._subscriptions: Dict[int, str] = {}
+        self._stream_task: Optional[asyncio.Task] = None
+
+    def _run(self, coroutine):
+        """
+        Runs coroutine on the client's event loop thread, started on first use, and waits for its result.
+        """
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name='pyth-client', daemon=True).start()
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def _client(self) -> SolanaClient:
+        """
+        The persistent SolanaClient. Only called on the event loop, where its aiohttp session has to be created.
+        """
+        if self._solana_client is None:
+            connect, read = self.timeout if isinstance(self.timeout, tuple) else (None, self.timeout)
+            self._http_session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+                timeout=aiohttp.ClientTimeout(sock_connect=connect, sock_read=read),
+            )
+            self._solana_client = SolanaClient(client=self._http_session, endpoint=PYTHNET_HTTP_ENDPOINT, ws_endpoint=PYTHNET_WS_ENDPOINT)
+        return self._solana_client
+
+    def close(self) -> None:
+        """
+        Closes the connection pool and stops the event loop thread.
+        """
+        with self._loop_lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+
+        async def close():
+            await self._stop_stream()
+            if self._solana_client is not None:
+                await self._solana_client.ws_disconnect()
+                await self._solana_client.close()
+                await self._http_session.close()
+            self._solana_client = self._http_session = None
+
+        asyncio.run_coroutine_threadsafe(close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        self._accounts.clear()
+        self._subscriptions.clear()
 
     def get_pyth_data(self, token: Token) -> Optional[float]:
-        return asyncio.run(self._get_data(token))
+        """
+        Oracle price and confidence of the token: read from the streamed table (no network call) if the token is
+        subscribed and its entry is at most max_age seconds old, fetched otherwise.
+        """
+        if token.symbol in self._accounts:
+            if time.time() - self.updated.get(token.symbol, -float('inf')) <= self.max_age:
+                return self.latest.get(token.symbol)
+            logging.warning(f"Streamed Pyth price of {token.symbol} is older than {self.max_age}s, fetching it")
+        self.scheduler.acquire('pyth', self.priority)
+        price_data = self._run(self._get_data(token))
+        if token.symbol in self._accounts:
+            self.latest[token.symbol] = price_data
+            self.updated[token.symbol] = time.time()
+        return price_data
+
+    def subscribe(self, tokens: List[Token]) -> Dict[str, Optional[dict]]:
+        """
+        Streams the price accounts of tokens over one websocket into the latest table, which get_pyth_data then reads
+        without a network call. New accounts are first filled with one getMultipleAccounts request per 100 accounts
+        (cold start). The stream reconnects and resubscribes by itself if the connection drops.
+
+        Returns:
+        Dict[str, Optional[dict]]: The latest table after the cold start.
+        """
+        tokens = [token for token in tokens if token.oracle_address and token.symbol not in self._accounts]
+        for _ in range(0, len(tokens), 100):
+            self.scheduler.acquire('pyth', self.priority)
+        self._run(self._subscribe(tokens))
+        return dict(self.latest)
+
+    def unsubscribe(self) -> None:
+        """
+        Stops the stream and forgets every subscription (the websocket is closed).
+        """
+        if self._loop is not None:
+            self._run(self._unsubscribe())
+
+    def _record(self, symbol: str, price: PythPriceAccount, warn: bool = True) -> None:
+        self.latest[symbol] = self._price_data(price, warn)
+        self.updated[symbol] = time.time()
+
+    async def _subscribe(self, tokens: List[Token]) -> None:
+        solana_client = self._client()
+        accounts = {token.symbol: PythPriceAccount(SolanaPublicKey(token.oracle_address), solana_client) for token in tokens}
+        await solana_client.update_accounts(list(accounts.values()))
+        for symbol, price in accounts.items():
+            self._record(symbol, price)
+        self._accounts.update(accounts)
+
+        # The websocket has a single reader, so the stream is paused while subscription replies are awaited
+        await self._stop_stream()
+        for symbol, price in accounts.items():
+            self._subscriptions[await solana_client.ws_account_subscribe(price.key)] = symbol
+        self._stream_task = asyncio.get_running_loop().create_task(self._stream())
+
+    async def _unsubscribe(self) -> None:
+        await self._stop_stream()
+        if self._solana_client is not None:
+            await self._solana_client.ws_disconnect()
+        self._accounts.clear()
+        self._subscriptions.clear()
+
+    async def _stop_stream(self) -> None:
+        task, self._stream_task = self._stream_task, None
+        if task is not None:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def _resubscribe(self) -> None:
+        """
+        Reconnects after a dropped websocket, refreshing every account (to cover updates missed meanwhile) and subscribing again.
+        """
+        solana_client = self._client()
+        await solana_client.ws_disconnect()
+        self._subscriptions.clear()
+        await solana_client.update_accounts(list(self._accounts.values()))
+        for symbol, price in self._accounts.items():
+            self._record(symbol, price, warn=False)
+            self._subscriptions[await solana_client.ws_account_subscribe(price.key)] = symbol
+
+    async def _stream(self) -> None:
+        solana_client = self._client()
+        failures = 0
+        while True:
+            try:
+                message = await solana_client.get_next_update()
+                failures = 0
+            except Exception as e:
+                logging.warning(f"Pyth stream interrupted: {e}")
+                await asyncio.sleep(min(2 ** failures, 30))
+                failures += 1
+                try:
+                    await self._resubscribe()
+                except Exception as e:
+                    logging.error(f"Error resubscribing to Pyth price accounts: {e}")
+                continue
+
+            # A malformed notification is skipped rather than ending the stream
+            try:
+                if message.get("method") != "accountNotification":
+                    continue
+                symbol = self._subscriptions.get(message["params"]["subscription"])
+                if symbol is None:
+                    continue
+                result = message["params"]["result"]
+                price = self._accounts[symbol]
+                price.update_with_rpc_response(result["context"]["slot"], result["value"])
+                self._record(symbol, price, warn=False)
+            except Exception as e:
+                logging.error(f"Error applying Pyth account notification: {e}")
+
+    def get_many_pyth_data(self, tokens: List[Token]) -> Dict[str, Optional[dict]]:
+        """
+        Fetches the oracle price and confidence of many tokens with one getMultipleAccounts request per 100 accounts.
+
+        Returns:
+        Dict[str, Optional[dict]]: {'price', 'confidence'} (or None when not trading) keyed by symbol, for tokens with an oracle address.
+        """
+        tokens = [token for token in tokens if token.oracle_address]
+        for _ in range(0, len(tokens), 100):
+            self.scheduler.acquire('pyth', self.priority)
+        return self._run(self._get_many_data(tokens))
+
+    @staticmethod
+    def _price_data(price: PythPriceAccount, warn: bool = True) -> Optional[dict]:
+        if price.aggregate_price_info is None:
+            if warn:
+                logging.warning(f"No price account data for {price.key}")
+            return None
+        price_status = price.aggregate_price_status
+        if price_status == PythPriceStatus.TRADING:
+            return {'price': price.aggregate_price, 'confidence': price.aggregate_price_confidence_interval}
+        else:
+            if warn:
+                logging.warning(f"Price is not valid now. Status is {price_status}")
+            return None 
 
     async def _get_data(self, token: Token) -> Optional[float]:
         account_key = SolanaPublicKey(token.oracle_address)
-        solana_client = SolanaClient(endpoint=PYTHNET_HTTP_ENDPOINT, ws_endpoint=PYTHNET_WS_ENDPOINT)
-        price: PythPriceAccount = PythPriceAccount(account_key, solana_client)
-        try:
-            await price.update()
-            price_status = price.aggregate_price_status
-            if price_status == PythPriceStatus.TRADING:
-                return {'price': price.aggregate_price, 'confidence': price.aggregate_price_confidence_interval}
-            else:
-                logging.warning(f"Price is not valid now. Status is {price_status}")
-                return None 
-        finally:
-            await solana_client.close()  
+        price: PythPriceAccount = PythPriceAccount(account_key, self._client())
+        await price.update()
+        return self._price_data(price)
+
+    async def _get_many_data(self, tokens: List[Token]) -> Dict[str, Optional[dict]]:
+        solana_client = self._client()
+        prices = {token.symbol: PythPriceAccount(SolanaPublicKey(token.oracle_address), solana_client) for token in tokens}
+        await solana_client.update_accounts(list(prices.values()))
+        return {symbol: self._price_data(price) for symbol, price in prices.items()}
 
@@ -0,0 +1,188 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional, Dict, Tuple, Callable, Any
+import requests
+
+class TokenBucket:
+    """
+    Token bucket allowing 'rate' requests per second on average and bursts of up to 'capacity' requests.
+    Not thread-safe on its own; ProviderLane serialises access.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+    def wait_time(self, now: float) -> float:
+        """
+        Seconds until a request may be sent (0 if one may be sent now).
+        """
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        # No refill while blocked
+        self.tokens = min(self.capacity, self.tokens + (now - max(self.updated, self.blocked_until)) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        self.tokens -= 1
+
+
+class ProviderLane:
+    """
+    The queue of callers waiting on one provider's token bucket. Waiters are served strictly by (priority, arrival),
+    so a high-priority request (e.g. a hedging loop) overtakes a backlog of bulk requests.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        self.bucket = TokenBucket(rate, capacity)
+        self.condition = threading.Condition()
+        self.queue = []
+        self.counter = itertools.count()
+        self.stats = {'requests': 0, 'throttled': 0, 'wait_seconds': 0.0}
+
+    def acquire(self, priority: int) -> None:
+        start = time.monotonic()
+        with self.condition:
+            ticket = (priority, next(self.counter))
+            heapq.heappush(self.queue, ticket)
+            while True:
+                if self.queue[0] == ticket:
+                    wait = self.bucket.wait_time(time.monotonic())
+                    if wait <= 0:
+                        heapq.heappop(self.queue)
+                        self.bucket.take()
+                        self.stats['requests'] += 1
+                        self.stats['wait_seconds'] += time.monotonic() - start
+                        self.condition.notify_all()
+                        return
+                    self.condition.wait(wait)
+                else:
+                    self.condition.wait()
+
+    def block(self, seconds: float) -> None:
+        """
+        Pauses the provider for 'seconds' after a rate-limit response, then lets one request through (the retry) with no burst.
+        """
+        with self.condition:
+            self.bucket.blocked_until = max(self.bucket.blocked_until, time.monotonic() + seconds)
+            self.bucket.tokens = 1.0
+            self.stats['throttled'] += 1
+            self.condition.notify_all()
+
+
+class Scheduler:
+    """
+    Shared request scheduler for the vesta.data clients: one token bucket and priority queue per provider,
+    with 429 / Retry-After feedback. Replaces fixed sleeps between calls, so each provider is used at its allowed rate.
+
+    Priorities are integers, lower first (HIGH for live loops, NORMAL by default, LOW for bulk research sweeps).
+    """
+
+    HIGH = 0
+    NORMAL = 5
+    LOW = 10
+
+    # (requests per second, burst) per provider, at the free / public tiers
+    DEFAULT_LIMITS: Dict[str, Tuple[float, float]] = {
+        'coingecko': (0.5, 3),
+        'jupiter': (1.0, 5),
+        'etherscan': (5.0, 5),
+        'ethplorer': (2.0, 2),
+        'moralis': (10.0, 10),
+        'pyth': (10.0, 10),
+    }
+
+    _shared: Optional['Scheduler'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[float, float]]] = None, max_retries: int = 5, backoff: float = 2.0) -> None:
+        """
+        Parameters:
+        limits (Dict[str, Tuple[float, float]], optional): Overrides of DEFAULT_LIMITS, provider -> (rate per second, burst).
+        max_retries (int): Number of retries after a 429 response.
+        backoff (float): Initial pause in seconds after a 429 without Retry-After, doubled on each retry.
+        """
+        self.limits = {**Scheduler.DEFAULT_LIMITS, **(limits or {})}
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.lanes = {provider: ProviderLane(rate, burst) for provider, (rate, burst) in self.limits.items()}
+
+    @staticmethod
+    def shared() -> 'Scheduler':
+        """
+        Process-wide scheduler, used by clients that are not given one explicitly.
+        """
+        with Scheduler._shared_lock:
+            if Scheduler._shared is None:
+                Scheduler._shared = Scheduler()
+            return Scheduler._shared
+
+    def lane(self, provider: str) -> ProviderLane:
+        if provider not in self.lanes:
+            raise ValueError(f'Unknown provider {provider!r}, expected one of {list(self.lanes)}.')
+        return self.lanes[provider]
+
+    def acquire(self, provider: str, priority: int = NORMAL) -> None:
+        """
+        Blocks until the provider's bucket allows one more request.
+        """
+        self.lane(provider).acquire(priority)
+
+    def call(self, provider: str, function: Callable[..., Any], *args, priority: int = NORMAL, **kwargs) -> Any:
+        """
+        Runs function(*args, **kwargs) once a request slot is available, for SDK clients that do their own HTTP.
+        """
+        self.acquire(provider, priority)
+        return function(*args, **kwargs)
+
+    @staticmethod
+    def _retry_after(response: requests.Response) -> Optional[float]:
+        """
+        Retry-After header in seconds (it may be given as seconds or as an HTTP date).
+        """
+        value = response.headers.get('Retry-After')
+        if value is None:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError):
+                return None
+
+    def get(self, provider: str, url: str, priority: int = NORMAL, session: Optional[requests.Session] = None, **kwargs) -> requests.Response:
+        """
+        Rate-limited GET, sent through session (e.g. a pooled one from Sessions) when given. A 429 pauses the whole
+        provider for Retry-After seconds (or an exponential backoff) and the request is retried up to max_retries times;
+        the last response is returned either way.
+        """
+        lane = self.lane(provider)
+        http = session if session is not None else requests
+        response = None
+        for attempt in range(self.max_retries + 1):
+            lane.acquire(priority)
+            response = http.get(url, **kwargs)
+            if response.status_code != 429:
+                return response
+            pause = self._retry_after(response)
+            pause = self.backoff * 2**attempt if pause is None else pause
+            logging.warning(f'{provider} rate limited, pausing {pause:.1f}s (attempt {attempt + 1}/{self.max_retries + 1})')
+            lane.block(pause)
+        return response
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Requests sent, 429s received and total seconds spent queueing, per provider.
+        """
+        return {provider: dict(lane.stats) for provider, lane in self.lanes.items()}
@@ -0,0 +1,86 @@
+import threading
+from typing import Optional, Dict, Tuple, Union
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter applying a default timeout to requests that do not set one.
+    """
+
+    def __init__(self, *args, timeout: Union[float, Tuple[float, float], None] = None, **kwargs) -> None:
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get('timeout') is None:
+            kwargs['timeout'] = self.timeout
+        return super().send(request, **kwargs)
+
+
+class Sessions:
+    """
+    Pooled keep-alive HTTP sessions for the vesta.data clients, one requests.Session per provider, so that repeated calls
+    to a provider reuse open TCP + TLS connections instead of a new handshake per request.
+
+    Retries only cover connection errors and 5xx responses; 429s are left to Scheduler, which pauses the whole provider.
+    """
+
+    _shared: Optional['Sessions'] = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, pool_size: int = 16, timeout: Union[float, Tuple[float, float]] = (3.05, 30), retries: int = 3, backoff_factor: float = 0.5) -> None:
+        """
+        Parameters:
+        pool_size (int): Maximum open connections kept per host, at least the number of threads calling one provider.
+        timeout (float | Tuple[float, float]): Default (connect, read) timeout in seconds.
+        retries (int): Retries of connection errors and 5xx responses.
+        backoff_factor (float): urllib3 backoff between those retries, in seconds.
+        """
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def shared() -> 'Sessions':
+        """
+        Process-wide sessions, used by clients that are not given one explicitly.
+        """
+        with Sessions._shared_lock:
+            if Sessions._shared is None:
+                Sessions._shared = Sessions()
+            return Sessions._shared
+
+    def _new_session(self) -> requests.Session:
+        retry = Retry(
+            total=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset(['GET', 'POST']),
+            respect_retry_after_header=False,
+            raise_on_status=False,
+        )
+        adapter = TimeoutHTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size, max_retries=retry, timeout=self.timeout)
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def session(self, provider: str) -> requests.Session:
+        """
+        The provider's session, created on first use.
+        """
+        with self._lock:
+            if provider not in self.sessions:
+                self.sessions[provider] = self._new_session()
+            return self.sessions[provider]
+
+    def close(self) -> None:
+        with self._lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions.clear()
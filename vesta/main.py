@@ -1,17 +1,24 @@
+import logging
+import pandas as pd
 from vesta.functions.functions import Functions
 from vesta.data.data import Data
 from vesta.pricing.processes import Processes
 from vesta.pricing.optimisers import Optimisers
 from vesta.pricing.analytical import Analytical
 from vesta.pricing.risk import Risk
+from vesta.pricing.numerical import Numerical
 from web3 import Web3, HTTPProvider, IPCProvider, WebsocketProvider
 from solana.rpc.api import Client as SolClient
-from typing import Union, Type
+from typing import Union, Type, Optional, List
 from vesta.token.token import Token
 from vesta.tokenfactors.tokenfactors import TokenFactors
 from tqdm import tqdm
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
 from etherscan import Etherscan
 from vesta.data.moralis import MoralisClient
+from vesta.data.scheduler import Scheduler
+from vesta.data.sessions import Sessions
+from vesta.data.cache import ResponseCache
 from .rankings import risk_ranking_parameters
 
 class Vesta:
@@ -22,20 +29,26 @@ class Vesta:
     def __init__(self, 
                  web3_provider: Union[str, HTTPProvider, IPCProvider, WebsocketProvider], 
                  etherscan_api_key_token: str,
-                 moralis_api_key: str
+                 moralis_api_key: str,
+                 scheduler: Optional[Scheduler] = None,
+                 sessions: Optional[Sessions] = None,
+                 cache: Optional[ResponseCache] = None
                  ) -> None:
 
         self.etherscan = Etherscan(etherscan_api_key_token)  
         self.web3_client = Web3(web3_provider)
         self.sol_client = SolClient("https://api.devnet.solana.com")
-        self.moralis_client = MoralisClient(moralis_api_key)
+        # One rate limiter for every provider client
+        self.scheduler = scheduler if scheduler is not None else Scheduler.shared()
+        self.moralis_client = MoralisClient(moralis_api_key, self.scheduler, cache=cache)
         self.processes = Processes()
         self.optimisers = Optimisers()
         self.analytical = Analytical()
         self.risk = Risk()
+        self.numerical = Numerical()
 
         # New instances of the 'Functions' and 'Data' classes used in Vesta. 
-        self.data = Data(self.etherscan, self.web3_client, self.sol_client, self.moralis_client)
+        self.data = Data(self.etherscan, self.web3_client, self.sol_client, self.moralis_client, self.scheduler, sessions, cache)
 
         # Little ASCII banner. 
         self.print_ascii()
@@ -56,46 +69,110 @@ class Vesta:
           """
         print(ascii_art)
 
-    def rate(self, token: Token) -> list:
+    # Factors and their weights (gammas)
+    FACTORS = {
+        'calculate_mean_slippage': 0.2, 
+        'calculate_market_cap_rank': 0.08,  
+        'calculate_alexa_rank': 0.05,  
+        'calculate_market_cap': 0.05,  
+        'calculate_fully_diluted_valuation': 0.05,  
+        'calculate_coingecko_rank': 0.03, 
+        'calculate_24h_volume': 0.05,  
+        'calculate_returns_volatility': 0.2, 
+        'calculate_age': 0.08,  
+        'calculate_token_transactions': 0.1,  
+        'calculate_top_holders_HHI': 0.05,  
+        'calculate_token_tickers_length': 0.03,  
+        'calculate_oracle_confidence': 0.05 
+    }
+
+    def rate(self, token: Token, max_workers: int = 16) -> list:
         """
         Given a 'Token' data type, rates the token based on the Vesta model.
         The rating is computed as a weighted sum of normalized factors.
+
+        The provider requests behind TokenFactors and the factors themselves (several of which make their own
+        network calls) are independent, so they are run on a thread pool of max_workers threads and the wall-clock
+        time approaches that of the slowest call. max_workers=1 evaluates everything one after another.
         """
-        # Define factors and their weights (gammas)
-        factors = {
-            'calculate_mean_slippage': 0.2, 
-            'calculate_market_cap_rank': 0.08,  
-            'calculate_alexa_rank': 0.05,  
-            'calculate_market_cap': 0.05,  
-            'calculate_fully_diluted_valuation': 0.05,  
-            'calculate_coingecko_rank': 0.03, 
-            'calculate_24h_volume': 0.05,  
-            'calculate_returns_volatility': 0.2, 
-            'calculate_age': 0.08,  
-            'calculate_token_transactions': 0.1,  
-            'calculate_top_holders_HHI': 0.05,  
-            'calculate_token_tickers_length': 0.03,  
-            'calculate_oracle_confidence': 0.05 
-        }
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return self._rate(token, executor)
+
+    def rate_many(self, tokens: List[Token], max_workers: int = 16, token_workers: int = 4) -> pd.DataFrame:
+        """
+        Rates many tokens at once. Data that providers serve in bulk is fetched once for all tokens up front
+        (CoinGecko prices in one simple/price request, Pyth oracle accounts in one getMultipleAccounts request, contract
+        creations with batched JSON-RPC),
+        then up to token_workers tokens are rated concurrently, sharing one pool of max_workers threads for their
+        provider calls and factors. A token whose rating fails is logged and kept as a row with empty values.
+
+        Parameters:
+        tokens (List[Token]): The tokens to rate.
+        max_workers (int): Threads shared by the provider calls and factors of all tokens.
+        token_workers (int): Number of tokens rated at the same time.
+
+        Returns:
+        pd.DataFrame: One row per token, in input order, with a column per factor and 'symbol', 'total_value' and 'ranking'.
+        """
+        assert round(sum(Vesta.FACTORS.values())) == 1, 'Total Gammas MUST equal one in Vesta Model'
+
+        prices = self.data.coingecko.get_prices(tokens)
+        try:
+            oracle_data = self.data.pythpy.get_many_pyth_data(tokens)
+        except Exception as e:
+            logging.error(f'Error fetching oracle data in bulk: {e}')
+            oracle_data = {}
+        # Contract creations are kept in the cache for good, so calculate_age becomes a local lookup
+        self.data.get_eth_contract_creations([token for token in tokens if token.type == 'eth'])
+
+        def prefetched(token: Token) -> dict:
+            values = {}
+            if token.coingecko_id in prices:
+                values['price'] = prices[token.coingecko_id]
+            # Tokens without an oracle have no oracle confidence factor
+            if not token.oracle_address or token.symbol in oracle_data:
+                values['oracle_data'] = oracle_data.get(token.symbol)
+            return values
+
+        rows = {}
+        # Tokens and their provider calls run on separate pools, so a token never waits on a thread held by another token
+        with ThreadPoolExecutor(max_workers=max_workers) as executor, ThreadPoolExecutor(max_workers=token_workers) as token_executor:
+            futures = {token_executor.submit(self._rate, token, executor, prefetched(token), False): index for index, token in enumerate(tokens)}
+            for future in tqdm(as_completed(futures), total=len(futures), desc="Rating Tokens"):
+                index = futures[future]
+                token = tokens[index]
+                try:
+                    symbol, method_results, ranking, total_value = future.result()
+                    rows[index] = {**method_results, 'symbol': symbol, 'total_value': total_value, 'ranking': ranking}
+                except Exception as e:
+                    logging.error(f'Error rating {token.symbol}: {e}')
+                    rows[index] = {**{method_name: None for method_name in Vesta.FACTORS}, 'symbol': token.symbol, 'total_value': None, 'ranking': None}
+        return pd.DataFrame([rows[index] for index in range(len(tokens))])
+
+    def _rate(self, token: Token, executor: Executor, prefetched: Optional[dict] = None, progress: bool = True) -> list:
+        """
+        Rating of one token with its provider calls and factors submitted to executor. See rate.
+        """
+        factors = Vesta.FACTORS
         
         assert round(sum(factors.values())) == 1, 'Total Gammas MUST equal one in Vesta Model'        
 
-        with tqdm(total=len(factors) + 1, desc="Calculating Factors") as pbar:
+        with tqdm(total=len(factors) + 1, desc="Calculating Factors", disable=not progress) as pbar:
 
             pbar.set_description(f"{token.symbol}: Calculating Total Valid Weight")
 
             # Initialize a variable to keep track of the total valid weight
             total_valid_weight = 0
             method_results = {}
-            token_factors = TokenFactors(self.data, token)
-            for method_name, gamma in factors.items():
-                pbar.set_description(f"{token.symbol}: Calculating {method_name}...")
-                pbar.update(1)
-                method = getattr(token_factors, method_name, None)
-                method_result = method() if method is not None else None
+            token_factors = TokenFactors(self.data, token, executor, prefetched)
+            futures = {executor.submit(self._evaluate_factor, token_factors, method_name): method_name for method_name in factors}
+            for future in as_completed(futures):
+                method_name = futures[future]
+                method_result = future.result()
                 method_results[method_name] = method_result
+                pbar.update(1)
                 if method_result is not None:
-                    total_valid_weight += gamma
+                    total_valid_weight += factors[method_name]
                     pbar.set_description(f"{token.symbol}: Calculated {method_name}: {method_result}")
             assert total_valid_weight > 0, 'No valid factors, cannot calculate rating'
             pbar.set_description(f"{token.symbol}: Valid Weight: {total_valid_weight}")
@@ -110,6 +187,11 @@ class Vesta:
             pbar.set_description(f'{token.symbol} Ranked with {total_value}, {ranking} with Vesta Risk Paramers: ', risk_ranking_parameters[ranking])
         return [token.symbol, method_results, ranking, total_value]
     
+    @staticmethod
+    def _evaluate_factor(token_factors: TokenFactors, method_name: str):
+        method = getattr(token_factors, method_name, None)
+        return method() if method is not None else None
+
     def rate_total_value(self, total_value: float) -> str:
         match total_value:
             case _ if 0.9 <= total_value <= 1:
@@ -2,4 +2,10 @@ from .processes import *
 from .optimisers import *
 from .analytical import *
 from .risk import *
-
+from .accumulators import *
+from .numerical import *
+from .pathset import *
+from .volatility import *
+from .fourier import *
+from .pde import *
+from .surfaces import *
@@ -0,0 +1,167 @@
+from typing import Optional, List, Callable
+from abc import ABC, abstractmethod
+import copy
+import numpy as np
+
+class Accumulator(ABC):
+    """
+    Base class for running statistics fed by Processes.merton_jump_diffusion_stream.
+
+    The simulator walks the (nsteps + 1) x npaths price matrix in path-chunks and, within each path-chunk,
+    in time-chunks. For every path-chunk it calls begin_chunk, then update once per time-chunk with the
+    block of prices for time indices [step_start, step_start + len(block)), then end_chunk.
+
+    Accumulators are also the unit of parallelism: each independent stream of paths is fed to a fresh() copy,
+    and the copies are merged back in stream order. Payoff callables must therefore be picklable
+    (module-level functions or functools.partial) when running with worker processes.
+    """
+
+    def fresh(self) -> 'Accumulator':
+        """
+        An empty accumulator with the same configuration (levels, payoff, ...) and none of the state accumulated so far.
+        """
+        accumulator = copy.deepcopy(self)
+        accumulator.reset()
+        return accumulator
+
+    @abstractmethod
+    def reset(self) -> None:
+        pass
+
+    @abstractmethod
+    def merge(self, other: 'Accumulator') -> None:
+        pass
+
+    def begin_chunk(self, npaths: int) -> None:
+        pass
+
+    @abstractmethod
+    def update(self, block: np.ndarray, step_start: int) -> None:
+        pass
+
+    def end_chunk(self) -> None:
+        pass
+
+    @abstractmethod
+    def result(self):
+        pass
+
+
+class TerminalValues(Accumulator):
+    """
+    Collects the terminal value of every path (the last row of the full path matrix).
+    """
+
+    def __init__(self, nsteps: int) -> None:
+        self.nsteps = nsteps
+        self.reset()
+
+    def reset(self) -> None:
+        self._chunks: List[np.ndarray] = []
+        self._current: Optional[np.ndarray] = None
+
+    def update(self, block: np.ndarray, step_start: int) -> None:
+        if step_start + len(block) == self.nsteps + 1:
+            self._current = block[-1].copy()
+
+    def end_chunk(self) -> None:
+        self._chunks.append(self._current)
+        self._current = None
+
+    def merge(self, other: 'Accumulator') -> None:
+        self._chunks.extend(other._chunks)
+
+    def result(self) -> np.ndarray:
+        return np.concatenate(self._chunks) if self._chunks else np.empty(0)
+
+
+class RunningMinimum(Accumulator):
+    """
+    Tracks the minimum price reached by every path over the whole horizon.
+    """
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self._chunks: List[np.ndarray] = []
+        self._current: Optional[np.ndarray] = None
+
+    def begin_chunk(self, npaths: int) -> None:
+        self._current = np.full(npaths, np.inf)
+
+    def update(self, block: np.ndarray, step_start: int) -> None:
+        np.minimum(self._current, block.min(axis=0), out=self._current)
+
+    def end_chunk(self) -> None:
+        self._chunks.append(self._current)
+        self._current = None
+
+    def merge(self, other: 'Accumulator') -> None:
+        self._chunks.extend(other._chunks)
+
+    def result(self) -> np.ndarray:
+        return np.concatenate(self._chunks) if self._chunks else np.empty(0)
+
+
+class CrossingCounts(Accumulator):
+    """
+    Counts, for each level, the number of paths that touch or fall below it at any time step
+    (first-passage liquidations), together with the number of paths seen.
+    """
+
+    def __init__(self, levels) -> None:
+        self.levels = np.atleast_1d(np.asarray(levels, dtype=float))
+        self.reset()
+
+    def reset(self) -> None:
+        self.counts = np.zeros(len(self.levels), dtype=np.int64)
+        self.npaths = 0
+        self._current: Optional[np.ndarray] = None
+
+    def begin_chunk(self, npaths: int) -> None:
+        self._current = np.full(npaths, np.inf)
+        self.npaths += npaths
+
+    def update(self, block: np.ndarray, step_start: int) -> None:
+        np.minimum(self._current, block.min(axis=0), out=self._current)
+
+    def end_chunk(self) -> None:
+        self.counts += np.count_nonzero(self._current[np.newaxis, :] <= self.levels[:, np.newaxis], axis=1)
+        self._current = None
+
+    def merge(self, other: 'Accumulator') -> None:
+        self.counts += other.counts
+        self.npaths += other.npaths
+
+    def result(self) -> np.ndarray:
+        return self.counts
+
+
+class StepPayoffMeans(Accumulator):
+    """
+    Mean of a vectorised payoff over all paths at every time step, e.g.
+    StepPayoffMeans(nsteps, lambda prices: np.where(prices < liq_price, shortfall_value, 0)).
+    """
+
+    def __init__(self, nsteps: int, payoff: Callable[[np.ndarray], np.ndarray]) -> None:
+        self.payoff = payoff
+        self.nsteps = nsteps
+        self.reset()
+
+    def reset(self) -> None:
+        self.sums = np.zeros(self.nsteps + 1)
+        self.npaths = 0
+
+    def begin_chunk(self, npaths: int) -> None:
+        self.npaths += npaths
+
+    def update(self, block: np.ndarray, step_start: int) -> None:
+        self.sums[step_start:step_start + len(block)] += self.payoff(block).sum(axis=1)
+
+    def merge(self, other: 'Accumulator') -> None:
+        self.sums += other.sums
+        self.npaths += other.npaths
+
+    def result(self) -> np.ndarray:
+        return self.sums / self.npaths if self.npaths else self.sums
@@ -1,9 +1,9 @@
-from typing import Optional, List
+from typing import Optional, List, Dict
 import numpy as np
 import pandas as pd
 import logging
 from scipy.stats import norm
-from typing import Optional, List
+from scipy.special import ndtr
 import numpy as np
 import pandas as pd
 import logging
@@ -99,7 +99,7 @@ class Analytical:
 
         if d1 is not None and d2 is not None:
             numerator1 = np.exp(-r * remaining_time) * norm.pdf(d2)
-            numerator2 = - 2 * d1 + (1 - d1 * d2) / (sigma * remaining_time)
+            numerator2 = - 2 * d1 + (1 - d1 * d2) / (sigma * np.sqrt(remaining_time))
             denom1 = (sigma ** 2) * (S **3) * remaining_time
             return (numerator1 * numerator2) / denom1
         else:
@@ -162,7 +162,8 @@ class Analytical:
         remaining_time = T - t
         d1 = Analytical._d1(S, K, T, t, r, sigma)
         if d1 is not None:
-            return -norm.pdf(d1) / (S**2 * sigma * np.sqrt(remaining_time)) * (d1 / (S * sigma * np.sqrt(remaining_time)) + 1)
+            # dGamma/dS = -Gamma / S * (d1 / (sigma * sqrt(tau)) + 1)
+            return -norm.pdf(d1) / (S**2 * sigma * np.sqrt(remaining_time)) * (d1 / (sigma * np.sqrt(remaining_time)) + 1)
         else:
             return 0
 
@@ -174,3 +175,103 @@ class Analytical:
             return S * np.sqrt(remaining_time) * norm.pdf(d1)
         else:
             return 0
+
+    @staticmethod
+    def _batch_terms(S, K, T, t, r, sigma):
+        """
+        Shared intermediates for the batched greeks. All inputs are broadcast against each other.
+        Points at or past expiry are flagged in 'live' and given a dummy remaining time of 1 so the
+        vectorised maths stays finite; callers mask them out afterwards.
+        """
+        S, K, T, t, r, sigma = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (S, K, T, t, r, sigma)))
+        remaining_time = T - t
+        live = remaining_time > 0
+        tau = np.where(live, remaining_time, 1.0)
+        sqrt_tau = np.sqrt(tau)
+        sig_sqrt_tau = sigma * sqrt_tau
+        with np.errstate(divide='ignore', invalid='ignore'):
+            d1 = (np.log(S / K) + (r + 0.5 * sigma**2) * tau) / sig_sqrt_tau
+        d2 = d1 - sig_sqrt_tau
+        return {
+            'S': S, 'K': K, 'r': r, 'sigma': sigma,
+            'live': live, 'tau': tau, 'sqrt_tau': sqrt_tau, 'sig_sqrt_tau': sig_sqrt_tau,
+            'd1': d1, 'd2': d2,
+            'pdf_d1': np.exp(-0.5 * d1**2) / np.sqrt(2 * np.pi),
+            'pdf_d2': np.exp(-0.5 * d2**2) / np.sqrt(2 * np.pi),
+            'discount': np.exp(-r * tau),
+        }
+
+    @staticmethod
+    def binary_put_greeks(S, K, T, t, r, sigma, payoff=1) -> Dict[str, np.ndarray]:
+        """
+        Batched binary put price and greeks in a single pass over shared d1/d2/pdf/cdf terms.
+        S, K, T, t, r, sigma and payoff may be scalars or broadcastable numpy arrays.
+
+        Matches the scalar binary_put_* methods element-wise (greeks scaled by payoff). At or past
+        expiry the price is the intrinsic value and the greeks are 0.
+
+        Returns:
+        Dict[str, np.ndarray]: 'price', 'delta', 'gamma', 'theta', 'speed' and 'vega' arrays of the broadcast shape.
+        """
+        x = Analytical._batch_terms(S, K, T, t, r, sigma)
+        S, K, r, sigma, live, tau = x['S'], x['K'], x['r'], x['sigma'], x['live'], x['tau']
+        d1, d2, pdf_d2, discount = x['d1'], x['d2'], x['pdf_d2'], x['discount']
+        payoff = np.asarray(payoff, dtype=float)
+
+        cdf_minus_d2 = ndtr(-d2)
+        disc_pdf_d2 = discount * pdf_d2
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            price = discount * cdf_minus_d2
+            delta = -disc_pdf_d2 / (sigma * S * x['sqrt_tau'])
+            gamma = -disc_pdf_d2 * (d1 / (S**2 * sigma**2 * tau))
+            theta = r * discount * cdf_minus_d2 + (-disc_pdf_d2 * (d1 / (2 * tau))) * (-(r + (sigma**2 / 2)) / sigma)
+            speed = (disc_pdf_d2 * (-2 * d1 + (1 - d1 * d2) / x['sig_sqrt_tau'])) / ((sigma ** 2) * (S ** 3) * tau)
+            vega = disc_pdf_d2 * (x['sqrt_tau'] + (d2 / sigma))
+
+        intrinsic = (S < K).astype(float)
+        return {
+            'price': payoff * np.where(live, price, intrinsic),
+            'delta': payoff * np.where(live, delta, 0.0),
+            'gamma': payoff * np.where(live, gamma, 0.0),
+            'theta': payoff * np.where(live, theta, 0.0),
+            'speed': payoff * np.where(live, speed, 0.0),
+            'vega': payoff * np.where(live, vega, 0.0),
+        }
+
+    @staticmethod
+    def vanilla_put_greeks(S, K, T, t, r, sigma) -> Dict[str, np.ndarray]:
+        """
+        Batched vanilla put price and greeks in a single pass over shared d1/d2/pdf/cdf terms.
+        S, K, T, t, r and sigma may be scalars or broadcastable numpy arrays.
+
+        Matches the scalar vanilla_put_* methods element-wise before expiry. At or past expiry the
+        price is the intrinsic value max(K - S, 0) and the greeks are 0.
+
+        Returns:
+        Dict[str, np.ndarray]: 'price', 'delta', 'gamma', 'theta', 'speed' and 'vega' arrays of the broadcast shape.
+        """
+        x = Analytical._batch_terms(S, K, T, t, r, sigma)
+        S, K, r, sigma, live = x['S'], x['K'], x['r'], x['sigma'], x['live']
+        d1, d2, pdf_d1, discount = x['d1'], x['d2'], x['pdf_d1'], x['discount']
+        sqrt_tau, sig_sqrt_tau = x['sqrt_tau'], x['sig_sqrt_tau']
+
+        cdf_minus_d2 = ndtr(-d2)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            price = K * discount * cdf_minus_d2 - S * ndtr(-d1)
+            delta = ndtr(d1) - 1
+            gamma = pdf_d1 / (S * sig_sqrt_tau)
+            theta = -(S * sigma * pdf_d1 / (2 * sqrt_tau)) - r * K * discount * cdf_minus_d2
+            # dGamma/dS = -Gamma / S * (d1 / (sigma * sqrt(tau)) + 1)
+            speed = -pdf_d1 / (S**2 * sig_sqrt_tau) * (d1 / sig_sqrt_tau + 1)
+            vega = S * sqrt_tau * pdf_d1
+
+        return {
+            'price': np.where(live, price, np.maximum(K - S, 0.0)),
+            'delta': np.where(live, delta, 0.0),
+            'gamma': np.where(live, gamma, 0.0),
+            'theta': np.where(live, theta, 0.0),
+            'speed': np.where(live, speed, 0.0),
+            'vega': np.where(live, vega, 0.0),
+        }
@@ -0,0 +1,388 @@
+from typing import Optional, List, Dict, Union, Any, Sequence
+import numpy as np
+import pandas as pd
+import logging
+import time
+from scipy.stats import poisson
+from scipy.special import ndtr
+from vesta.pricing.analytical import Analytical
+from vesta.pricing.processes import Processes, RandomSource
+from vesta.pricing.pathset import PathSet
+
+class Numerical:
+    """
+    A class representing static methods for Monte Carlo pricing of liquidation claims on simulated collateral paths.
+    """
+
+    @staticmethod
+    def liquidation_thresholds(price: float, settings: pd.DataFrame, init_liab_weight: float = 1, maint_liab_weight: float = 1) -> np.ndarray:
+        """
+        Collateral price below which each setting is liquidated.
+
+        The weighted collateral maint * (deposit_limit / price) * S / (1 - init) falls below the weighted borrow
+        deposit_limit * init / (1 - init) / init_liab_weight * maint_liab_weight exactly when S is below
+        price * init * maint_liab_weight / (maint * init_liab_weight), which does not depend on the deposit limit.
+        """
+        init_weight = settings['init_asset_weight'].to_numpy(dtype=float)
+        maint_weight = settings['maint_asset_weight'].to_numpy(dtype=float)
+        return price * init_weight * maint_liab_weight / (maint_weight * init_liab_weight)
+
+    @staticmethod
+    def _batch_counts(mask: np.ndarray, batch_size: Optional[int]) -> np.ndarray:
+        """
+        Number of True entries per time step, per contiguous batch of batch_size paths (one batch if None).
+        """
+        if batch_size is None:
+            return np.count_nonzero(mask, axis=1)[:, np.newaxis]
+        if mask.shape[1] % batch_size:
+            raise ValueError(f'npaths ({mask.shape[1]}) must be a multiple of batch_size ({batch_size}).')
+        return np.count_nonzero(mask.reshape(mask.shape[0], -1, batch_size), axis=2)
+
+    @staticmethod
+    def _batch_estimate(batch_means: np.ndarray, iid_variance: np.ndarray, npaths: int):
+        """
+        Mean over equally sized batches and its standard error: batch means when there are several batches,
+        otherwise the i.i.d. formula sqrt(variance / npaths).
+        """
+        estimate = batch_means.mean(axis=-1)
+        nbatches = batch_means.shape[-1]
+        if nbatches > 1:
+            se = batch_means.std(axis=-1, ddof=1) / np.sqrt(nbatches)
+        else:
+            se = np.sqrt(np.maximum(iid_variance, 0) / npaths)
+        return estimate, se
+
+    @staticmethod
+    def liquidation_probabilities(paths: Union[PathSet, np.ndarray, pd.DataFrame], thresholds: np.ndarray, batch_size: Optional[int] = None, control_paths: Optional[Union[PathSet, np.ndarray, pd.DataFrame]] = None, control_probabilities: Optional[np.ndarray] = None) -> Dict[str, np.ndarray]:
+        """
+        Probability of the price being below each threshold at every time step, with its standard error, optionally
+        improved by a control variate.
+
+        Parameters:
+        paths (PathSet | np.ndarray | pd.DataFrame): (nsteps + 1) x npaths simulated prices.
+        thresholds (np.ndarray): Price levels.
+        batch_size (int, optional): Estimate standard errors from means over contiguous batches of this many paths. Required
+            for correct errors with antithetic or Sobol paths (use the simulator's paths_per_stream); None assumes i.i.d. paths.
+        control_paths (PathSet | np.ndarray | pd.DataFrame, optional): Paths correlated with 'paths' whose threshold probabilities are known.
+        control_probabilities (np.ndarray, optional): (nsteps + 1) x len(thresholds) exact probabilities for control_paths.
+
+        Returns:
+        Dict[str, np.ndarray]: (nsteps + 1) x len(thresholds) arrays 'prob' and 'se', plus 'beta' (the control coefficient) when a control is given.
+        """
+        paths, scale = PathSet.unscaled(paths)
+        npaths = paths.shape[1]
+        nbatch = npaths if batch_size is None else batch_size
+        controlled = control_paths is not None
+        if controlled:
+            control_paths, control_scale = PathSet.unscaled(control_paths)
+
+        unique, first, inverse = np.unique(thresholds, return_index=True, return_inverse=True)
+        prob = np.empty((paths.shape[0], len(unique)))
+        se = np.empty_like(prob)
+        beta = np.zeros_like(prob)
+        for j, level in enumerate(unique):
+            below = paths < level / scale
+            p_batches = Numerical._batch_counts(below, batch_size) / nbatch
+            p = p_batches.mean(axis=1)
+            variance = p * (1 - p)
+            if controlled:
+                control_below = control_paths < level / control_scale
+                c_batches = Numerical._batch_counts(control_below, batch_size) / nbatch
+                c = c_batches.mean(axis=1)
+                c_exact = control_probabilities[:, first[j]]
+                covariance = np.count_nonzero(below & control_below, axis=1) / npaths - p * c
+                control_variance = c * (1 - c)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    b = np.where(control_variance > 0, covariance / control_variance, 0.0)
+                p_batches = p_batches - b[:, np.newaxis] * (c_batches - c_exact[:, np.newaxis])
+                variance = variance - b * covariance
+                beta[:, j] = b
+            prob[:, j], se[:, j] = Numerical._batch_estimate(p_batches, variance, npaths)
+
+        out = {'prob': prob[:, inverse], 'se': se[:, inverse]}
+        if controlled:
+            out['beta'] = beta[:, inverse]
+        return out
+
+    @staticmethod
+    def gbm_below_probabilities(price: float, thresholds: np.ndarray, T: float, nsteps: int, muS: float, sigmaS: float) -> np.ndarray:
+        """
+        Exact probability of a GBM with drift muS and volatility sigmaS (the jump-free limit of the Merton process) being
+        below each threshold at every step of the path grid: the undiscounted Analytical.binary_put_price with r = muS.
+
+        Returns:
+        np.ndarray: (nsteps + 1) x len(thresholds) probabilities.
+        """
+        times = T * np.arange(nsteps + 1) / nsteps
+        greeks = Analytical.binary_put_greeks(price, np.asarray(thresholds, dtype=float)[np.newaxis, :], times[:, np.newaxis], 0, muS, sigmaS, 1)
+        return greeks['price'] * np.exp(muS * times)[:, np.newaxis]
+
+    @staticmethod
+    def liquidation_put_values(paths: Union[PathSet, np.ndarray, pd.DataFrame], price: float, settings: pd.DataFrame, T: float = 1, risk_free_rate: float = 0.05, perturbation: float = 0.01, init_liab_weight: float = 1, maint_liab_weight: float = 1, period_years: float = 31 / 365, batch_size: Optional[int] = None, control_paths: Optional[Union[PathSet, np.ndarray, pd.DataFrame]] = None, muS: Optional[float] = None, sigmaS: Optional[float] = None) -> Dict[str, np.ndarray]:
+        """
+        Discounted Monte Carlo value and bump delta of the insurance-fund liquidation put, for every time step and every setting at once.
+
+        A setting is liquidated on a path whenever its weighted collateral is below its weighted borrow, paying out the
+        slippage shortfall borrowed_value * maint_liab_weight * slippage / 100. As the condition only depends on the price
+        against a threshold (see liquidation_thresholds), the liquidation frequencies are computed once per distinct
+        threshold and then scaled by each setting's shortfall. Delta is the central difference from bumping the collateral
+        value by +/- perturbation, i.e. moving the threshold to threshold / (1 +/- perturbation).
+
+        Parameters:
+        paths (PathSet | np.ndarray | pd.DataFrame): (nsteps + 1) x npaths simulated collateral prices, e.g. from merton_jump_diffusion_paths.
+        price (float): Current collateral price (first row of the paths).
+        settings (pd.DataFrame): Settings with 'init_asset_weight', 'maint_asset_weight', 'deposit_limit' and 'slippage' columns (see Risk.build_settings_grid).
+        T (float): Horizon of the paths in months.
+        risk_free_rate (float): Annual risk free rate.
+        perturbation (float): Relative bump for the delta.
+        period_years (float): Length in years of one unit of T.
+        batch_size (int, optional): Batch size for batch-means standard errors (see liquidation_probabilities).
+        control_paths (PathSet | np.ndarray | pd.DataFrame, optional): Jump-free GBM paths from merton_jump_diffusion_paths(control=True),
+            used as a control variate for the value with muS and sigmaS, priced in closed form by gbm_below_probabilities.
+
+        Returns:
+        Dict[str, np.ndarray]: (nsteps + 1) x len(settings) arrays 'value', 'delta' and 'prob_liq' (liquidation frequency per step),
+        with standard errors 'value_se', 'delta_se' and 'prob_liq_se'.
+        """
+        values, scale = PathSet.unscaled(paths)
+        nsteps, npaths = values.shape[0] - 1, values.shape[1]
+        nbatch = npaths if batch_size is None else batch_size
+
+        init_weight = settings['init_asset_weight'].to_numpy(dtype=float)
+        deposit_limit = settings['deposit_limit'].to_numpy(dtype=float)
+        slippage = settings['slippage'].to_numpy(dtype=float)
+
+        # Insurance fund exposure
+        borrowed_value = (deposit_limit * init_weight / (1 - init_weight)) / init_liab_weight
+        shortfall_value = borrowed_value * maint_liab_weight * (slippage / 100)
+
+        thresholds = Numerical.liquidation_thresholds(price, settings, init_liab_weight, maint_liab_weight)
+        control_probabilities = None
+        if control_paths is not None:
+            control_probabilities = Numerical.gbm_below_probabilities(price, thresholds, T, nsteps, muS, sigmaS)
+        liquidation = Numerical.liquidation_probabilities(paths, thresholds, batch_size, control_paths, control_probabilities)
+        prob_liq, prob_liq_se = liquidation['prob'], liquidation['se']
+
+        # The bumped payoffs differ on the paths between the two bumped thresholds, so the delta and its error come from one indicator.
+        bumped = np.empty((nsteps + 1, len(thresholds)))
+        bumped_se = np.empty_like(bumped)
+        for j, level in enumerate(thresholds):
+            between = (values < level / scale / (1 - perturbation)) & (values >= level / scale / (1 + perturbation))
+            q_batches = Numerical._batch_counts(between, batch_size) / nbatch
+            q = q_batches.mean(axis=1)
+            bumped[:, j], bumped_se[:, j] = Numerical._batch_estimate(q_batches, q * (1 - q), npaths)
+
+        time_to_expiry = T * (nsteps - np.arange(nsteps + 1)) / nsteps
+        discount = np.exp(-risk_free_rate * period_years * time_to_expiry)[:, np.newaxis]
+        delta_scale = discount * shortfall_value / (price * 2 * perturbation)
+
+        return {
+            'value': discount * prob_liq * shortfall_value,
+            'delta': -delta_scale * bumped,
+            'prob_liq': prob_liq,
+            'value_se': discount * prob_liq_se * shortfall_value,
+            'delta_se': delta_scale * bumped_se,
+            'prob_liq_se': prob_liq_se,
+        }
+
+    @staticmethod
+    def adaptive_liquidation_put_values(muS: float, sigmaS: float, muJ: float, sigmaJ: float, lambdaJ: float, T: float, nsteps: int, price: float, settings: pd.DataFrame, tolerance: float = 0.01, relative: bool = True, statistics: Sequence[str] = ('value', 'delta', 'prob_liq'), step: int = -1, min_batches: int = 2, min_events: int = 20, time_budget: Optional[float] = None, batch_paths: int = 8192, max_paths: int = 10_000_000, rng: RandomSource = None, antithetic: bool = False, sobol: bool = False, control: bool = False, **kwargs) -> Dict[str, Any]:
+        """
+        Adaptive Monte Carlo for liquidation_put_values: simulates Merton paths in batches of batch_paths until the standard
+        error of every requested statistic is within tolerance, the time budget is spent or max_paths is reached.
+
+        Batches are independent (each draws from its own spawned stream), so the running estimate is the mean of the batch
+        estimates and its standard error is the root sum of the batch errors over the number of batches. With antithetic or
+        Sobol paths each batch is split into 8 streams (Sobol streams rounded up to a power of two, so fewer) and its error
+        comes from batch means over them; batch_paths must then split into equal streams.
+
+        Rare liquidations can leave a batch with no events at all, i.e. an estimate and standard error of exactly 0. So
+        convergence is only tested after min_batches batches; with relative=True every setting also needs min_events
+        simulated liquidations, and the liquidation probability error is floored by its Agresti-Coull value.
+
+        Parameters:
+        tolerance (float): Target standard error, relative to |estimate| when relative=True, otherwise absolute.
+        statistics (Sequence[str]): Which of 'value', 'delta' and 'prob_liq' must converge.
+        step (int): Time step at which convergence is checked (default the last, the expiry).
+        min_batches (int): Number of batches before convergence is tested.
+        min_events (int): Liquidations per setting required before a relative tolerance can be met.
+        time_budget (float, optional): Wall-clock seconds after which to stop regardless of convergence.
+        batch_paths (int): Paths simulated per batch.
+        max_paths (int): Hard cap on the total number of paths.
+        rng, antithetic, sobol, control: As in Processes.merton_jump_diffusion_paths.
+        kwargs: Passed on to liquidation_put_values (risk_free_rate, perturbation, weights, ...).
+
+        Returns:
+        Dict[str, Any]: liquidation_put_values output (estimates and '_se' arrays), plus 'npaths', 'converged' and 'elapsed' (seconds).
+        """
+        if batch_paths > max_paths:
+            raise ValueError(f'batch_paths ({batch_paths}) must not exceed max_paths ({max_paths}).')
+        started = time.perf_counter()
+        if not isinstance(rng, (np.random.Generator, np.random.SeedSequence)):
+            rng = np.random.SeedSequence(rng)
+        paths_per_stream = batch_paths // 8 if (antithetic or sobol) else None
+        batch_size = None
+        if paths_per_stream is not None:
+            # Batch means must follow the streams actually simulated (Sobol streams are rounded up to a power of two)
+            sizes = Processes._stream_sizes(batch_paths, paths_per_stream, sobol)
+            if len(set(sizes)) > 1:
+                raise ValueError(f'batch_paths ({batch_paths}) does not split into equal streams of {sizes[0]} paths; use a multiple of {sizes[0]}.')
+            batch_size = sizes[0]
+
+        sums: Dict[str, np.ndarray] = {}
+        npaths, nbatches, converged = 0, 0, False
+        while npaths + batch_paths <= max_paths:
+            stream = Processes._spawn_streams(rng, 1)[0]
+            simulated = Processes.merton_jump_diffusion_paths(muS, sigmaS, muJ, sigmaJ, lambdaJ, batch_paths, T, nsteps, price, rng=stream, paths_per_stream=paths_per_stream, antithetic=antithetic, sobol=sobol, control=control)
+            if simulated is None:
+                raise ValueError('Merton path simulation failed.')
+            paths, control_paths = simulated if control else (simulated, None)
+            batch = Numerical.liquidation_put_values(paths, price, settings, T=T, batch_size=batch_size, control_paths=control_paths, muS=muS, sigmaS=sigmaS, **kwargs)
+
+            for name, values in batch.items():
+                contribution = values**2 if name.endswith('_se') else values
+                sums[name] = sums[name] + contribution if name in sums else contribution
+            npaths += batch_paths
+            nbatches += 1
+
+            se = {name: np.sqrt(sums[f'{name}_se'][step]) / nbatches for name in statistics}
+            estimate = {name: sums[name][step] / nbatches for name in statistics}
+            events = sums['prob_liq'][step] / nbatches * npaths
+            if 'prob_liq' in statistics:
+                # Agresti-Coull error, which stays positive when no path has been liquidated yet
+                adjusted = (events + 2) / (npaths + 4)
+                se['prob_liq'] = np.maximum(se['prob_liq'], np.sqrt(adjusted * (1 - adjusted) / (npaths + 4)))
+            if nbatches < min_batches:
+                converged = False
+            elif relative:
+                converged = np.all(events >= min_events) and all(np.all(se[name] <= tolerance * np.abs(estimate[name])) for name in statistics)
+            else:
+                converged = all(np.all(se[name] <= tolerance) for name in statistics)
+            if converged or (time_budget is not None and time.perf_counter() - started >= time_budget):
+                break
+
+        if not converged:
+            logging.warning(f"Monte Carlo did not reach tolerance {tolerance} after {npaths} paths.")
+        out = {name: (np.sqrt(total) if name.endswith('_se') else total) / max(nbatches, 1) for name, total in sums.items()}
+        out.update({'npaths': npaths, 'converged': converged, 'elapsed': time.perf_counter() - started})
+        return out
+
+    @staticmethod
+    def merton_score_weights(x: np.ndarray, t: float, S0: float, muS: float, sigmaS: float, muJ: float, sigmaJ: float, lambdaJ: float) -> Dict[str, np.ndarray]:
+        """
+        Likelihood-ratio weights for payoffs of S_t = S0 * exp(x) under the Merton process, from the exact marginal density
+        of the log-return x: a Poisson mixture of normals, truncated once the remaining jump-count mass is below 1e-12.
+
+        E[f(S_t) * w] is the derivative of E[f(S_t)] with respect to S0 ('delta', 'gamma' for the second derivative)
+        or sigmaS ('vega'), for any payoff f, without differentiating f.
+        """
+        x = np.asarray(x, dtype=float)
+        nmax = int(poisson.ppf(1 - 1e-12, lambdaJ * t)) if lambdaJ * t > 0 else 0
+        n = np.arange(nmax + 1)
+        weights = poisson.pmf(n, lambdaJ * t)
+        m = (muS - 0.5 * sigmaS**2) * t + muJ * n
+        s = np.sqrt(sigmaS**2 * t + sigmaJ**2 * n)
+
+        z = (x[..., np.newaxis] - m) / s
+        pn = weights * np.exp(-0.5 * z**2) / (np.sqrt(2 * np.pi) * s)
+        p = pn.sum(axis=-1)
+        px = (pn * (-z / s)).sum(axis=-1)
+        pxx = (pn * (z**2 - 1) / s**2).sum(axis=-1)
+        psigma = (pn * (-z / s * sigmaS * t + (z**2 - 1) / s**2 * sigmaS * t)).sum(axis=-1)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return {
+                'delta': np.nan_to_num(-px / (S0 * p)),
+                'gamma': np.nan_to_num((pxx + px) / (S0**2 * p)),
+                'vega': np.nan_to_num(psigma / p),
+            }
+
+    @staticmethod
+    def put_greeks(paths: Union[PathSet, np.ndarray, pd.DataFrame], price: float, strikes: np.ndarray, T: float, muS: float, sigmaS: float, muJ: float, sigmaJ: float, lambdaJ: float, payoff: str = 'binary', method: str = 'lr', bandwidth: float = 0.01, batch_size: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Undiscounted Monte Carlo price, delta, gamma and vega of puts on S_k at every time step k, all from one set of paths.
+
+        The derivatives are taken with respect to the starting price (delta, gamma) and sigmaS (vega) without re-simulating
+        or bumping:
+        - payoff='vanilla' (K - S)+: pathwise delta -1{S < K} S / S0; gamma and vega by likelihood ratio (merton_score_weights).
+        - payoff='binary' 1{S < K}, method='lr': likelihood-ratio delta, gamma and vega.
+        - payoff='binary', method='smoothed': the digital is replaced by N((K - S) / (bandwidth * K)) and differentiated
+          pathwise for price, delta and gamma (biased by O(bandwidth^2), much lower variance); vega by likelihood ratio.
+
+        Parameters:
+        paths (PathSet | np.ndarray | pd.DataFrame): (nsteps + 1) x npaths Merton paths simulated with the given parameters and horizon T.
+        strikes (np.ndarray): Put strikes (liquidation prices).
+        batch_size (int, optional): As in liquidation_probabilities.
+
+        Returns:
+        Dict[str, np.ndarray]: (nsteps + 1) x len(strikes) arrays 'price', 'delta', 'gamma', 'vega' and their '_se' errors.
+        """
+        paths, scale = PathSet.unscaled(paths)
+        nsteps, npaths = paths.shape[0] - 1, paths.shape[1]
+        batches = 1 if batch_size is None else npaths // batch_size
+        if batch_size is not None and npaths % batch_size:
+            raise ValueError(f'npaths ({npaths}) must be a multiple of batch_size ({batch_size}).')
+        strikes = np.atleast_1d(np.asarray(strikes, dtype=float))
+        names = ['price', 'delta', 'gamma', 'vega']
+        out = {name: np.zeros((nsteps + 1, len(strikes))) for name in names}
+        out.update({f'{name}_se': np.zeros((nsteps + 1, len(strikes))) for name in names})
+
+        # At t = 0 the payoff is known and its sensitivities are those of the intrinsic value.
+        if payoff == 'vanilla':
+            out['price'][0] = np.maximum(strikes - price, 0)
+            out['delta'][0] = np.where(price < strikes, -1.0, 0.0)
+        else:
+            out['price'][0] = price < strikes
+
+        for k in range(1, nsteps + 1):
+            S = paths[k].astype(float) * scale
+            relative = S / price
+            w = Numerical.merton_score_weights(np.log(relative), T * k / nsteps, price, muS, sigmaS, muJ, sigmaJ, lambdaJ)
+            for j, K in enumerate(strikes):
+                below = S < K
+                if payoff == 'vanilla':
+                    f = np.where(below, K - S, 0.0)
+                    samples = {'price': f, 'delta': np.where(below, -relative, 0.0), 'gamma': f * w['gamma'], 'vega': f * w['vega']}
+                elif method == 'smoothed':
+                    h = bandwidth * K
+                    u = (K - S) / h
+                    pdf_u = np.exp(-0.5 * u**2) / np.sqrt(2 * np.pi)
+                    f = ndtr(u)
+                    samples = {'price': f, 'delta': -pdf_u / h * relative, 'gamma': -u * pdf_u * relative**2 / h**2, 'vega': f * w['vega']}
+                else:
+                    f = below.astype(float)
+                    samples = {'price': f, 'delta': f * w['delta'], 'gamma': f * w['gamma'], 'vega': f * w['vega']}
+
+                for name, values in samples.items():
+                    batch_means = values.reshape(batches, -1).mean(axis=1)
+                    out[name][k, j], out[f'{name}_se'][k, j] = Numerical._batch_estimate(batch_means, values.var(), npaths)
+        return out
+
+    @staticmethod
+    def liquidation_put_greeks(paths: Union[PathSet, np.ndarray, pd.DataFrame], price: float, settings: pd.DataFrame, muS: float, sigmaS: float, muJ: float, sigmaJ: float, lambdaJ: float, T: float = 1, risk_free_rate: float = 0.05, init_liab_weight: float = 1, maint_liab_weight: float = 1, period_years: float = 31 / 365, method: str = 'lr', bandwidth: float = 0.01, batch_size: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """
+        Value, delta, gamma and vega of the insurance-fund liquidation put for every time step and setting, from the same
+        paths as the price: the binary put_greeks on each distinct liquidation threshold, discounted as in liquidation_put_values
+        and scaled by each setting's shortfall. Replaces the +/- perturbation bump delta.
+
+        Returns:
+        Dict[str, np.ndarray]: (nsteps + 1) x len(settings) arrays 'value', 'delta', 'gamma', 'vega' and their '_se' errors.
+        """
+        nsteps = PathSet.unscaled(paths)[0].shape[0] - 1
+
+        init_weight = settings['init_asset_weight'].to_numpy(dtype=float)
+        deposit_limit = settings['deposit_limit'].to_numpy(dtype=float)
+        slippage = settings['slippage'].to_numpy(dtype=float)
+        borrowed_value = (deposit_limit * init_weight / (1 - init_weight)) / init_liab_weight
+        shortfall_value = borrowed_value * maint_liab_weight * (slippage / 100)
+
+        thresholds = Numerical.liquidation_thresholds(price, settings, init_liab_weight, maint_liab_weight)
+        unique, inverse = np.unique(thresholds, return_inverse=True)
+        greeks = Numerical.put_greeks(paths, price, unique, T, muS, sigmaS, muJ, sigmaJ, lambdaJ, 'binary', method, bandwidth, batch_size)
+
+        time_to_expiry = T * (nsteps - np.arange(nsteps + 1)) / nsteps
+        discounted_shortfall = np.exp(-risk_free_rate * period_years * time_to_expiry)[:, np.newaxis] * shortfall_value
+        out = {}
+        for name, values in greeks.items():
+            out[name.replace('price', 'value')] = discounted_shortfall * values[:, inverse]
+        return out
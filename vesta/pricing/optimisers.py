@@ -1,7 +1,10 @@
-from typing import Optional, List, Callable
+from typing import Optional, List, Callable, Dict, Union
 import numpy as np
 import pandas as pd
 import logging
+from scipy.optimize import minimize
+from scipy.special import gammaln, logsumexp
+from scipy.stats import poisson
 
 class Optimisers:
     """
@@ -28,10 +31,108 @@ class Optimisers:
         """
         try:
             path_df = model(*params, npaths, T, nsteps, S0)
-            path_vals = path_df.iloc[:, 0].values
+            path_vals = np.asarray(path_df)[:, 0]
             out = np.sum((obs - path_vals) ** 2)
             return out
         except Exception as e:
             logging.error(f"Error in least_squares_obj: {e}")
             # Optionally, you can re-raise the exception if you want it to propagate
-            raise
\ No newline at end of file
+            raise
+
+    @staticmethod
+    def merton_negative_log_likelihood(params: List[float], returns: np.ndarray, dt: np.ndarray, nmax: int) -> tuple:
+        """
+        Negative log-likelihood of log-returns under the Merton jump diffusion, with its analytic gradient.
+
+        Each return x over a period dt has the Poisson mixture density sum_n w_n(lambdaJ * dt) N(x; m_n, s_n^2), with
+        m_n = (muS - sigmaS^2 / 2) * dt + muJ * n and s_n^2 = sigmaS^2 * dt + sigmaJ^2 * n, truncated at nmax jumps.
+        Evaluated for all returns at once; the gradient uses the posterior jump-count responsibilities.
+
+        Parameters:
+        params (List[float]): [muS, sigmaS, muJ, sigmaJ, lambdaJ], in the same time unit as dt.
+        returns (np.ndarray): Log-returns.
+        dt (np.ndarray): Length of each return period (scalar or one per return).
+        nmax (int): Largest number of jumps per period in the mixture.
+
+        Returns:
+        (float, np.ndarray): The negative log-likelihood and its gradient with respect to params.
+        """
+        muS, sigmaS, muJ, sigmaJ, lambdaJ = params
+        x = np.asarray(returns, dtype=float)[:, np.newaxis]
+        dt = np.broadcast_to(np.asarray(dt, dtype=float), x.shape[:1])[:, np.newaxis]
+        n = np.arange(nmax + 1)[np.newaxis, :]
+
+        m = (muS - 0.5 * sigmaS**2) * dt + muJ * n
+        s2 = sigmaS**2 * dt + sigmaJ**2 * n
+        s = np.sqrt(s2)
+        z = (x - m) / s
+
+        # log of w_n * N(x; m_n, s_n^2), normalised with log-sum-exp
+        log_pn = -lambdaJ * dt + n * np.log(lambdaJ * dt) - gammaln(n + 1) - 0.5 * z**2 - np.log(s) - 0.5 * np.log(2 * np.pi)
+        log_p = logsumexp(log_pn, axis=1, keepdims=True)
+        responsibilities = np.exp(log_pn - log_p)
+
+        d_m = z / s
+        d_s2 = (z**2 - 1) / (2 * s2)
+        gradient = np.array([
+            np.sum(responsibilities * d_m * dt),
+            np.sum(responsibilities * (-d_m * sigmaS * dt + d_s2 * 2 * sigmaS * dt)),
+            np.sum(responsibilities * d_m * n),
+            np.sum(responsibilities * d_s2 * 2 * sigmaJ * n),
+            np.sum(responsibilities * (n / lambdaJ - dt)),
+        ])
+        return -np.sum(log_p), -gradient
+
+    @staticmethod
+    def calibrate_merton(history: Union[pd.DataFrame, pd.Series, np.ndarray], dt: Optional[float] = None, period: pd.Timedelta = pd.Timedelta(days=31), x0: Optional[Dict[str, float]] = None, bounds: Optional[Dict[str, tuple]] = None, nmax: Optional[int] = None) -> Optional[Dict[str, float]]:
+        """
+        Maximum-likelihood Merton parameters from a price history, e.g. CoinGecko.get_historical_market_data.
+
+        Parameters:
+        history (pd.DataFrame | pd.Series | np.ndarray): Prices; a DataFrame uses its 'price' column. With a DatetimeIndex the
+            return periods are measured from the timestamps in units of 'period', otherwise every return spans dt.
+        dt (float, optional): Length of one observation interval in units of period, for histories without timestamps.
+        period (pd.Timedelta): The model time unit. Defaults to the 31 day month used by the pricers (T = 1).
+        x0 (Dict[str, float], optional): Starting parameters, e.g. the previous calibration (warm start).
+        bounds (Dict[str, tuple], optional): Overrides of the default parameter bounds.
+        nmax (int, optional): Jump-count truncation. Defaults to where the Poisson tail at the upper lambdaJ bound is below 1e-10.
+
+        Returns:
+        Dict[str, float] | None: 'muS', 'sigmaS', 'muJ', 'sigmaJ', 'lambdaJ', ready to pass to Processes, or None if an error occurs.
+        """
+        try:
+            prices = history['price'] if isinstance(history, pd.DataFrame) else history
+            if isinstance(prices, pd.Series) and isinstance(prices.index, pd.DatetimeIndex):
+                prices = prices.sort_index()
+                intervals = np.diff(prices.index.values).astype('timedelta64[ns]').astype(float) / period.value
+            else:
+                if dt is None:
+                    raise ValueError('dt is required for price histories without timestamps.')
+                intervals = np.full(len(prices) - 1, dt)
+
+            values = np.asarray(prices, dtype=float)
+            returns = np.diff(np.log(values))
+            keep = np.isfinite(returns) & (intervals > 0)
+            returns, intervals = returns[keep], intervals[keep]
+
+            names = ['muS', 'sigmaS', 'muJ', 'sigmaJ', 'lambdaJ']
+            limits = {'muS': (-10, 10), 'sigmaS': (1e-4, 10), 'muJ': (-1, 1), 'sigmaJ': (1e-4, 2), 'lambdaJ': (1e-6, 200)}
+            limits.update(bounds or {})
+
+            if x0 is None:
+                step_std = returns.std()
+                mean_dt = intervals.mean()
+                x0 = {'muS': returns.mean() / mean_dt, 'sigmaS': step_std / np.sqrt(mean_dt), 'muJ': 0.0, 'sigmaJ': 3 * step_std, 'lambdaJ': 1.0}
+            start = np.clip([x0[name] for name in names], [limits[name][0] for name in names], [limits[name][1] for name in names])
+
+            if nmax is None:
+                nmax = max(1, int(poisson.ppf(1 - 1e-10, limits['lambdaJ'][1] * intervals.max())))
+
+            result = minimize(Optimisers.merton_negative_log_likelihood, start, args=(returns, intervals, nmax), jac=True, method='L-BFGS-B', bounds=[limits[name] for name in names])
+            if not result.success:
+                logging.warning(f"Merton calibration did not converge: {result.message}")
+            return dict(zip(names, (float(v) for v in result.x)))
+
+        except Exception as e:
+            logging.error(f"Error calibrating merton parameters: {e}")
+            return None
@@ -0,0 +1,119 @@
+from typing import Optional, Union
+import numpy as np
+import pandas as pd
+
+class PathSet:
+    """
+    Lightweight container for simulated paths: a contiguous (nsteps + 1) x npaths array (rows are time steps, columns
+    are paths, as in the former DataFrame output) with its time grid and a lazy scale factor.
+
+    Slicing time steps returns views of the underlying buffer, and scaled() returns a new PathSet sharing the same buffer,
+    so expressions like quantity * paths / (1 - init_weight) cost nothing until a (small) slice is read. Threshold tests
+    are done against the unscaled buffer (see below). Conversion to pandas is opt-in through to_frame().
+    """
+
+    def __init__(self, values: np.ndarray, times: Optional[np.ndarray] = None, scale: float = 1.0) -> None:
+        self.values = np.ascontiguousarray(values)
+        self.times = np.arange(self.values.shape[0], dtype=float) if times is None else np.asarray(times, dtype=float)
+        self.scale = float(scale)
+
+    @property
+    def nsteps(self) -> int:
+        return self.values.shape[0] - 1
+
+    @property
+    def npaths(self) -> int:
+        return self.values.shape[1]
+
+    @property
+    def shape(self) -> tuple:
+        return self.values.shape
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.values.dtype
+
+    def __len__(self) -> int:
+        return self.values.shape[0]
+
+    def __repr__(self) -> str:
+        return f'PathSet(nsteps={self.nsteps}, npaths={self.npaths}, dtype={self.dtype}, scale={self.scale})'
+
+    def _scaled(self, view: np.ndarray) -> np.ndarray:
+        return view if self.scale == 1.0 else view * self.scale
+
+    def step(self, k: int) -> np.ndarray:
+        """
+        Values of every path at time step k (a view when unscaled).
+        """
+        return self._scaled(self.values[k])
+
+    @property
+    def terminal(self) -> np.ndarray:
+        """
+        Values of every path at the last time step (a view when unscaled).
+        """
+        return self.step(-1)
+
+    def steps(self, index: Union[slice, int]) -> 'PathSet':
+        """
+        PathSet of a range of time steps (a view on the same buffer for ints and unit-step slices, a copy otherwise). An int k selects the single step k, counted from the
+        end when negative.
+        """
+        if isinstance(index, int):
+            if not -len(self) <= index < len(self):
+                raise IndexError(f'Time step {index} out of range for {len(self)} steps.')
+            index %= len(self)
+            index = slice(index, index + 1)
+        return PathSet(self.values[index], self.times[index], self.scale)
+
+    def paths(self, index: Union[slice, np.ndarray]) -> 'PathSet':
+        """
+        PathSet of a subset of paths. The buffer is kept C-contiguous (time steps by rows), so the selected columns are
+        always copied, for slices as well as index arrays.
+        """
+        return PathSet(self.values[:, index], self.times, self.scale)
+
+    def scaled(self, factor: float) -> 'PathSet':
+        """
+        PathSet multiplied by factor, sharing this buffer (no copy). The factor must be positive so that threshold tests keep their direction.
+        """
+        if factor <= 0:
+            raise ValueError(f'Scale factor must be positive, got {factor}.')
+        return PathSet(self.values, self.times, self.scale * factor)
+
+    def scale_(self, factor: float) -> 'PathSet':
+        """
+        Multiplies the buffer in place and returns self.
+        """
+        self.values *= factor * self.scale
+        self.scale = 1.0
+        return self
+
+    def below(self, level: float) -> np.ndarray:
+        """
+        Boolean (nsteps + 1) x npaths mask of values strictly below level, compared on the unscaled buffer.
+        """
+        return self.values < level / self.scale
+
+    def astype(self, dtype) -> 'PathSet':
+        return PathSet(self.values.astype(dtype, copy=False), self.times, self.scale)
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        values = self._scaled(self.values)
+        return values if dtype is None else values.astype(dtype, copy=False)
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Opt-in pandas view (rows are time steps, columns are paths), as merton_jump_diffusion_paths used to return.
+        """
+        return pd.DataFrame(np.asarray(self))
+
+    @staticmethod
+    def unscaled(paths) -> tuple:
+        """
+        (buffer, scale) for a PathSet, array or DataFrame, so callers can compare against level / scale without copying.
+        """
+        if isinstance(paths, PathSet):
+            return paths.values, paths.scale
+        return np.asarray(paths), 1.0
@@ -0,0 +1,211 @@
+from typing import Optional, Dict
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+from scipy.sparse.linalg import factorized
+from scipy.special import ndtr
+
+class FirstPassageSurface:
+    """
+    Value surface of down-and-in (first-passage) claims solved by PDE.first_passage_surface.
+
+    Values are stored per unit claim on a grid of y = log(S / L) >= 0 (distance above the liquidation price L) and
+    time to expiry tau. As the Merton model is scale invariant the same surface serves every liquidation price, so a
+    sweep over settings or a live Hedger lookup is just an interpolation.
+    """
+
+    def __init__(self, y: np.ndarray, tau: np.ndarray, values: Dict[str, np.ndarray], knocked: Dict[str, np.ndarray], discount: np.ndarray) -> None:
+        self.y = y
+        self.tau = tau
+        self.values = values
+        self._knocked = knocked
+        self._discount = discount
+        self._dy = y[1] - y[0]
+
+    def _derivatives(self, claim: str) -> tuple:
+        u = self.values[claim]
+        u_y = np.gradient(u, self._dy, axis=1)
+        u_yy = np.gradient(u_y, self._dy, axis=1)
+        return u, u_y, u_yy
+
+    def _interpolate(self, surface: np.ndarray, y: np.ndarray, tau: np.ndarray) -> np.ndarray:
+        """
+        Bilinear interpolation in (tau, y), clamped to the grid.
+        """
+        fy = np.clip((y - self.y[0]) / self._dy, 0, len(self.y) - 1 - 1e-12)
+        dtau = self.tau[1] - self.tau[0]
+        ft = np.clip(tau / dtau, 0, len(self.tau) - 1 - 1e-12)
+        iy, it = fy.astype(int), ft.astype(int)
+        wy, wt = fy - iy, ft - it
+        return ((1 - wt) * ((1 - wy) * surface[it, iy] + wy * surface[it, iy + 1])
+                + wt * ((1 - wy) * surface[it + 1, iy] + wy * surface[it + 1, iy + 1]))
+
+    def greeks(self, S, L, tau, claim: str = 'binary', payoff=1) -> Dict[str, np.ndarray]:
+        """
+        Price, delta and gamma of a claim for broadcastable S, liquidation price L and time to expiry tau.
+        The binary claim pays payoff, the gap claim pays payoff * (L - S) / L at (or after) first passage.
+        Points already at or below L return the knocked-in value with zero greeks.
+        """
+        S, L, tau, payoff = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (S, L, tau, payoff)))
+        y = np.log(S / L)
+        u, u_y, u_yy = (self._interpolate(surface, y, tau) for surface in self._derivatives(claim))
+        alive = y > 0
+
+        knocked_discount = np.interp(tau, self.tau, self._discount)
+        knocked = self._knocked[claim](np.minimum(y, 0.0)) * knocked_discount
+        with np.errstate(divide='ignore', invalid='ignore'):
+            delta = u_y / S
+            gamma = (u_yy - u_y) / S**2
+        return {
+            'price': payoff * np.where(alive, u, knocked),
+            'delta': payoff * np.where(alive, delta, 0.0),
+            'gamma': payoff * np.where(alive, gamma, 0.0),
+        }
+
+    def surface(self, claim: str = 'binary') -> Dict[str, np.ndarray]:
+        """
+        The whole per-unit (len(tau) x len(y)) 'price', 'dprice_dy' and 'd2price_dy2' grids, e.g. for plotting.
+        """
+        u, u_y, u_yy = self._derivatives(claim)
+        return {'price': u, 'dprice_dy': u_y, 'd2price_dy2': u_yy}
+
+
+class PDE:
+
+    # Payoff on first passage as a function of y = log(S / L) <= 0, per unit claim
+    CLAIMS = {
+        'binary': lambda y: np.ones_like(y),
+        'gap': lambda y: 1 - np.exp(y),
+    }
+
+    @staticmethod
+    def _jump_weights(dy: float, muJ: float, sigmaJ: float, width: float = 8) -> tuple:
+        """
+        Probabilities of a log jump landing in each grid cell [k - 1/2, k + 1/2] * dy, for k = -m..m.
+        """
+        m = int(np.ceil((abs(muJ) + width * sigmaJ) / dy)) + 1
+        edges = (np.arange(-m, m + 2) - 0.5) * dy
+        cdf = ndtr((edges - muJ) / sigmaJ) if sigmaJ > 0 else (edges >= muJ).astype(float)
+        return np.diff(cdf), m
+
+    @staticmethod
+    def first_passage_surface(T: float, r: float, sigma: float, muJ: float = 0.0, sigmaJ: float = 0.0, lambdaJ: float = 0.0, pay_at: str = 'hit', y_max: Optional[float] = None, ny: int = 400, nt: int = 200, rannacher_steps: int = 2) -> FirstPassageSurface:
+        """
+        Crank-Nicolson solve of down-and-in claims that pay on the first passage of the price below the liquidation price L,
+        for the risk-neutral Merton process (pure GBM when lambdaJ = 0).
+
+        Working in y = log(S / L) with the barrier at y = 0 removes L from the problem, so a single factorisation and a single
+        time march produce the 'binary' (pays 1) and 'gap' (pays the jump overshoot (L - S) / L) claims for every liquidation
+        price at once; payoff sizes such as slippage shortfalls are linear scalings. The diffusion is implicit (Crank-Nicolson,
+        with Rannacher implicit half steps to damp the payoff discontinuity) and the jump integral explicit, so the tridiagonal
+        matrices are factorised once up front. Below the barrier the claim is knocked in and worth its payoff, paid at once
+        (pay_at='hit') or at expiry (pay_at='expiry').
+
+        Parameters:
+        T (float): Horizon, in the time unit of sigma, r and lambdaJ (months in this repo).
+        r (float): Risk free rate per unit time.
+        sigma (float): Diffusion volatility.
+        muJ, sigmaJ, lambdaJ (float): Merton log-jump mean, log-jump volatility and intensity, as in Processes.
+        pay_at (str): 'hit' or 'expiry'.
+        y_max (float, optional): Upper edge of the log-moneyness grid, defaults to 8 standard deviations of log(S_T / S_0).
+        ny (int): Number of y intervals.
+        nt (int): Number of time steps.
+        rannacher_steps (int): Number of initial steps taken as two implicit Euler half steps.
+
+        Returns:
+        FirstPassageSurface: The per-unit value surfaces over (tau, y).
+        """
+        if pay_at not in ('hit', 'expiry'):
+            raise ValueError(f"pay_at must be 'hit' or 'expiry', got {pay_at!r}.")
+
+        kappa = np.exp(muJ + 0.5 * sigmaJ**2) - 1
+        if y_max is None:
+            y_max = 8 * np.sqrt((sigma**2 + lambdaJ * (muJ**2 + sigmaJ**2)) * T)
+        y = np.linspace(0.0, y_max, ny + 1)
+        dy = y[1] - y[0]
+        tau = np.linspace(0.0, T, nt + 1)
+        dt = tau[1] - tau[0]
+
+        # Generator on the interior nodes: 0.5 sigma^2 u_yy + drift u_y - (r + lambdaJ) u
+        drift = r - 0.5 * sigma**2 - lambdaJ * kappa
+        lower = 0.5 * sigma**2 / dy**2 - drift / (2 * dy)
+        upper = 0.5 * sigma**2 / dy**2 + drift / (2 * dy)
+        centre = -sigma**2 / dy**2 - (r + lambdaJ)
+        n = ny - 1
+        A = sp.diags([np.full(n - 1, lower), np.full(n, centre), np.full(n - 1, upper)], [-1, 0, 1], format='csc')
+        identity = sp.identity(n, format='csc')
+        # I - dt/2 A is both the Crank-Nicolson matrix and the implicit Euler matrix for a half step, so it is factorised once
+        solve = factorized((identity - 0.5 * dt * A).tocsc())
+        explicit = (identity + 0.5 * dt * A).tocsr()
+
+        claims = list(PDE.CLAIMS)
+        if lambdaJ > 0:
+            weights, m = PDE._jump_weights(dy, muJ, sigmaJ)
+            knocked = np.stack([PDE.CLAIMS[c](-dy * np.arange(m, 0, -1)) for c in claims], axis=1)
+        on_barrier = np.array([PDE.CLAIMS[c](np.zeros(1))[0] for c in claims])
+
+        def knocked_discount(time_to_expiry):
+            return np.exp(-r * time_to_expiry) if pay_at == 'expiry' else 1.0
+
+        def jump_term(u, time_to_expiry):
+            """
+            lambdaJ * E[u(y + J)] on the interior, with knocked-in values below the grid and 0 above it.
+            """
+            if lambdaJ == 0:
+                return 0.0
+            extended = np.vstack([knocked * knocked_discount(time_to_expiry), u, np.zeros((m, len(claims)))])
+            integral = np.stack([np.convolve(extended[:, k], weights[::-1], mode='valid') for k in range(len(claims))], axis=1)
+            return lambdaJ * integral[1:-1]
+
+        u = np.zeros((ny + 1, len(claims)))
+        u[0] = on_barrier * knocked_discount(0.0)
+        values = np.empty((nt + 1, ny + 1, len(claims)))
+        values[0] = u
+
+        for step in range(1, nt + 1):
+            if step <= rannacher_steps:
+                for half in (1, 2):
+                    time_to_expiry = tau[step - 1] + half * 0.5 * dt
+                    barrier = on_barrier * knocked_discount(time_to_expiry)
+                    rhs = u[1:-1] + 0.5 * dt * jump_term(u, time_to_expiry - 0.5 * dt)
+                    rhs[0] += 0.5 * dt * lower * barrier
+                    u = np.vstack([barrier, solve(rhs), np.zeros(len(claims))])
+            else:
+                barrier = on_barrier * knocked_discount(tau[step])
+                rhs = explicit @ u[1:-1] + dt * jump_term(u, tau[step - 1])
+                rhs[0] += 0.5 * dt * lower * (u[0] + barrier)
+                u = np.vstack([barrier, solve(rhs), np.zeros(len(claims))])
+            values[step] = u
+
+        return FirstPassageSurface(y, tau, {c: values[:, :, k] for k, c in enumerate(claims)}, PDE.CLAIMS, knocked_discount(tau) * np.ones_like(tau))
+
+    @staticmethod
+    def liquidation_put_values(surface: FirstPassageSurface, price: float, settings: pd.DataFrame, t: float = 0, init_liab_weight: float = 1, maint_liab_weight: float = 1) -> Dict[str, np.ndarray]:
+        """
+        First-passage counterpart of Numerical.liquidation_put_values for every setting, read off one solved surface:
+        the insurance fund pays the slippage shortfall (binary claim) when the price first falls to the setting's
+        liquidation price. Also returns the per-unit jump gap claim, the extra loss from gapping through the liquidation price.
+
+        Returns:
+        Dict[str, np.ndarray]: len(settings) arrays 'value', 'delta' and 'gamma' of the shortfall claim, and 'gap_value',
+        the per-unit value of the jump overshoot (L - S) / L at liquidation.
+        """
+        from vesta.pricing.numerical import Numerical
+
+        init_weight = settings['init_asset_weight'].to_numpy(dtype=float)
+        deposit_limit = settings['deposit_limit'].to_numpy(dtype=float)
+        slippage = settings['slippage'].to_numpy(dtype=float)
+
+        borrowed_value = (deposit_limit * init_weight / (1 - init_weight)) / init_liab_weight
+        shortfall_value = borrowed_value * maint_liab_weight * (slippage / 100)
+        thresholds = Numerical.liquidation_thresholds(price, settings, init_liab_weight, maint_liab_weight)
+
+        tau = surface.tau[-1] - t
+        binary = surface.greeks(price, thresholds, tau, 'binary')
+        gap = surface.greeks(price, thresholds, tau, 'gap')
+        return {
+            'value': binary['price'] * shortfall_value,
+            'delta': binary['delta'] * shortfall_value,
+            'gamma': binary['gamma'] * shortfall_value,
+            'gap_value': gap['price'],
+        }
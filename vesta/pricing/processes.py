@@ -1,39 +1,336 @@
-from typing import Optional, List
+from typing import Optional, List, Union, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from functools import lru_cache
 import numpy as np
 import pandas as pd
 import logging
+from scipy.stats import qmc
+from scipy.special import ndtri
+from .accumulators import Accumulator
+from .pathset import PathSet
+
+RandomSource = Union[None, int, np.random.SeedSequence, np.random.Generator]
 
 class Processes:
     """
     A class representing static methods of all different stochastic processes.
-    Each process returns a list of arrays of values. 
+    Each process returns a list of arrays of values.
+
+    Randomness comes from an explicit rng (a numpy Generator, a SeedSequence or an integer seed) rather than the
+    global np.random state. Path simulators split npaths into streams of paths_per_stream paths, each driven by
+    its own spawned child generator, so for a given seed the output is identical whatever the number of workers.
     """
 
+    # Number of (steps x paths) float64 work arrays alive at once while generating a block of increments.
+    _BLOCK_WORK_ARRAYS = 4
+
+    # Default number of paths per independent random stream (the unit of work handed to a worker). A power of two, so
+    # that Sobol streams keep their balance properties.
+    PATHS_PER_STREAM = 8192
+
     @staticmethod
-    def merton_jump_diffusion_paths(muS: float, sigmaS: float, muJ: float, sigmaJ: float, lambdaJ: float, npaths: int, T: float, nsteps: int, S0: float, ) -> Optional[pd.DataFrame]:
-        try:
-            dt = T / nsteps  # time step
+    def _generator(rng: RandomSource) -> np.random.Generator:
+        if isinstance(rng, np.random.Generator):
+            return rng
+        return np.random.default_rng(rng)
+
+    @staticmethod
+    def _spawn_streams(rng: RandomSource, nstreams: int) -> List[np.random.Generator]:
+        """
+        Independent child generators, one per stream of paths.
+        """
+        if isinstance(rng, np.random.Generator):
+            return rng.spawn(nstreams)
+        seed = rng if isinstance(rng, np.random.SeedSequence) else np.random.SeedSequence(rng)
+        return [np.random.default_rng(child) for child in seed.spawn(nstreams)]
+
+    @staticmethod
+    def _stream_sizes(npaths: int, paths_per_stream: Optional[int], sobol: bool = False) -> List[int]:
+        size = paths_per_stream or Processes.PATHS_PER_STREAM
+        if sobol:
+            size = 1 << (size - 1).bit_length()
+        return [min(size, npaths - p0) for p0 in range(0, npaths, size)]
+
+    @staticmethod
+    def _map(fn, args: list, workers: int) -> Iterator:
+        """
+        Ordered map over streams, in a process pool when workers > 1. Results are yielded one at a time, so callers can
+        consume each stream before the next one is held in memory.
+        """
+        if workers <= 1 or len(args) <= 1:
+            for a in args:
+                yield fn(a)
+            return
+        with ProcessPoolExecutor(max_workers=min(workers, len(args))) as executor:
+            yield from executor.map(fn, args)
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _brownian_bridge_plan(nsteps: int) -> tuple:
+        """
+        Construction order of a Brownian bridge on the grid 0..nsteps: the terminal point first, then midpoints by bisection.
+        Each entry is (index, left, right); left/right are the already-built neighbours it is conditioned on (right is None for the terminal point).
+        """
+        plan = [(nsteps, 0, None)]
+        queue = deque([(0, nsteps)])
+        while queue:
+            left, right = queue.popleft()
+            if right - left > 1:
+                mid = (left + right) // 2
+                plan.append((mid, left, right))
+                queue.append((left, mid))
+                queue.append((mid, right))
+        return tuple(plan)
+
+    @staticmethod
+    def _brownian_bridge(Z: np.ndarray, dt: float) -> np.ndarray:
+        """
+        Increments of standard Brownian motion over steps of length dt, built by Brownian bridge from the (nsteps x npaths)
+        normals Z. Row 0 of Z fixes the terminal value, so low-discrepancy dimensions go to the coarsest features of the path.
+        """
+        nsteps, npaths = Z.shape
+        W = np.zeros((nsteps + 1, npaths))
+        for row, (index, left, right) in enumerate(Processes._brownian_bridge_plan(nsteps)):
+            if right is None:
+                W[index] = np.sqrt(index * dt) * Z[row]
+            else:
+                W[index] = ((right - index) * W[left] + (index - left) * W[right]) / (right - left)
+                W[index] += np.sqrt((index - left) * (right - index) / (right - left) * dt) * Z[row]
+        return np.diff(W, axis=0)
+
+    @staticmethod
+    def _sobol_normals(nsteps: int, npaths: int, rng: np.random.Generator) -> np.ndarray:
+        """
+        (nsteps x npaths) standard normals from a scrambled Sobol sequence, one dimension per row.
+        npaths should be a power of two for the balance properties of the sequence to hold.
+        """
+        u = qmc.Sobol(d=nsteps, scramble=True, seed=rng).random(npaths)
+        return ndtri(np.clip(u, 1e-16, 1 - 1e-16)).T
+
+    @staticmethod
+    def _diffusion_increments(muS: float, sigmaS: float, dt: float, nsteps: int, npaths: int, rng: np.random.Generator, antithetic: bool = False, sobol: bool = False) -> np.ndarray:
+        """
+        Log-increments of the GBM part of the Merton jump diffusion for an (nsteps x npaths) block.
+        With antithetic=True the second half of the paths mirrors the normals of the first half (path j pairs with j + ceil(npaths / 2)).
+        With sobol=True the normals are scrambled Sobol points laid out by Brownian bridge.
+        """
+        draws = (npaths + 1) // 2 if antithetic else npaths
+        if sobol:
+            Z = Processes._sobol_normals(nsteps, draws, rng)
+        else:
+            Z = rng.standard_normal((nsteps, draws))
+        if antithetic:
+            Z = np.concatenate([Z, -Z], axis=1)[:, :npaths]
+
+        if sobol:
+            dW = Processes._brownian_bridge(Z, dt)
+            dW *= sigmaS
+        else:
+            dW = Z
+            dW *= sigmaS * np.sqrt(dt)
+        dW += (muS - 0.5 * sigmaS**2) * dt
+        return dW
+
+    @staticmethod
+    def _add_jumps(dX: np.ndarray, muJ: float, sigmaJ: float, lambdaJ: float, dt: float, rng: np.random.Generator) -> np.ndarray:
+        """
+        Adds the increments of the Non-Central poisson process to the (nsteps x npaths) block dX, in place.
+        """
+        # Jumps are rare (lambdaJ * dt << 1), so draw the total number of jumps in the block, drop each one on a uniformly
+        # chosen (step, path) cell and add a N(muJ, sigmaJ^2) size there. This is the same law as a Poisson(lambdaJ * dt)
+        # count per cell with muJ * dN + sigmaJ * sqrt(dN) * Z sizes, without drawing two dense arrays that are almost all zero.
+        nsteps, npaths = dX.shape
+        njumps = rng.poisson(lambdaJ * dt * nsteps * npaths)
+        if njumps:
+            cells = rng.integers(0, nsteps * npaths, size=njumps)
+            sizes = muJ + sigmaJ * rng.standard_normal(njumps)
+            np.add.at(dX.reshape(-1), cells, sizes)
+        return dX
 
-            # Computing the increments of the GBM
-            dW = (muS - 0.5 * sigmaS**2) * dt + sigmaS * np.sqrt(dt) * np.random.randn(nsteps, npaths)
+    @staticmethod
+    def _merton_increments(muS: float, sigmaS: float, muJ: float, sigmaJ: float, lambdaJ: float, dt: float, nsteps: int, npaths: int, rng: np.random.Generator, antithetic: bool = False, sobol: bool = False) -> np.ndarray:
+        """
+        Log-increments dX = dW + dJ of the Merton jump diffusion for an (nsteps x npaths) block.
+        """
+        dX = Processes._diffusion_increments(muS, sigmaS, dt, nsteps, npaths, rng, antithetic, sobol)
+        return Processes._add_jumps(dX, muJ, sigmaJ, lambdaJ, dt, rng)
 
-            # Computing the increments of the Non-Central poisson process. 
-            dN = np.random.poisson(lambdaJ * dt, (nsteps, npaths))
-            dJ = muJ * dN + sigmaJ * np.sqrt(dN) * np.random.randn(nsteps, npaths)
+    @staticmethod
+    def _levels_to_prices(dX: np.ndarray, S0: float) -> np.ndarray:
+        """
+        (nsteps + 1) x npaths prices S0 * exp(cumsum(dX)) with a starting row of S0, built in one buffer.
+        """
+        X = np.empty((dX.shape[0] + 1, dX.shape[1]))
+        X[0] = 0.0
+        np.cumsum(dX, axis=0, out=X[1:])
+        np.exp(X, out=X)
+        X *= S0
+        return X
 
-            # Sum the increments of the GBM and the NCPP
-            dX = dW + dJ
+    @staticmethod
+    def _merton_paths_stream(args: tuple):
+        muS, sigmaS, muJ, sigmaJ, lambdaJ, npaths, T, nsteps, S0, rng, antithetic, sobol, control = args
+        dt = T / nsteps
+        dX = Processes._diffusion_increments(muS, sigmaS, dt, nsteps, npaths, rng, antithetic, sobol)
 
-            # Accumulate the increments
-            L = np.vstack((np.zeros((1, npaths)), np.cumsum(dX, axis=0)))
+        # The jump-free GBM companion driven by the same normals, used as a control variate.
+        gbm = Processes._levels_to_prices(dX, S0) if control else None
+        Processes._add_jumps(dX, muJ, sigmaJ, lambdaJ, dt, rng)
+
+        # Accumulate the increments and develop a stock price
+        return Processes._levels_to_prices(dX, S0), gbm
+
+    @staticmethod
+    def merton_jump_diffusion_paths(muS: float, sigmaS: float, muJ: float, sigmaJ: float, lambdaJ: float, npaths: int, T: float, nsteps: int, S0: float, rng: RandomSource = None, workers: int = 1, paths_per_stream: Optional[int] = None, antithetic: bool = False, sobol: bool = False, control: bool = False, dtype=np.float64, as_frame: bool = False):
+        """
+        Simulates Merton jump diffusion paths as an (nsteps + 1) x npaths PathSet (rows are time steps, columns paths)
+        on the time grid 0, T / nsteps, ..., T.
 
-            # Develop a stock price
-            X = S0 * np.exp(L)
+        Variance reduction options (applied within each stream of paths):
+        antithetic (bool): Pair every path with one driven by the negated diffusion normals.
+        sobol (bool): Drive the diffusion with scrambled Sobol normals laid out by Brownian bridge. Independent scrambles per
+            stream make the streams i.i.d. replications, so batch-means standard errors stay valid. paths_per_stream is rounded up
+            to a power of two; use a multiple of it for npaths so that the last stream is a full one too.
+        control (bool): Also return the jump-free GBM paths driven by the same normals, for use as a control variate.
 
-            return pd.DataFrame(X)
+        dtype: Storage type of the returned paths; np.float32 halves the memory (paths are always generated in float64).
+        as_frame (bool): Return pandas DataFrames, as older versions did, instead of PathSets.
+
+        Returns:
+        PathSet | (PathSet, PathSet) | None: The paths, or (paths, gbm_paths) when control=True, or None if an error occurs.
+        """
+        try:
+            sizes = Processes._stream_sizes(npaths, paths_per_stream, sobol)
+            streams = Processes._spawn_streams(rng, len(sizes))
+            args = [(muS, sigmaS, muJ, sigmaJ, lambdaJ, n, T, nsteps, S0, stream, antithetic, sobol, control) for n, stream in zip(sizes, streams)]
+
+            # Streams are written straight into one preallocated buffer per output.
+            X = np.empty((nsteps + 1, npaths), dtype=dtype)
+            G = np.empty((nsteps + 1, npaths), dtype=dtype) if control else None
+            p0 = 0
+            for n, (paths, gbm) in zip(sizes, Processes._map(Processes._merton_paths_stream, args, workers)):
+                X[:, p0:p0 + n] = paths
+                if control:
+                    G[:, p0:p0 + n] = gbm
+                p0 += n
+
+            times = np.linspace(0, T, nsteps + 1)
+            out = [PathSet(X, times)] + ([PathSet(G, times)] if control else [])
+            if as_frame:
+                out = [pathset.to_frame() for pathset in out]
+            return tuple(out) if control else out[0]
 
         except Exception as e:
             logging.error(f"Error computing merton paths: {e}")
             return None
-        
 
+    @staticmethod
+    def merton_jump_diffusion_terminal(muS: float, sigmaS: float, muJ: float, sigmaJ: float, lambdaJ: float, npaths: int, T: float, nsteps: int, S0: float, rng: RandomSource = None) -> Optional[np.ndarray]:
+        """
+        Samples S_T directly from the exact Merton terminal law, in O(npaths).
+
+        Conditional on N ~ Poisson(lambdaJ * T) jumps, log(S_T / S0) is normal with mean (muS - sigmaS^2 / 2) * T + muJ * N
+        and variance sigmaS^2 * T + sigmaJ^2 * N, so one Poisson and one normal draw per path suffice. Has the same
+        signature as merton_jump_diffusion_paths (nsteps is accepted but not needed) and the same law as its last row.
+
+        Returns:
+        np.ndarray | None: The npaths terminal values, or None if an error occurs.
+        """
+        try:
+            rng = Processes._generator(rng)
+            N = rng.poisson(lambdaJ * T, npaths)
+            mean = (muS - 0.5 * sigmaS**2) * T + muJ * N
+            std = np.sqrt(sigmaS**2 * T + sigmaJ**2 * N)
+            return S0 * np.exp(mean + std * rng.standard_normal(npaths))
+
+        except Exception as e:
+            logging.error(f"Error computing merton terminal values: {e}")
+            return None
+
+    @staticmethod
+    def chunk_shape(npaths: int, nsteps: int, max_bytes: int) -> tuple:
+        """
+        Largest (path_chunk, step_chunk) block whose generation fits in max_bytes.
+        Whole paths are preferred; time is only split when a single path-chunk of full length does not fit.
+        """
+        elements = max(1, int(max_bytes) // (8 * Processes._BLOCK_WORK_ARRAYS))
+        if elements >= nsteps:
+            return min(npaths, elements // nsteps), nsteps
+        path_chunk = min(npaths, elements)
+        return path_chunk, max(1, elements // path_chunk)
+
+    @staticmethod
+    def _merton_stream_chunks(args: tuple) -> List[Accumulator]:
+        """
+        Feeds one stream of paths, chunk by chunk, through fresh copies of the accumulators.
+        """
+        muS, sigmaS, muJ, sigmaJ, lambdaJ, npaths, T, nsteps, S0, rng, accumulators, path_chunk, step_chunk, antithetic, sobol = args
+        dt = T / nsteps
+        accumulators = [acc.fresh() for acc in accumulators]
+
+        for p0 in range(0, npaths, path_chunk):
+            n = min(path_chunk, npaths - p0)
+            for acc in accumulators:
+                acc.begin_chunk(n)
+
+            # The first row is the starting price for every path.
+            level = np.zeros(n)
+            start = np.full((1, n), float(S0))
+            for acc in accumulators:
+                acc.update(start, 0)
+
+            for s0 in range(0, nsteps, step_chunk):
+                m = min(step_chunk, nsteps - s0)
+                block = Processes._merton_increments(muS, sigmaS, muJ, sigmaJ, lambdaJ, dt, m, n, rng, antithetic, sobol)
+                np.cumsum(block, axis=0, out=block)
+                block += level
+                level = block[-1].copy()
+                np.exp(block, out=block)
+                block *= S0
+                for acc in accumulators:
+                    acc.update(block, s0 + 1)
+
+            for acc in accumulators:
+                acc.end_chunk()
+
+        return accumulators
+
+    @staticmethod
+    def merton_jump_diffusion_stream(muS: float, sigmaS: float, muJ: float, sigmaJ: float, lambdaJ: float, npaths: int, T: float, nsteps: int, S0: float, accumulators: List[Accumulator], max_bytes: int = 256 * 2**20, path_chunk: Optional[int] = None, step_chunk: Optional[int] = None, rng: RandomSource = None, workers: int = 1, paths_per_stream: Optional[int] = None, antithetic: bool = False, sobol: bool = False) -> List[Accumulator]:
+        """
+        Streams Merton jump diffusion paths through accumulators without materialising the full path matrix.
+
+        Paths are generated in path-chunks and, within each path-chunk, in time-chunks so that the working set
+        of each worker stays within max_bytes. Each accumulator sees the same (nsteps + 1) x npaths price matrix
+        that merton_jump_diffusion_paths would return, one block at a time (see vesta.pricing.accumulators).
+
+        Parameters:
+        accumulators (List[Accumulator]): Running statistics to feed, e.g. TerminalValues, RunningMinimum, CrossingCounts, StepPayoffMeans.
+        max_bytes (int): Memory budget for one block of increments. Defaults to 256 MiB.
+        path_chunk, step_chunk (int, optional): Explicit block shape, overriding the budget.
+        rng (Generator | SeedSequence | int, optional): Source of the per-stream generators.
+        workers (int): Number of processes the streams are spread over. Results do not depend on it.
+        paths_per_stream (int, optional): Paths per independent random stream. Defaults to PATHS_PER_STREAM.
+        antithetic, sobol (bool): Variance reduction, as in merton_jump_diffusion_paths. Antithetic pairs and Sobol
+            sequences live within a path-chunk; Sobol needs whole paths (step_chunk == nsteps).
+
+        Returns:
+        List[Accumulator]: The accumulators, with every stream merged in.
+        """
+        sizes = Processes._stream_sizes(npaths, paths_per_stream, sobol)
+        if not sizes:
+            return accumulators
+        budget_paths, budget_steps = Processes.chunk_shape(max(sizes), nsteps, max_bytes)
+        path_chunk = min(max(sizes), path_chunk or budget_paths)
+        step_chunk = min(nsteps, step_chunk or budget_steps)
+        if sobol and step_chunk < nsteps:
+            raise ValueError('Sobol paths are built by Brownian bridge over the whole horizon and cannot be split in time; raise max_bytes or lower path_chunk.')
+
+        streams = Processes._spawn_streams(rng, len(sizes))
+        args = [(muS, sigmaS, muJ, sigmaJ, lambdaJ, n, T, nsteps, S0, stream, accumulators, path_chunk, step_chunk, antithetic, sobol) for n, stream in zip(sizes, streams)]
+        for stream_accumulators in Processes._map(Processes._merton_stream_chunks, args, workers):
+            for acc, stream_acc in zip(accumulators, stream_accumulators):
+                acc.merge(stream_acc)
+
+        return accumulators
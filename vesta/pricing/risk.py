@@ -1,13 +1,10 @@
-from typing import Optional, List
-import numpy as np
-import pandas as pd
-import logging
-from scipy.stats import norm
-from typing import Optional, List
+from typing import Optional, List, Dict
 import numpy as np
 import pandas as pd
 import logging
 from scipy.stats import norm
+from vesta.pricing.analytical import Analytical
+from vesta.pricing.fourier import Fourier
 
 class Risk:
 
@@ -129,3 +126,149 @@ class Risk:
             'Short Hedge Required': [current_short_positions],
             'Months of Fees To Cover Short': [months_of_fees_to_cover_short]
         })
+
+    @staticmethod
+    def build_settings_grid(init_asset_weights, maint_asset_weights, deposit_limits_and_slippages, require_maint_above_init: bool = True) -> pd.DataFrame:
+        """
+        Build the table of parameter combinations swept by the JLP scripts.
+
+        Parameters:
+        init_asset_weights (List[float]): Initial asset weights to sweep.
+        maint_asset_weights (List[float]): Maintenance asset weights to sweep.
+        deposit_limits_and_slippages (List[dict]): Deposit limit -> slippage (%) mappings, as used in the scripts.
+        require_maint_above_init (bool): Drop combinations where the loan would start on the liquidation price.
+
+        Returns:
+        pd.DataFrame: One row per setting with 'init_asset_weight', 'maint_asset_weight', 'deposit_limit' and 'slippage' columns.
+        """
+        rows = [
+            (init_weight, maint_weight, deposit_limit, slippage)
+            for init_weight in init_asset_weights
+            for maint_weight in maint_asset_weights
+            if maint_weight > init_weight or not require_maint_above_init
+            for deposit_slippage in deposit_limits_and_slippages
+            for deposit_limit, slippage in deposit_slippage.items()
+        ]
+        return pd.DataFrame(rows, columns=['init_asset_weight', 'maint_asset_weight', 'deposit_limit', 'slippage'])
+
+    @staticmethod
+    def _grid_common(price, init_asset_weight, maint_asset_weight, init_liab_weight, deposit_limit, supply):
+        """
+        Loan terms shared by the binary and vanilla grids, computed on broadcast arrays.
+        """
+        price, init_asset_weight, maint_asset_weight, init_liab_weight, deposit_limit, supply = np.broadcast_arrays(
+            *(np.asarray(x, dtype=float) for x in (price, init_asset_weight, maint_asset_weight, init_liab_weight, deposit_limit, supply))
+        )
+        liq_price = (price * init_asset_weight) / maint_asset_weight
+        borrowed_value = ((deposit_limit * init_asset_weight) / (1 - init_asset_weight)) / init_liab_weight
+        return {
+            'price': price,
+            'init_asset_weight': init_asset_weight,
+            'maint_asset_weight': maint_asset_weight,
+            'deposit_limit': deposit_limit,
+            'leverage': 1 / (1 - init_asset_weight),
+            'liq_price': liq_price,
+            'price_drop': 100 * ((liq_price - price) / price),
+            'perc_of_mktcp': 100 * (deposit_limit / (supply * price)),
+            'collateral_value': deposit_limit / (1 - init_asset_weight),
+            'borrowed_value': borrowed_value,
+            'borrowed_quantity': borrowed_value / price,
+        }
+
+    @staticmethod
+    def calculate_grid_values_binary(vsta, price, T, t, risk_free_rate, sigma, init_asset_weight, maint_asset_weight, init_liab_weight, maint_liab_weight, deposit_limit, slippage, supply, jumps: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+        """
+        Vectorised calculate_current_values_binary over many settings at once.
+        Every parameter may be a scalar or an array (e.g. the columns of build_settings_grid); they are broadcast together
+        and priced with a single Analytical.binary_put_greeks call, or Fourier.binary_put_greeks when jumps
+        ({'muJ', 'sigmaJ', 'lambdaJ'}, e.g. from Optimisers.calibrate_merton) are given.
+
+        Returns:
+        pd.DataFrame: One row per broadcast setting, with the same columns as calculate_current_values_binary.
+        """
+        c = Risk._grid_common(price, init_asset_weight, maint_asset_weight, init_liab_weight, deposit_limit, supply)
+        slippage = np.broadcast_to(np.asarray(slippage, dtype=float), c['price'].shape)
+
+        shortfall_value = c['borrowed_quantity'] * (slippage / 100)
+
+        if jumps is None:
+            greeks = Analytical.binary_put_greeks(c['price'], c['liq_price'], T, t, risk_free_rate, sigma, 1)
+        else:
+            greeks = Fourier.binary_put_greeks(c['price'], c['liq_price'], T, t, risk_free_rate, sigma, jumps['muJ'], jumps['sigmaJ'], jumps['lambdaJ'], 1)
+        current_exposure = greeks['price'] * shortfall_value # Exposure is simply a large contract size on a binary (=1 payoff) put.
+        current_short_positions = greeks['delta'] * shortfall_value
+        current_exposure_coll_ratio = 100 * (current_exposure / c['collateral_value'])
+
+        return pd.DataFrame({
+            'Underlying (collateral price)': c['price'].ravel(),
+            'Put value': greeks['price'].ravel(),
+            'Delta': greeks['delta'].ravel(),
+            'Gamma': greeks['gamma'].ravel(),
+            'Vega': greeks['vega'].ravel(),
+            'Theta': greeks['theta'].ravel(),
+            'Speed': greeks['speed'].ravel(),
+            'Initial Asset Weight': c['init_asset_weight'].ravel(),
+            'Maintenance Asset Weight': c['maint_asset_weight'].ravel(),
+            'Leverage': c['leverage'].ravel(),
+            'Liquidation Price': c['liq_price'].ravel(),
+            'Liqudidation Price Drop (%)': c['price_drop'].ravel(),
+            'Collateral Value': c['collateral_value'].ravel(),
+            'Borrow Value': c['borrowed_value'].ravel(),
+            'Deposit Limit': c['deposit_limit'].ravel(),
+            'Percent of Market Cap': c['perc_of_mktcp'].ravel(),
+            'Slippage %': slippage.ravel(),
+            'Insurance Fund Risk (Slippage)': shortfall_value.ravel(),
+            'Exposure': current_exposure.ravel(),
+            'Exposure Collateral Ratio (%)': current_exposure_coll_ratio.ravel(),
+            'Collateral APR Required (%)': (current_exposure_coll_ratio * 12).ravel(),
+            'Short Hedge Required': current_short_positions.ravel()
+        })
+
+    @staticmethod
+    def calculate_grid_values_vanilla(vsta, price, T, t, risk_free_rate, sigma, init_asset_weight, maint_asset_weight, init_liab_weight, maint_liab_weight, deposit_limit, slippage, supply, jumps: Optional[Dict[str, float]] = None) -> pd.DataFrame:
+        """
+        Vectorised calculate_current_values_vanilla over many settings at once.
+        Every parameter may be a scalar or an array (e.g. the columns of build_settings_grid); they are broadcast together
+        and priced with a single Analytical.vanilla_put_greeks call, or Fourier.vanilla_put_greeks when jumps
+        ({'muJ', 'sigmaJ', 'lambdaJ'}, e.g. from Optimisers.calibrate_merton) are given.
+
+        Returns:
+        pd.DataFrame: One row per broadcast setting, with the same columns as calculate_current_values_vanilla (Vanilla.csv).
+        """
+        c = Risk._grid_common(price, init_asset_weight, maint_asset_weight, init_liab_weight, deposit_limit, supply)
+        slippage = np.broadcast_to(np.asarray(slippage, dtype=float), c['price'].shape)
+
+        if jumps is None:
+            greeks = Analytical.vanilla_put_greeks(c['price'], c['liq_price'], T, t, risk_free_rate, sigma)
+        else:
+            greeks = Fourier.vanilla_put_greeks(c['price'], c['liq_price'], T, t, risk_free_rate, sigma, jumps['muJ'], jumps['sigmaJ'], jumps['lambdaJ'])
+        current_maximum_potential_exposure = c['borrowed_quantity'] * greeks['price']
+        current_short_positions = greeks['delta'] * c['borrowed_value']
+        current_exposure_coll_ratio = 100 * (current_maximum_potential_exposure / c['collateral_value'])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            months_of_fees_to_cover_short = - (current_short_positions / current_maximum_potential_exposure)
+
+        return pd.DataFrame({
+            'Underlying (collateral price)': c['price'].ravel(),
+            'Put value': greeks['price'].ravel(),
+            'Delta': greeks['delta'].ravel(),
+            'Gamma': greeks['gamma'].ravel(),
+            'Vega': greeks['vega'].ravel(),
+            'Theta': greeks['theta'].ravel(),
+            'Speed': greeks['speed'].ravel(),
+            'Initial Asset Weight': c['init_asset_weight'].ravel(),
+            'Maintenance Asset Weight': c['maint_asset_weight'].ravel(),
+            'Leverage': c['leverage'].ravel(),
+            'Liquidation Price': c['liq_price'].ravel(),
+            'Liqudidation Price Drop (%)': c['price_drop'].ravel(),
+            'Collateral Value': c['collateral_value'].ravel(),
+            'Borrow Value': c['borrowed_value'].ravel(),
+            'Deposit Limit': c['deposit_limit'].ravel(),
+            'Percent of Market Cap': c['perc_of_mktcp'].ravel(),
+            'Slippage %': slippage.ravel(),
+            'Maximum Potential Exposure (Monthly Fees)': current_maximum_potential_exposure.ravel(),
+            'Exposure Collateral Ratio (Monthly APR) (%)': current_exposure_coll_ratio.ravel(),
+            'Collateral APR Required (%)': (current_exposure_coll_ratio * 12).ravel(),
+            'Short Hedge Required': current_short_positions.ravel(),
+            'Months of Fees To Cover Short': months_of_fees_to_cover_short.ravel()
+        })
@@ -0,0 +1,154 @@
+from typing import Callable, Dict, Tuple, Optional
+from functools import lru_cache
+import logging
+import numpy as np
+from vesta.pricing.analytical import Analytical
+from vesta.pricing.fourier import Fourier
+
+class InterpolatedSurface:
+    """
+    Piecewise bicubic (4 x 4 point Lagrange) interpolant of a dictionary of functions of two variables over a box.
+
+    The functions are tabulated on a uniform grid, stacked into one (nx, ny, nkeys) array so a lookup is a single gather
+    of 16 values per point, whatever the resolution. The grid is doubled until the interpolant reproduces every function
+    at the cell centres, where cubic interpolation errors peak, to within tolerance * max|f|. The achieved maximum errors
+    are kept in error_bounds.
+    """
+
+    def __init__(self, function: Callable[[np.ndarray, np.ndarray], Dict[str, np.ndarray]], x_range: Tuple[float, float], y_range: Tuple[float, float], tolerance: float = 1e-5, points: int = 64, max_points: int = 512) -> None:
+        self.x_range = x_range
+        self.y_range = y_range
+        self.tolerance = tolerance
+
+        while True:
+            self.x = np.linspace(x_range[0], x_range[1], points)
+            self.y = np.linspace(y_range[0], y_range[1], points)
+            values = self._evaluate(function, *np.meshgrid(self.x, self.y, indexing='ij'))
+            self.keys = list(values)
+            self.table = np.ascontiguousarray(np.stack([values[key] for key in self.keys], axis=-1).reshape(points * points, -1))
+            self._offsets = (np.arange(4)[:, np.newaxis] * points + np.arange(4)).ravel()
+
+            xc = 0.5 * (self.x[1:] + self.x[:-1])
+            yc = 0.5 * (self.y[1:] + self.y[:-1])
+            xv, yv = np.meshgrid(xc, yc, indexing='ij')
+            exact = self._evaluate(function, xv, yv)
+            approx = self(xv, yv)
+            self.scales = {key: max(np.max(np.abs(exact[key])), np.finfo(float).tiny) for key in self.keys}
+            self.error_bounds = {key: np.max(np.abs(approx[key] - exact[key])) for key in self.keys}
+            converged = all(self.error_bounds[key] <= tolerance * self.scales[key] for key in self.keys)
+            if converged or 2 * points > max_points:
+                break
+            points *= 2
+
+        if not converged:
+            logging.warning(f'Interpolated surface did not reach tolerance {tolerance} with {points} points per axis: {self.error_bounds}')
+
+    @staticmethod
+    def _evaluate(function, x: np.ndarray, y: np.ndarray, chunk: int = 8192) -> Dict[str, np.ndarray]:
+        """
+        Tabulates function in chunks of points, bounding the memory of pricers with per-point work arrays (e.g. Fourier).
+        """
+        xf, yf = x.ravel(), y.ravel()
+        parts = [function(xf[i:i + chunk], yf[i:i + chunk]) for i in range(0, len(xf), chunk)]
+        return {key: np.concatenate([part[key] for part in parts]).reshape(x.shape) for key in parts[0]}
+
+    @staticmethod
+    def _stencil(v: np.ndarray, grid: np.ndarray) -> tuple:
+        """
+        First index of the 4 point stencil around v and its cubic Lagrange weights.
+        """
+        h = grid[1] - grid[0]
+        position = (v - grid[0]) / h
+        start = np.clip(np.floor(position).astype(int) - 1, 0, len(grid) - 4)
+        f = position - start - 1
+        weights = np.stack([
+            -f * (f - 1) * (f - 2) / 6,
+            (f + 1) * (f - 1) * (f - 2) / 2,
+            -(f + 1) * f * (f - 2) / 2,
+            (f + 1) * f * (f - 1) / 6,
+        ], axis=-1)
+        return start, weights
+
+    def contains(self, x, y) -> np.ndarray:
+        return (x >= self.x_range[0]) & (x <= self.x_range[1]) & (y >= self.y_range[0]) & (y <= self.y_range[1])
+
+    def __call__(self, x, y) -> Dict[str, np.ndarray]:
+        """
+        Vectorised evaluation at broadcastable x, y (inside the box).
+        """
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+        shape = x.shape
+        ix, wx = self._stencil(x.ravel(), self.x)
+        iy, wy = self._stencil(y.ravel(), self.y)
+        block = np.take(self.table, (ix * len(self.y) + iy)[:, np.newaxis] + self._offsets, axis=0)
+        weights = (wx[:, :, np.newaxis] * wy[:, np.newaxis, :]).reshape(len(ix), 1, 16)
+        values = np.matmul(weights, block)[:, 0]
+        return {key: values[:, k].reshape(shape) for k, key in enumerate(self.keys)}
+
+
+class Surfaces:
+    """
+    Cached interpolated surfaces of the put prices and greeks (Analytical, or Fourier under Merton jumps) for repeated lookups.
+
+    Both puts are homogeneous in (S, K): the binary price depends only on S / K and the vanilla price is K times a function
+    of S / K. A surface is therefore built once per (payoff type, T, r, sigma, jumps) over log-moneyness and sqrt(time to
+    expiry), and serves every strike / liquidation price. Surfaces are kept in an LRU cache keyed by those parameters.
+    A lookup costs a fixed 16 point gather per point, so it pays off most in front of the Fourier pricer; the batched
+    Analytical closed forms are already of similar cost.
+    """
+
+    # Number of S derivatives in each greek, which sets how it scales with K
+    _ORDER = {'price': 0, 'delta': 1, 'gamma': 2, 'theta': 0, 'speed': 3, 'vega': 0}
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def put_surface(payoff_type: str, T: float, r: float, sigma: float, jumps: Optional[Tuple[float, float, float]] = None, moneyness: Tuple[float, float] = (0.25, 4.0), tau_range: Optional[Tuple[float, float]] = None, tolerance: float = 1e-4) -> InterpolatedSurface:
+        """
+        Surface of the unit-strike put greeks over x = log(S / K) and s = sqrt(T - t), priced by Analytical, or by Fourier
+        when jumps = (muJ, sigmaJ, lambdaJ) is given (a tuple, so that it can key the cache). tau_range defaults to (T / 20, T):
+        very close to expiry the binary put is nearly a step and is priced directly instead.
+        """
+        if payoff_type not in ('binary', 'vanilla'):
+            raise ValueError(f"payoff_type must be 'binary' or 'vanilla', got {payoff_type!r}.")
+        if tau_range is None:
+            tau_range = (T / 20, T)
+
+        def function(x, s):
+            if jumps is not None:
+                return Fourier.merton_put_greeks(np.exp(x), 1.0, T, T - s**2, r, sigma, *jumps, payoff_type=payoff_type)
+            if payoff_type == 'binary':
+                return Analytical.binary_put_greeks(np.exp(x), 1.0, T, T - s**2, r, sigma)
+            return Analytical.vanilla_put_greeks(np.exp(x), 1.0, T, T - s**2, r, sigma)
+
+        return InterpolatedSurface(function, (np.log(moneyness[0]), np.log(moneyness[1])), (np.sqrt(tau_range[0]), np.sqrt(tau_range[1])), tolerance)
+
+    @staticmethod
+    def put_greeks(payoff_type: str, S, K, T: float, t, r: float, sigma: float, payoff=1, jumps: Optional[Tuple[float, float, float]] = None, **kwargs) -> Dict[str, np.ndarray]:
+        """
+        Drop-in for Analytical.binary_put_greeks / vanilla_put_greeks (or the Fourier ones with jumps) with scalar T, r and sigma,
+        evaluated from the cached surface. Points outside the surface box are priced directly, so every result is within the
+        surface error bounds.
+        """
+        surface = Surfaces.put_surface(payoff_type, T, r, sigma, jumps, **kwargs)
+        S, K, t = np.broadcast_arrays(*(np.asarray(v, dtype=float) for v in (S, K, t)))
+        x = np.log(S / K)
+        s = np.sqrt(np.maximum(T - t, 0.0))
+        inside = surface.contains(x, s)
+
+        unit = surface(np.where(inside, x, surface.x_range[0]), np.where(inside, s, surface.y_range[0]))
+        homogeneity = 0 if payoff_type == 'binary' else 1
+        result = {key: values * K**(homogeneity - Surfaces._ORDER[key]) for key, values in unit.items()}
+
+        if not np.all(inside):
+            if jumps is not None:
+                exact = Fourier.merton_put_greeks(S[~inside], K[~inside], T, t[~inside], r, sigma, *jumps, payoff_type=payoff_type)
+            elif payoff_type == 'binary':
+                exact = Analytical.binary_put_greeks(S[~inside], K[~inside], T, t[~inside], r, sigma)
+            else:
+                exact = Analytical.vanilla_put_greeks(S[~inside], K[~inside], T, t[~inside], r, sigma)
+            for key in result:
+                result[key][~inside] = exact[key]
+
+        if payoff_type == 'binary':
+            result = {key: payoff * values for key, values in result.items()}
+        return result
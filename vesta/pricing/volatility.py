@@ -0,0 +1,199 @@
+from typing import Optional, Union
+from abc import ABC, abstractmethod
+from collections import deque
+import numpy as np
+import pandas as pd
+import logging
+from scipy.optimize import minimize
+
+class OnlineVolatility(ABC):
+    """
+    Base class for incremental volatility estimators fed one price tick at a time.
+
+    Prices may be scalars or arrays (one entry per token), so a single estimator tracks many tokens at once. Every
+    update is O(1) in the length of the history. sigma is reported in the time unit used by Analytical and Processes:
+    a 31 day month by default, i.e. sigma = sqrt(variance per observation / observation length in months).
+    """
+
+    def __init__(self, step: float = 1 / (31 * 24), period: pd.Timedelta = pd.Timedelta(days=31)) -> None:
+        """
+        Parameters:
+        step (float): Length of one observation in units of period, used when ticks carry no timestamp. Defaults to one hour.
+        period (pd.Timedelta): The time unit sigma is expressed in.
+        """
+        self.step = step
+        self.period_seconds = period.total_seconds()
+        self._last_price: Optional[np.ndarray] = None
+        self._last_time: Optional[float] = None
+
+    @abstractmethod
+    def _observe(self, r2: np.ndarray, dt: float) -> None:
+        pass
+
+    @property
+    @abstractmethod
+    def sigma(self) -> Optional[Union[float, np.ndarray]]:
+        pass
+
+    def update(self, price, timestamp=None):
+        """
+        Adds a price tick (scalar or one per token) and returns the current sigma (None until a return has been seen).
+        """
+        price = np.asarray(price, dtype=float)
+        seconds = None if timestamp is None else pd.Timestamp(timestamp).value / 1e9
+        if self._last_price is not None:
+            dt = self.step if seconds is None or self._last_time is None else (seconds - self._last_time) / self.period_seconds
+            if dt > 0:
+                self._observe(np.log(price / self._last_price)**2, dt)
+        self._last_price, self._last_time = price, seconds
+        return self.sigma
+
+    def update_many(self, prices, timestamps=None):
+        """
+        Feeds a history of ticks in order, e.g. the 'price' column of CoinGecko.get_historical_market_data
+        (its DatetimeIndex is used as timestamps), or a (ticks x tokens) array. Returns the current sigma.
+        """
+        if isinstance(prices, pd.DataFrame) and 'price' in prices:
+            prices = prices['price']
+        if timestamps is None and isinstance(prices, (pd.Series, pd.DataFrame)) and isinstance(prices.index, pd.DatetimeIndex):
+            timestamps = prices.index
+        values = np.asarray(prices, dtype=float)
+        for i in range(len(values)):
+            self.update(values[i], None if timestamps is None else timestamps[i])
+        return self.sigma
+
+
+class EWMAVolatility(OnlineVolatility):
+    """
+    Exponentially weighted variance rate: v <- decay * v + (1 - decay) * r^2 / dt (RiskMetrics with decay 0.94 per observation).
+    """
+
+    def __init__(self, decay: float = 0.94, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.decay = decay
+        self.variance: Optional[np.ndarray] = None
+
+    def _observe(self, r2: np.ndarray, dt: float) -> None:
+        rate = r2 / dt
+        self.variance = rate if self.variance is None else self.decay * self.variance + (1 - self.decay) * rate
+
+    @property
+    def sigma(self):
+        return None if self.variance is None else np.sqrt(self.variance)
+
+
+class RealizedVolatility(OnlineVolatility):
+    """
+    Realized variance over a rolling window of the last 'window' returns, kept as running sums.
+    """
+
+    def __init__(self, window: int = 24 * 31, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.window = window
+        self._returns: deque = deque()
+        self._sum_r2 = 0.0
+        self._sum_dt = 0.0
+
+    def _observe(self, r2: np.ndarray, dt: float) -> None:
+        self._returns.append((r2, dt))
+        self._sum_r2 = self._sum_r2 + r2
+        self._sum_dt += dt
+        if len(self._returns) > self.window:
+            old_r2, old_dt = self._returns.popleft()
+            self._sum_r2 = self._sum_r2 - old_r2
+            self._sum_dt -= old_dt
+
+    @property
+    def sigma(self):
+        return None if not self._returns else np.sqrt(self._sum_r2 / self._sum_dt)
+
+
+class GARCHVolatility(OnlineVolatility):
+    """
+    GARCH(1,1) filter h <- omega + alpha * r^2 + beta * h on per-observation variance, for regularly spaced ticks.
+    Returns over irregular gaps are rescaled to one observation length. Parameters can be scalars or one per token;
+    fit() estimates them by maximum likelihood for many tokens at once, constrained to a stationary process.
+    """
+
+    # Largest alpha + beta allowed by fit(), keeping the unconditional variance omega / (1 - alpha - beta) finite
+    PERSISTENCE_LIMIT = 0.999
+
+    def __init__(self, omega, alpha, beta, variance=None, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.omega = np.asarray(omega, dtype=float)
+        self.alpha = np.asarray(alpha, dtype=float)
+        self.beta = np.asarray(beta, dtype=float)
+        self.variance = None if variance is None else np.asarray(variance, dtype=float)
+
+    def _observe(self, r2: np.ndarray, dt: float) -> None:
+        r2 = r2 * (self.step / dt)
+        if self.variance is None:
+            self.variance = r2
+        self.variance = self.omega + self.alpha * r2 + self.beta * self.variance
+
+    @property
+    def sigma(self):
+        return None if self.variance is None else np.sqrt(self.variance / self.step)
+
+    @staticmethod
+    def _negative_log_likelihood(params: np.ndarray, returns: np.ndarray) -> tuple:
+        """
+        Gaussian GARCH(1,1) negative log-likelihood summed over tokens, with its analytic gradient.
+        params holds [omega, alpha, beta] per token (flattened), returns is (observations x tokens).
+        """
+        omega, alpha, beta = params.reshape(3, -1)
+        r2 = returns**2
+        h = r2.mean(axis=0)
+        dh = np.zeros((3,) + h.shape)
+        nll = 0.0
+        grad = np.zeros((3,) + h.shape)
+        for t in range(r2.shape[0]):
+            if t > 0:
+                dh = np.stack([1 + beta * dh[0], r2[t - 1] + beta * dh[1], h + beta * dh[2]])
+                h = omega + alpha * r2[t - 1] + beta * h
+            nll += 0.5 * np.sum(np.log(h) + r2[t] / h)
+            grad += 0.5 * (1 / h - r2[t] / h**2) * dh
+        return nll, grad.ravel()
+
+    @staticmethod
+    def fit(prices, step: float = 1 / (31 * 24), **kwargs) -> Optional['GARCHVolatility']:
+        """
+        Maximum-likelihood GARCH(1,1) fit for one token (a price series) or many at once (a ticks x tokens array or DataFrame),
+        returning a filter whose state is already run through the history, ready for update() on new ticks.
+        """
+        try:
+            if isinstance(prices, pd.DataFrame) and 'price' in prices:
+                prices = prices['price']
+            values = np.asarray(prices, dtype=float)
+            single = values.ndim == 1
+            values = values.reshape(len(values), -1)
+            returns = np.diff(np.log(values), axis=0)
+            returns -= returns.mean(axis=0)
+
+            # Fit on standardised returns so omega is on the same scale as alpha and beta
+            ntokens = returns.shape[1]
+            variance = returns.var(axis=0)
+            start = np.concatenate([np.full(ntokens, 0.05), np.full(ntokens, 0.05), np.full(ntokens, 0.9)])
+            bounds = [(1e-8, None)] * ntokens + [(1e-6, 0.999)] * (2 * ntokens)
+            # Covariance stationarity: alpha + beta <= PERSISTENCE_LIMIT for every token
+            persistence = np.hstack([np.zeros((ntokens, ntokens)), np.eye(ntokens), np.eye(ntokens)])
+            stationarity = {
+                'type': 'ineq',
+                'fun': lambda params: GARCHVolatility.PERSISTENCE_LIMIT - persistence @ params,
+                'jac': lambda params: -persistence,
+            }
+            result = minimize(GARCHVolatility._negative_log_likelihood, start, args=(returns / np.sqrt(variance),), jac=True, method='SLSQP', bounds=bounds, constraints=[stationarity])
+            if not result.success:
+                logging.warning(f"GARCH fit did not converge: {result.message}")
+
+            omega, alpha, beta = result.x.reshape(3, -1)
+            omega = omega * variance
+            if single:
+                omega, alpha, beta = omega[0], alpha[0], beta[0]
+            garch = GARCHVolatility(omega, alpha, beta, step=step, **kwargs)
+            garch.update_many(values[:, 0] if single else values)
+            return garch
+
+        except Exception as e:
+            logging.error(f"Error fitting GARCH: {e}")
+            return None
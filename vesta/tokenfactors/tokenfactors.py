@@ -1,36 +1,51 @@
 from vesta.data.data import Data
 from vesta.token.token import Token
 from vesta.functions.functions import Functions
-from typing import List
+from typing import List, Optional, Dict, Any
+from concurrent.futures import Executor
 import pandas as pd
 import numpy as np
-import time
-import random
 
 class TokenFactors:
     """
     A class to calculate token factors for Ethereum tokens.
     """
 
-    def __init__(self, data: Data, token: Token):
+    def __init__(self, data: Data, token: Token, executor: Optional[Executor] = None, prefetched: Optional[Dict[str, Any]] = None):
         # Initialize with data and token objects, and retrieve token data and historical market data.
+        # The provider calls are independent, so with an executor they are issued concurrently.
+        # prefetched holds results already fetched in bulk for many tokens (any of the attributes below, and 'price').
         self.functions = Functions()
         self.data = data
         self.token = token
-        self.token_data = self.data.coingecko.get_token_data(token)
-        self.token_historical_market_data = self.data.coingecko.get_historical_market_data(token)
-        self.get_wallet_stats = self.data.moralis_client.get_eth_wallet_stats(token)
-        self.oracle_data = self.data.pythpy.get_pyth_data(token)
+        prefetched = prefetched or {}
+        self.price = prefetched.get('price')
+        calls = {
+            'token_data': self.data.coingecko.get_token_data,
+            'token_historical_market_data': self.data.coingecko.get_historical_market_data,
+            'get_wallet_stats': self.data.moralis_client.get_eth_wallet_stats,
+            'oracle_data': self.data.pythpy.get_pyth_data,
+        }
+        calls = {name: call for name, call in calls.items() if name not in prefetched}
+        if executor is None:
+            results = {name: call(token) for name, call in calls.items()}
+        else:
+            futures = {name: executor.submit(call, token) for name, call in calls.items()}
+            results = {name: future.result() for name, future in futures.items()}
+        results.update({name: value for name, value in prefetched.items() if name != 'price'})
+        self.token_data = results['token_data']
+        self.token_historical_market_data = results['token_historical_market_data']
+        self.get_wallet_stats = results['get_wallet_stats']
+        self.oracle_data = results['oracle_data']
 
     def calculate_mean_slippage(self, usdc_values: List[int] = [1000, 2000, 5000, 10000, 100000]) -> float:
         # Calculate the mean slippage for specified USDC values by fetching the slippage for each value,
         # summing them up and dividing by the number of values.
 
-        # Introducing a sleep to alieviate the rate limit of the Jupiter API.
+        # The Jupiter rate limit is enforced by the data scheduler.
         slippages = []
         for value in usdc_values:
-            slippages.append(self.data.jupiter.get_usdc_swap_price_slippage(self.token, value))
-            time.sleep(random.random() * 10)
+            slippages.append(self.data.jupiter.get_usdc_swap_price_slippage(self.token, value, self.price))
         mean_slippage = sum(slippages) / len(slippages)
         return self.functions.invrational_1(mean_slippage, 1, 1, 10)
 
@@ -105,5 +120,6 @@ class TokenFactors:
     
     def calculate_oracle_confidence(self) -> float:
         # Fetch and return the CoinGecko rank of the token using an inverse rational transformation.
+        if self.oracle_data is None: return None
         confidence = float((100 * self.oracle_data['confidence']) / self.oracle_data['price'])
         return self.functions.genlogistic_2(confidence, 1, 1, 50, 0.4)